@@ -3,8 +3,8 @@ import random
 from django.http import JsonResponse
 from django.shortcuts import render
 
-from apps.common import utils as common_utils
 from apps.product_management import forms as mgt_forms, models as mgt
+from apps.product_management.tree import serialize_product_tree, serialize_tree
 
 adjectives = [
     "Magnificent",
@@ -84,7 +84,7 @@ def add_node_helper(request, product_area, context):
     if not form.is_valid():
         return JsonResponse({"error": "Something went wrong."}, status=400)
 
-    context["node"] = [common_utils.serialize_tree(product_area.add_child(**form.cleaned_data))]
+    context["node"] = [serialize_tree(product_area.add_child(**form.cleaned_data))]
     context["parent"] = product_area
     context["depth"] = int(request.POST.get("depth", 0))
     context["margin_left"] = int(request.POST.get("margin_left", 0))
@@ -118,7 +118,7 @@ def update_node_helper(request, product_area):
     context = {
         "product_area": product_area,
         "parent_id": parent_id or 0,
-        "node": [common_utils.serialize_tree(product_area)],
+        "node": [serialize_tree(product_area)],
         "depth": int(request.POST.get("depth", 0)),
         "can_modify_product": True,
     }
@@ -135,7 +135,7 @@ def add_root_node_helper(request, tree_id, context):
     context["depth"] = int(request.POST.get("depth", 0)) + 1
     context["margin_left"] = int(request.POST.get("margin_left", 0))
     context["can_modify_product"] = True
-    context["node"] = [common_utils.serialize_tree(product_area)]
+    context["node"] = [serialize_tree(product_area)]
     context["id"] = product_area.pk
     return render(request, "product_tree/components/partials/add_node_partial.html", context)
 
@@ -146,7 +146,7 @@ def shareable_tree_helper(request, product_tree, show_share_button=False):
         "can_modify_product": True,
         "product_tree": product_tree,
         "sharable_link": f"{domain}/product-tree/share/{product_tree.pk}",
-        "tree_data": [common_utils.serialize_tree(node) for node in product_tree.product_areas.filter(depth=1)],
+        "tree_data": serialize_product_tree(product_tree),
         "show_share_button": show_share_button,
         "margin_left": int(request.GET.get("margin_left", 0)),
         "depth": int(request.GET.get("depth", 0)),
@@ -6,6 +6,7 @@ from .models import (
     OrganisationPointAccount,
     ProductPointAccount,
     PointTransaction,
+    PointBalanceSnapshot,
     OrganisationPointGrant,
     PlatformFeeConfiguration,
     Cart,
@@ -66,6 +67,11 @@ class PointTransactionAdmin(admin.ModelAdmin):
     search_fields = ("account__organisation__name", "product_account__product__name")
     list_filter = ("transaction_type",)
 
+@admin.register(PointBalanceSnapshot)
+class PointBalanceSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("account", "product_account", "balance", "as_of")
+    search_fields = ("account__organisation__name", "product_account__product__name")
+
 @admin.register(OrganisationPointGrant)
 class OrganisationPointGrantAdmin(admin.ModelAdmin):
     list_display = ("organisation", "amount", "granted_by", "created_at")
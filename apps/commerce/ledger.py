@@ -0,0 +1,208 @@
+"""
+Race-safe balance changes for wallets and point accounts.
+
+Balances used to be changed by reading the account, adding or subtracting in Python and saving the whole row, so
+two concurrent checkouts could both read the same balance and one of the changes was lost (or both debits passed
+the balance check). Here every change is one statement::
+
+    WITH changed AS (
+        UPDATE account SET balance = balance - %(amount)s, updated_at = now()
+        WHERE id = %(id)s AND balance >= %(amount)s
+        RETURNING id, balance
+    ), entry AS (
+        INSERT INTO transaction (id, account_id, amount, ...) SELECT %(entry_id)s, id, %(amount)s, ... FROM changed
+    )
+    SELECT balance FROM changed
+
+PostgreSQL re-evaluates the ``WHERE`` against the latest committed row when a concurrent change got there first, so
+the arithmetic can't lose updates and a debit can't overdraw, without an explicit lock or an extra round trip. The
+ledger entry is only inserted if the balance changed, in the same statement. Only the balance and ``updated_at``
+columns are written, which also means these changes don't go through model signals (and so aren't in the audit
+trail); the ledger entries are their record.
+
+For points the entries are the source of truth and the ``balance`` columns are counters kept next to them. Every
+point change writes its ``PointTransaction``, a transfer being one entry debiting the organisation and crediting the
+product, and ``PointBalances`` derives balances from the entries: from the latest ``PointBalanceSnapshot`` before the
+time asked about plus the entries after it, so no query sums an account's whole history. ``reconcile_points`` takes
+the snapshots and checks the counters against the derived balances.
+"""
+import datetime
+
+from django.db import connection
+from django.db.models import Case, Exists, F, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.common.fields import generate_ids
+
+from .models import (
+    OrganisationPointAccount,
+    OrganisationWallet,
+    OrganisationWalletTransaction,
+    PointBalanceSnapshot,
+    PointTransaction,
+    ProductPointAccount,
+)
+
+# Snapshots stop this far in the past, so that transactions still open when one is taken (their entries have the
+# time they started at) are already committed and included
+SNAPSHOT_DELAY = datetime.timedelta(minutes=5)
+BEGINNING = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Ledger:
+    """Where the balance of ``account_model`` is stored, and the entry model (with its account field) recording it."""
+
+    def __init__(self, account_model, balance_field, entry_model, entry_account_field, entry_amount_field):
+        self.account_model = account_model
+        self.balance_field = balance_field
+        self.entry_model = entry_model
+        self.entry_account_field = entry_account_field
+        self.entry_amount_field = entry_amount_field
+
+    def change(self, account, amount, debit, entry=None):
+        """
+        Adds ``amount`` to the balance of ``account`` (or takes it away if ``debit``) and returns the new balance, or
+        None if a debit would overdraw it. ``entry`` holds the other fields of the ledger entry to insert with the
+        change; without it no entry is written. The in-memory ``account`` is updated too.
+        """
+        amount = int(amount)
+        if amount < 0:
+            raise ValueError(f"Invalid amount: {amount}. Amount must be non-negative.")
+
+        quote = connection.ops.quote_name
+        account_meta = self.account_model._meta
+        balance = quote(account_meta.get_field(self.balance_field).column)
+        sql = (
+            f"WITH changed AS ("
+            f"UPDATE {quote(account_meta.db_table)} SET {balance} = {balance} {'-' if debit else '+'} %s, "
+            f"{quote(account_meta.get_field('updated_at').column)} = now() "
+            f"WHERE {quote(account_meta.pk.column)} = %s{f' AND {balance} >= %s' if debit else ''} "
+            f"RETURNING {quote(account_meta.pk.column)} AS id, {balance} AS balance)"
+        )
+        params = [amount, account_meta.pk.get_db_prep_value(account.pk, connection)]
+        if debit:
+            params.append(amount)
+
+        if entry is not None:
+            entry_sql, entry_params = self.entry_insert(amount, entry)
+            sql += f", entry AS ({entry_sql})"
+            params += entry_params
+        sql += " SELECT balance FROM changed"
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        setattr(account, self.balance_field, row[0])
+        return row[0]
+
+    def entry_insert(self, amount, entry):
+        quote = connection.ops.quote_name
+        meta = self.entry_model._meta
+        values = {
+            meta.pk.column: meta.pk.get_db_prep_value(meta.pk.generate_id(), connection),
+            meta.get_field(self.entry_amount_field).column: amount,
+        }
+        for field in meta.concrete_fields:
+            if field.column in values or field.name in (self.entry_account_field, "created_at", "updated_at"):
+                continue
+            # Fields left out get their model default, as they would from objects.create()
+            value = entry.get(field.name, entry.get(field.attname, field.get_default()))
+            values[field.column] = field.get_db_prep_value(getattr(value, "pk", value), connection)
+
+        account_column = meta.get_field(self.entry_account_field).column
+        timestamps = [meta.get_field("created_at").column, meta.get_field("updated_at").column]
+        columns = [*values, account_column, *timestamps]
+        sql = (
+            f"INSERT INTO {quote(meta.db_table)} ({', '.join(quote(column) for column in columns)}) "
+            f"SELECT {', '.join(['%s'] * len(values))}, id, now(), now() FROM changed"
+        )
+        return sql, list(values.values())
+
+    def credit(self, account, amount, entry=None):
+        return self.change(account, amount, debit=False, entry=entry)
+
+    def debit(self, account, amount, entry=None):
+        return self.change(account, amount, debit=True, entry=entry)
+
+
+wallets = Ledger(OrganisationWallet, "balance_usd_cents", OrganisationWalletTransaction, "wallet", "amount_cents")
+organisation_points = Ledger(OrganisationPointAccount, "balance", PointTransaction, "account", "amount")
+product_points = Ledger(ProductPointAccount, "balance", PointTransaction, "product_account", "amount")
+
+
+class PointBalances:
+    """
+    Balances of one kind of point account derived from the ``PointTransaction`` entries on its side,
+    ``entry_account_field``. Entries of ``credit_types`` add to the balance, the others take away from it.
+    """
+
+    def __init__(self, account_model, entry_account_field, credit_types):
+        self.account_model = account_model
+        self.entry_account_field = entry_account_field
+        self.credit_types = credit_types
+
+    def signed_amount(self):
+        return Case(
+            When(transaction_type__in=self.credit_types, then=F("amount")),
+            default=-F("amount"),
+            output_field=IntegerField(),
+        )
+
+    def balance_at(self, account, at=None):
+        """The balance of ``account`` after the entries up to ``at`` (all of them by default)."""
+        snapshots = PointBalanceSnapshot.objects.filter(**{self.entry_account_field: account})
+        entries = PointTransaction.objects.filter(**{self.entry_account_field: account})
+        if at is not None:
+            snapshots = snapshots.filter(as_of__lte=at)
+            entries = entries.filter(created_at__lte=at)
+        snapshot = snapshots.order_by("-as_of").first()
+        if snapshot is not None:
+            entries = entries.filter(created_at__gt=snapshot.as_of)
+        tail = entries.aggregate(total=Sum(self.signed_amount()))["total"] or 0
+        return (snapshot.balance if snapshot else 0) + tail
+
+    def with_ledger_balances(self, at=None):
+        """
+        All accounts, annotated with ``ledger_balance`` (what ``balance_at`` returns for each) and ``changed``
+        (whether there are entries after their latest snapshot), in one query.
+        """
+        account = {self.entry_account_field: OuterRef("pk")}
+        snapshots = PointBalanceSnapshot.objects.filter(**account).order_by("-as_of")
+        entries = PointTransaction.objects.filter(**account, created_at__gt=OuterRef("snapshot_as_of"))
+        if at is not None:
+            snapshots = snapshots.filter(as_of__lte=at)
+            entries = entries.filter(created_at__lte=at)
+        tail = entries.order_by().values(self.entry_account_field).annotate(total=Sum(self.signed_amount()))
+        return self.account_model.objects.annotate(
+            snapshot_balance=Coalesce(Subquery(snapshots.values("balance")[:1]), 0),
+            snapshot_as_of=Coalesce(Subquery(snapshots.values("as_of")[:1]), Value(BEGINNING)),
+            ledger_balance=F("snapshot_balance") + Coalesce(Subquery(tail.values("total")), 0),
+            changed=Exists(entries),
+        )
+
+    def snapshot(self, as_of):
+        """Snapshots the accounts with entries since their latest snapshot, as of ``as_of``. Returns how many."""
+        accounts = list(self.with_ledger_balances(as_of).filter(changed=True).values_list("pk", "ledger_balance"))
+        account_field = f"{self.entry_account_field}_id"
+        PointBalanceSnapshot.objects.bulk_create(
+            PointBalanceSnapshot(id=snapshot_id, balance=balance, as_of=as_of, **{account_field: pk})
+            for snapshot_id, (pk, balance) in zip(generate_ids(len(accounts)), accounts)
+        )
+        return len(accounts)
+
+    def drifted(self):
+        """The accounts whose ``balance`` counter differs from their ledger balance, with ``ledger_balance``."""
+        return self.with_ledger_balances().exclude(balance=F("ledger_balance"))
+
+
+organisation_balances = PointBalances(OrganisationPointAccount, "account", ["GRANT", "REFUND"])
+product_balances = PointBalances(ProductPointAccount, "product_account", ["GRANT", "REFUND", "TRANSFER"])
+
+
+def snapshot_point_balances(as_of=None):
+    """Snapshots both kinds of point accounts, as of ``SNAPSHOT_DELAY`` ago by default. Returns how many."""
+    as_of = as_of or timezone.now() - SNAPSHOT_DELAY
+    return organisation_balances.snapshot(as_of) + product_balances.snapshot(as_of)
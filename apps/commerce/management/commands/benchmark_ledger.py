@@ -0,0 +1,102 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.commerce.ledger import organisation_points
+from apps.commerce.models import Organisation, OrganisationPointAccount, PointTransaction
+
+
+def read_modify_write(account_id):
+    # What use_points did: read, check and subtract in Python, save the row
+    account = OrganisationPointAccount.objects.get(pk=account_id)
+    if account.balance < 1:
+        return False
+    account.balance -= 1
+    account.save()
+    PointTransaction.objects.create(account=account, amount=1, transaction_type="USE", description="Benchmark")
+    return True
+
+
+def select_for_update(account_id):
+    with transaction.atomic():
+        account = OrganisationPointAccount.objects.select_for_update().get(pk=account_id)
+        if account.balance < 1:
+            return False
+        account.balance -= 1
+        account.save()
+        PointTransaction.objects.create(account=account, amount=1, transaction_type="USE", description="Benchmark")
+        return True
+
+
+def ledger(account_id):
+    entry = {"transaction_type": "USE", "description": "Benchmark"}
+    return organisation_points.debit(OrganisationPointAccount(pk=account_id), 1, entry=entry) is not None
+
+
+STRATEGIES = [
+    ("read-modify-write", read_modify_write),
+    ("select_for_update", select_for_update),
+    ("ledger", ledger),
+]
+
+
+class Command(BaseCommand):
+    help = "Run many parallel one point debits against a point account with each way of changing its balance"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=16, help="Parallel debiting connections")
+        parser.add_argument("--debits", type=int, default=100, help="Debits attempted per thread")
+        parser.add_argument(
+            "--balance", type=int, help="Starting balance, half of the attempted debits by default so some must fail"
+        )
+
+    def debit_repeatedly(self, strategy, account_id, debits):
+        try:
+            return sum(strategy(account_id) for _ in range(debits))
+        finally:
+            connection.close()
+
+    def run(self, strategy, threads, debits, balance):
+        # Organisation.save validates before pre_save would assign the id
+        organisation = Organisation.objects.create(
+            id=Organisation._meta.pk.generate_id(), name=f"Ledger benchmark {uuid.uuid4().hex}", country="US"
+        )
+        account = OrganisationPointAccount.objects.create(organisation=organisation, balance=balance)
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                runs = [executor.submit(self.debit_repeatedly, strategy, account.pk, debits) for _ in range(threads)]
+                succeeded = sum(run.result() for run in runs)
+            elapsed = time.perf_counter() - start
+
+            account.refresh_from_db()
+            entries = PointTransaction.objects.filter(account=account).count()
+            return {
+                "debits_per_s": threads * debits / elapsed,
+                "succeeded": succeeded,
+                "entries": entries,
+                "balance": account.balance,
+                # What the balance should be after the debits that reported success
+                "lost_updates": account.balance - (balance - succeeded),
+                "overdrawn": max(succeeded - balance, 0),
+            }
+        finally:
+            organisation.delete()
+
+    def handle(self, *args, **options):
+        threads, debits = options["threads"], options["debits"]
+        balance = options["balance"] if options["balance"] is not None else threads * debits // 2
+        self.stdout.write(f"{threads} threads x {debits} debits of 1 point, starting balance {balance}")
+        self.stdout.write(
+            f"{'strategy':<20}{'debits/s':>12}{'succeeded':>12}{'entries':>10}{'balance':>10}"
+            f"{'lost updates':>15}{'overdrawn':>12}"
+        )
+        for name, strategy in STRATEGIES:
+            result = self.run(strategy, threads, debits, balance)
+            self.stdout.write(
+                f"{name:<20}{result['debits_per_s']:>12.0f}{result['succeeded']:>12}{result['entries']:>10}"
+                f"{result['balance']:>10}{result['lost_updates']:>15}{result['overdrawn']:>12}"
+            )
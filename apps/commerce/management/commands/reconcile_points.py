@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.commerce.ledger import organisation_balances, product_balances, snapshot_point_balances
+
+
+class Command(BaseCommand):
+    help = "Check the point account balances against the point ledger, optionally snapshotting the ledger first"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--snapshot", action="store_true", help="Snapshot the balances of accounts with new entries first"
+        )
+
+    def handle(self, *args, **options):
+        if options["snapshot"]:
+            self.stdout.write(f"Snapshotted {snapshot_point_balances()} point accounts")
+
+        drifted = [
+            (kind, account)
+            for kind, balances in (("organisation", organisation_balances), ("product", product_balances))
+            for account in balances.drifted()
+        ]
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("All point account balances match the ledger"))
+            return
+
+        self.stdout.write(f"{'account':<16}{'kind':<16}{'balance':>12}{'ledger':>12}")
+        for kind, account in drifted:
+            self.stdout.write(f"{account.pk:<16}{kind:<16}{account.balance:>12}{account.ledger_balance:>12}")
+        raise CommandError(f"{len(drifted)} point account balances differ from the ledger")
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.1 on 2026-10-17 06:37
+
+import apps.common.fields
+from django.db import migrations
+
+
+# The tables whose id varchar_pattern_ops index Django created next to the primary key
+LIKE_INDEXED_MODELS = ("pointtransaction",)
+
+
+def drop_id_like_indexes(apps, schema_editor):
+    # With the "C" collation the primary key index serves LIKE 'prefix%' lookups as well
+    for model_name in LIKE_INDEXED_MODELS:
+        model = apps.get_model("commerce", model_name)
+        name = schema_editor._create_index_name(model._meta.db_table, ["id"], suffix="_like")
+        schema_editor.execute(schema_editor._delete_index_sql(model, name))
+
+
+def create_id_like_indexes(apps, schema_editor):
+    for model_name in LIKE_INDEXED_MODELS:
+        model = apps.get_model("commerce", model_name)
+        schema_editor.execute(schema_editor._create_like_index_sql(model, model._meta.pk))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("commerce", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="pointtransaction",
+            name="id",
+            field=apps.common.fields.Base58UUIDv7Field(primary_key=True, serialize=False),
+        ),
+        migrations.RunPython(drop_id_like_indexes, create_id_like_indexes),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-17 06:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("commerce", "0003_time_ordered_ids"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="pointtransaction",
+            index=models.Index(fields=["account", "created_at", "id"], name="point_tx_account_created_idx"),
+        ),
+    ]
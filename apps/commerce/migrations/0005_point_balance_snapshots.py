@@ -0,0 +1,89 @@
+# Generated by Django 5.1.1 on 2026-10-17 07:37
+
+import apps.common.fields
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+from apps.common.fields import generate_ids
+
+
+def drop_id_like_index(apps, schema_editor):
+    # See 0003_time_ordered_ids
+    model = apps.get_model("commerce", "pointbalancesnapshot")
+    name = schema_editor._create_index_name(model._meta.db_table, ["id"], suffix="_like")
+    schema_editor.execute(schema_editor._delete_index_sql(model, name))
+
+
+def create_id_like_index(apps, schema_editor):
+    model = apps.get_model("commerce", "pointbalancesnapshot")
+    schema_editor.execute(schema_editor._create_like_index_sql(model, model._meta.pk))
+
+
+def take_opening_snapshots(apps, schema_editor):
+    # Entries weren't written for every change so far, the ledger starts from the counters as they are now
+    PointBalanceSnapshot = apps.get_model("commerce", "PointBalanceSnapshot")
+    now = timezone.now()
+    accounts = (("OrganisationPointAccount", "account_id"), ("ProductPointAccount", "product_account_id"))
+    for model_name, account_field in accounts:
+        balances = list(apps.get_model("commerce", model_name).objects.values_list("pk", "balance"))
+        PointBalanceSnapshot.objects.bulk_create(
+            PointBalanceSnapshot(id=snapshot_id, balance=balance, as_of=now, **{account_field: pk})
+            for snapshot_id, (pk, balance) in zip(generate_ids(len(balances)), balances)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("commerce", "0004_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PointBalanceSnapshot",
+            fields=[
+                ("created_at", models.DateTimeField(auto_now_add=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True, null=True)),
+                ("id", apps.common.fields.Base58UUIDv7Field(primary_key=True, serialize=False)),
+                ("balance", models.IntegerField()),
+                ("as_of", models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="pointtransaction",
+            index=models.Index(fields=["product_account", "created_at", "id"], name="point_tx_product_created_idx"),
+        ),
+        migrations.AddField(
+            model_name="pointbalancesnapshot",
+            name="account",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="snapshots",
+                to="commerce.organisationpointaccount",
+            ),
+        ),
+        migrations.AddField(
+            model_name="pointbalancesnapshot",
+            name="product_account",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="snapshots",
+                to="commerce.productpointaccount",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pointbalancesnapshot",
+            index=models.Index(fields=["account", "as_of"], name="point_snapshot_account_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="pointbalancesnapshot",
+            index=models.Index(fields=["product_account", "as_of"], name="point_snapshot_product_idx"),
+        ),
+        migrations.RunPython(drop_id_like_index, create_id_like_index),
+        migrations.RunPython(take_opening_snapshots, migrations.RunPython.noop),
+    ]
@@ -5,7 +5,7 @@ from django.core.exceptions import ValidationError
 from django.db.models import Sum
 from django.utils import timezone
 from polymorphic.models import PolymorphicModel
-from apps.common.fields import Base58UUIDv5Field
+from apps.common.fields import Base58UUIDv5Field, Base58UUIDv7Field
 from apps.common.mixins import TimeStampMixin
 from apps.talent.models import BountyBid
 from django.db.models import Sum
@@ -63,29 +63,31 @@ class OrganisationWallet(TimeStampMixin):
     balance_usd_cents = models.IntegerField(default=0)
 
     def add_funds(self, amount_cents, description, related_order=None):
-        self.balance_usd_cents += amount_cents
-        self.save()
-        OrganisationWalletTransaction.objects.create(
-            wallet=self,
-            amount_cents=amount_cents,
-            transaction_type=OrganisationWalletTransaction.TransactionType.CREDIT,
-            description=description,
-            related_order=related_order,
+        from .ledger import wallets
+
+        wallets.credit(
+            self,
+            amount_cents,
+            entry={
+                "transaction_type": OrganisationWalletTransaction.TransactionType.CREDIT,
+                "description": description,
+                "related_order": related_order,
+            },
         )
 
     def deduct_funds(self, amount_cents, description, related_order=None):
-        if self.balance_usd_cents >= amount_cents:
-            self.balance_usd_cents -= amount_cents
-            self.save()
-            OrganisationWalletTransaction.objects.create(
-                wallet=self,
-                amount_cents=amount_cents,
-                transaction_type=OrganisationWalletTransaction.TransactionType.DEBIT,
-                description=description,
-                related_order=related_order,
-            )
-            return True
-        return False
+        from .ledger import wallets
+
+        balance = wallets.debit(
+            self,
+            amount_cents,
+            entry={
+                "transaction_type": OrganisationWalletTransaction.TransactionType.DEBIT,
+                "description": description,
+                "related_order": related_order,
+            },
+        )
+        return balance is not None
 
     def __str__(self):
         return f"Wallet for {self.organisation.name}: ${self.balance_usd_cents / 100:.2f}"
@@ -115,45 +117,54 @@ class OrganisationPointAccount(TimeStampMixin):
     def __str__(self):
         return f"Point Account for {self.organisation.name}"
 
-    def add_points(self, amount):
-        try:
-            amount_int = int(amount)
-        except ValueError:
-            raise ValueError(f"Invalid amount: {amount}. Amount must be a valid integer.")
-        
-        if amount_int < 0:
-            raise ValueError(f"Invalid amount: {amount_int}. Amount must be non-negative.")
-        
-        self.balance += amount_int
-        self.save()
+    def add_points(self, amount, entry=None):
+        """
+        Adds ``amount`` points with the ``PointTransaction`` recording it, made of ``entry`` (its other fields).
+        Without an ``entry`` it is recorded as a grant.
+        """
+        from .ledger import organisation_points
 
-    def use_points(self, amount):
+        organisation_points.credit(self, self.validate_amount(amount), entry=entry or {"transaction_type": "GRANT"})
+
+    def use_points(self, amount, entry=None):
+        """Takes ``amount`` points away if the balance allows it, see ``add_points``. Returns whether it did."""
+        from .ledger import organisation_points
+
+        return (
+            organisation_points.debit(self, self.validate_amount(amount), entry=entry or {"transaction_type": "USE"})
+            is not None
+        )
+
+    def balance_at(self, at=None):
+        """The balance according to the ledger at ``at`` (now by default), see ``PointBalances``."""
+        from .ledger import organisation_balances
+
+        return organisation_balances.balance_at(self, at)
+
+    @staticmethod
+    def validate_amount(amount):
         try:
             amount_int = int(amount)
         except ValueError:
             raise ValueError(f"Invalid amount: {amount}. Amount must be a valid integer.")
-        
+
         if amount_int < 0:
             raise ValueError(f"Invalid amount: {amount_int}. Amount must be non-negative.")
-        
-        if self.balance >= amount_int:
-            self.balance -= amount_int
-            self.save()
-            return True
-        return False
+        return amount_int
 
     @transaction.atomic
     def transfer_points_to_product(self, product, amount):
-        if self.use_points(amount):
-            product_account, created = ProductPointAccount.objects.get_or_create(product=product)
-            product_account.add_points(amount)
-            PointTransaction.objects.create(
-                account=self,
-                product_account=product_account,
-                amount=amount,
-                transaction_type="TRANSFER",
-                description=f"Transfer from {self.organisation.name} to {product.name}",
-            )
+        product_account, created = ProductPointAccount.objects.get_or_create(product=product)
+        transfer = {
+            "product_account": product_account,
+            "transaction_type": "TRANSFER",
+            "description": f"Transfer from {self.organisation.name} to {product.name}",
+        }
+        if self.use_points(amount, entry=transfer):
+            from .ledger import product_points
+
+            # The transfer entry records both sides
+            product_points.credit(product_account, self.validate_amount(amount))
             return True
         return False
 
@@ -168,21 +179,26 @@ class ProductPointAccount(TimeStampMixin):
     def __str__(self):
         return f"Point Account for {self.product.name}"
 
-    def add_points(self, amount):
-        self.balance += amount
-        self.save()
+    def add_points(self, amount, entry=None):
+        """See ``OrganisationPointAccount.add_points``, without an ``entry`` it is recorded as a refund."""
+        from .ledger import product_points
 
-    def use_points(self, amount):
-        if self.balance >= amount:
-            self.balance -= amount
-            self.save()
-            return True
-        return False
+        product_points.credit(self, amount, entry=entry or {"transaction_type": "REFUND"})
+
+    def use_points(self, amount, entry=None):
+        from .ledger import product_points
+
+        return product_points.debit(self, amount, entry=entry or {"transaction_type": "USE"}) is not None
+
+    def balance_at(self, at=None):
+        from .ledger import product_balances
+
+        return product_balances.balance_at(self, at)
 
 
 class PointTransaction(TimeStampMixin):
     TRANSACTION_TYPES = [("GRANT", "Grant"), ("USE", "Use"), ("REFUND", "Refund"), ("TRANSFER", "Transfer")]
-    id = Base58UUIDv5Field(primary_key=True)
+    id = Base58UUIDv7Field(primary_key=True)
     account = models.ForeignKey(
         OrganisationPointAccount, on_delete=models.CASCADE, related_name="org_transactions", null=True, blank=True
     )
@@ -193,17 +209,57 @@ class PointTransaction(TimeStampMixin):
     transaction_type = models.CharField(max_length=10, choices=TRANSACTION_TYPES)
     description = models.TextField(blank=True)
 
+    class Meta:
+        # Keyset pagination of an account's transactions, and replaying them after a snapshot
+        indexes = [
+            models.Index(fields=["account", "created_at", "id"], name="point_tx_account_created_idx"),
+            models.Index(fields=["product_account", "created_at", "id"], name="point_tx_product_created_idx"),
+        ]
+
     def __str__(self):
         account_name = self.account.organisation.name if self.account else self.product_account.product.name
         return f"{self.get_transaction_type_display()} of {self.amount} points for {account_name}"
 
     def clean(self):
-        if (self.account is None) == (self.product_account is None):
+        # A transfer is one entry for both sides, debiting the organisation and crediting the product
+        if self.transaction_type == "TRANSFER":
+            if self.account is None or self.product_account is None:
+                raise ValidationError(
+                    "Transfers must be associated with both an OrganisationPointAccount and a ProductPointAccount."
+                )
+        elif (self.account is None) == (self.product_account is None):
             raise ValidationError(
                 "Transaction must be associated with either an OrganisationPointAccount or a ProductPointAccount, but not both."
             )
 
 
+class PointBalanceSnapshot(TimeStampMixin):
+    """
+    The balance of a point account according to its ``PointTransaction`` entries up to ``as_of``, so that balances
+    can be replayed from here rather than from the first entry. Written by ``reconcile_points --snapshot``.
+    """
+
+    id = Base58UUIDv7Field(primary_key=True)
+    account = models.ForeignKey(
+        OrganisationPointAccount, on_delete=models.CASCADE, related_name="snapshots", null=True, blank=True
+    )
+    product_account = models.ForeignKey(
+        ProductPointAccount, on_delete=models.CASCADE, related_name="snapshots", null=True, blank=True
+    )
+    balance = models.IntegerField()
+    as_of = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["account", "as_of"], name="point_snapshot_account_idx"),
+            models.Index(fields=["product_account", "as_of"], name="point_snapshot_product_idx"),
+        ]
+
+    def __str__(self):
+        account_name = self.account.organisation.name if self.account else self.product_account.product.name
+        return f"{self.balance} points for {account_name} as of {self.as_of}"
+
+
 class OrganisationPointGrant(TimeStampMixin):
     id = Base58UUIDv5Field(primary_key=True)
     organisation = models.ForeignKey(Organisation, on_delete=models.CASCADE, related_name="point_grants")
@@ -218,12 +274,8 @@ class OrganisationPointGrant(TimeStampMixin):
 
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
-        self.organisation.point_account.add_points(self.amount)
-        PointTransaction.objects.create(
-            account=self.organisation.point_account,
-            amount=self.amount,
-            transaction_type="GRANT",
-            description=f"Grant: {self.rationale}",
+        self.organisation.point_account.add_points(
+            self.amount, entry={"transaction_type": "GRANT", "description": f"Grant: {self.rationale}"}
         )
 
 
@@ -305,6 +357,15 @@ class Cart(TimeStampMixin):
     def __str__(self):
         return f"Cart {self.id} - ({self.status})"
 
+    def notify_order_placed(self, order_id):
+        from apps.engagement.models import Notification
+        from apps.engagement.outbox import emit
+
+        if self.person is not None:
+            emit(
+                Notification.EventType.ORDER_PLACED, [self.person], user_name=self.person.full_name, order_id=order_id
+            )
+
     def calculate_platform_fee(self):
         PlatformFeeConfiguration = apps.get_model("commerce", "PlatformFeeConfiguration")
         SalesOrderLineItem = apps.get_model("commerce", "SalesOrderLineItem")
@@ -522,14 +583,17 @@ class SalesOrder(TimeStampMixin):
         self.save()
 
         try:
-            if self.total_usd_cents > 0 and not self._process_usd_payment():
-                raise ValueError("USD payment failed")
-
-            self.status = self.OrderStatus.COMPLETED
-            self.save()
-            self._activate_purchases()
-            self.cart.status = Cart.CartStatus.COMPLETED
-            self.cart.save()
+            # The order, what it bought and its notification are committed together
+            with transaction.atomic():
+                if self.total_usd_cents > 0 and not self._process_usd_payment():
+                    raise ValueError("USD payment failed")
+
+                self.status = self.OrderStatus.COMPLETED
+                self.save()
+                self._activate_purchases()
+                self.cart.status = Cart.CartStatus.COMPLETED
+                self.cart.save()
+                self.cart.notify_order_placed(self.pk)
             return True
 
         except Exception as e:
@@ -636,11 +700,12 @@ class PointOrder(TimeStampMixin):
         if self.status != "PENDING":
             return False
 
-        if self.product_account.use_points(self.total_points):
+        entry = {"transaction_type": "USE", "description": f"Points used for Point Order {self.pk}"}
+        if self.product_account.use_points(self.total_points, entry=entry):
             self.status = "COMPLETED"
             self.save()
-            self._create_point_transactions()
             self._activate_purchases()
+            self.cart.notify_order_placed(self.pk)
             return True
         return False
 
@@ -649,31 +714,15 @@ class PointOrder(TimeStampMixin):
         if self.status != "COMPLETED":
             return False
 
-        self.product_account.add_points(self.total_points)
+        self.product_account.add_points(
+            self.total_points,
+            entry={"transaction_type": "REFUND", "description": f"Points refunded for Point Order {self.pk}"},
+        )
         self.status = "REFUNDED"
         self.save()
-        self._create_refund_transactions()
         self._deactivate_purchases()
         return True
 
-    def _create_point_transactions(self):
-        for item in self.cart.items.filter(funding_type="Points"):
-            PointTransaction.objects.create(
-                product_account=self.product_account,
-                amount=item.funding_amount,
-                transaction_type="USE",
-                description=f"Points used for Bounty: {item.bounty.title}",
-            )
-
-    def _create_refund_transactions(self):
-        for item in self.cart.items.filter(funding_type="Points"):
-            PointTransaction.objects.create(
-                product_account=self.product_account,
-                amount=item.funding_amount,
-                transaction_type="REFUND",
-                description=f"Points refunded for Bounty: {item.bounty.title}",
-            )
-
     def _activate_purchases(self):
         for item in self.cart.items.filter(funding_type="Points"):
             bounty = item.bounty
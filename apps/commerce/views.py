@@ -7,6 +7,7 @@ from django.db import transaction
 from django.http import JsonResponse
 
 from .models import BountyCart, BountyCartItem, Organisation, OrganisationPointAccount, PointTransaction
+from apps.common.mixins import CursorPaginationMixin
 from apps.product_management.models import Bounty
 
 @login_required
@@ -96,13 +97,7 @@ def grant_points(request):
         organisation = get_object_or_404(Organisation, id=organisation_id)
         point_account, created = OrganisationPointAccount.objects.get_or_create(organisation=organisation)
         
-        point_account.add_points(amount)
-        PointTransaction.objects.create(
-            account=point_account,
-            amount=amount,
-            transaction_type='GRANT',
-            description=description
-        )
+        point_account.add_points(amount, entry={'transaction_type': 'GRANT', 'description': description})
         
         messages.success(request, f"{amount} points granted to {organisation.name}")
         return redirect('organisation_point_account', pk=point_account.pk)
@@ -110,11 +105,12 @@ def grant_points(request):
     return JsonResponse({'error': 'Invalid request'}, status=400)
 
 @method_decorator(login_required, name='dispatch')
-class PointTransactionListView(ListView):
+class PointTransactionListView(CursorPaginationMixin, ListView):
     model = PointTransaction
     template_name = 'commerce/point_transactions.html'
     context_object_name = 'transactions'
     paginate_by = 20
 
     def get_queryset(self):
-        return PointTransaction.objects.filter(account__organisation__user=self.request.user).order_by('-created_at')
\ No newline at end of file
+        # Ordered newest first by CursorPaginationMixin
+        return PointTransaction.objects.filter(account__organisation__user=self.request.user)
\ No newline at end of file
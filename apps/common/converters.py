@@ -0,0 +1,19 @@
+from .fields import decode_uuid
+
+
+class Base58IdConverter:
+    """
+    Matches Base58 ids that decode to a UUID and keeps them as strings. Native uuid primary keys reject anything
+    else with a ``ValidationError`` when they are looked up, so without it a malformed id in a URL is a 500
+    rather than a 404.
+    """
+
+    regex = "[1-9A-HJ-NP-Za-km-z]{1,22}"
+
+    def to_python(self, value):
+        # A ValueError makes the pattern not match
+        decode_uuid(value)
+        return value
+
+    def to_url(self, value):
+        return str(value)
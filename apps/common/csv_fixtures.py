@@ -0,0 +1,313 @@
+"""
+Set-based loading of CSV fixtures.
+
+The CSV header uses field attnames (``product_id``) and ``<m2m field>_ids`` for many-to-many columns holding
+comma separated ids. Rows are streamed in chunks; for every chunk the referenced foreign keys are checked with one
+query per related model and the rows are upserted with a single ``INSERT ... ON CONFLICT (id) DO UPDATE``.
+
+Full imports order the fixtures by their foreign keys and load the models of each level in parallel. Exports are
+streamed by PostgreSQL with ``COPY ... TO STDOUT`` straight into a gzip file, so memory use doesn't grow with the
+table size.
+"""
+import csv
+import gzip
+import json
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.apps import apps
+from django.db import connections, models, transaction
+from django.utils import timezone
+
+NULL_VALUES = ("", "null", "none")
+TRUE_VALUES = ("true", "t", "1", "yes")
+
+
+@dataclass
+class LoadResult:
+    rows: int = 0
+    loaded: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+    errors: list = field(default_factory=list)
+
+    @property
+    def rows_per_second(self):
+        return self.loaded / self.seconds if self.seconds else 0.0
+
+
+class BulkCSVLoader:
+    def __init__(self, model, chunk_size=1000, log=print):
+        if model._meta.parents:
+            raise ValueError(f"{model._meta.label} uses multi-table inheritance and can't be bulk loaded")
+        self.model = model
+        self.chunk_size = chunk_size
+        self.log = log
+        # Ids already known to exist per related model, so later chunks only query new ones
+        self.known_ids = {}
+
+    def map_columns(self, header):
+        opts = self.model._meta
+        columns, m2m_columns = {}, {}
+        concrete = {f.attname: f for f in opts.concrete_fields}
+        concrete.update({f.name: f for f in opts.concrete_fields})
+        many_to_many = {f.name: f for f in opts.many_to_many}
+        for column in header:
+            if column in concrete:
+                columns[column] = concrete[column]
+            elif column.endswith("_ids") and column[:-4] in many_to_many:
+                m2m_columns[column] = many_to_many[column[:-4]]
+            else:
+                self.log(f"Ignoring column {column}: not a field of {opts.label}")
+        return columns, m2m_columns
+
+    def convert(self, model_field, value):
+        if value is None or value.strip().lower() in NULL_VALUES:
+            if model_field.null:
+                return None
+            if model_field.empty_strings_allowed:
+                return ""
+            return model_field.get_default() if model_field.has_default() else value
+        if isinstance(model_field, models.JSONField):
+            return json.loads(value)
+        if model_field.is_relation:
+            model_field = model_field.target_field
+        if isinstance(model_field, models.BooleanField):
+            return value.strip().lower() in TRUE_VALUES
+        converted = model_field.to_python(value)
+        if isinstance(model_field, models.DateTimeField) and timezone.is_naive(converted):
+            converted = timezone.make_aware(converted)
+        return converted
+
+    def existing_ids(self, related_field, values):
+        related_model = related_field.related_model
+        target = related_field.target_field.attname
+        known = self.known_ids.setdefault(related_model, set())
+        missing = set(values) - known
+        if missing:
+            known.update(
+                related_model._base_manager.filter(**{f"{target}__in": missing}).values_list(target, flat=True)
+            )
+        return known
+
+    def check_foreign_keys(self, rows, columns):
+        """Drops rows that point at missing non-nullable relations and nulls out missing nullable ones."""
+        for column, model_field in columns.items():
+            # Self references may point at rows later in the file; the deferred FK constraint checks those
+            if not model_field.is_relation or model_field.related_model is self.model:
+                continue
+            values = {row[column] for row in rows if row[column] is not None}
+            if not values:
+                continue
+            existing = self.existing_ids(model_field, values)
+            for row in rows:
+                if row[column] is None or row[column] in existing:
+                    continue
+                action = "set to null" if model_field.null else "row skipped"
+                self.log(f"{self.model._meta.label} {row.get('id')}: {column} {row[column]} not found, {action}")
+                if model_field.null:
+                    row[column] = None
+                else:
+                    row["__skip__"] = True
+        return [row for row in rows if not row.pop("__skip__", False)]
+
+    def parse_chunk(self, raw_rows, columns, m2m_columns):
+        rows, m2m_values = [], {}
+        pk_name = self.model._meta.pk.attname
+        for raw in raw_rows:
+            if not any(raw.values()):
+                continue
+            if None in raw:
+                # DictReader puts the values past the header under None, usually an unquoted comma in a field
+                raise ValueError(f"{len(raw[None])} more values than columns, quote the fields holding commas")
+            row = {column: self.convert(model_field, raw[column]) for column, model_field in columns.items()}
+            for column in m2m_columns:
+                ids = [value.strip() for value in (raw[column] or "").split(",") if value.strip()]
+                m2m_values.setdefault(column, {})[row.get(pk_name)] = ids
+            rows.append(row)
+        # ON CONFLICT DO UPDATE can't touch the same row twice in one statement, the last row for an id wins
+        if pk_name in columns:
+            rows = list({row[pk_name]: row for row in rows}.values())
+        return rows, m2m_values
+
+    def upsert(self, rows, columns):
+        opts = self.model._meta
+        objs = [self.model(**{columns[column].attname: value for column, value in row.items()}) for row in rows]
+        for obj in objs:
+            if hasattr(obj, "pre_save_polymorphic"):
+                # django-polymorphic only sets the content type in save()
+                obj.pre_save_polymorphic()
+        # A plain queryset, since polymorphic managers don't accept the conflict arguments
+        queryset = models.QuerySet(self.model)
+        update_fields = [f.name for f in columns.values() if not f.primary_key]
+        if opts.pk not in columns.values():
+            return queryset.bulk_create(objs)
+        if not update_fields:
+            return queryset.bulk_create(objs, ignore_conflicts=True)
+        return queryset.bulk_create(
+            objs, update_conflicts=True, unique_fields=[opts.pk.name], update_fields=update_fields
+        )
+
+    def set_many_to_many(self, objs, m2m_columns, m2m_values):
+        for column, m2m_field in m2m_columns.items():
+            through = m2m_field.remote_field.through
+            source = m2m_field.m2m_field_name()
+            target = m2m_field.m2m_reverse_field_name()
+            values = m2m_values.get(column, {})
+            owners = [obj.pk for obj in objs if obj.pk in values]
+            existing = self.existing_ids(m2m_field, {value for pk in owners for value in values[pk]})
+            through._base_manager.filter(**{f"{source}__in": owners}).delete()
+            links = []
+            for pk in owners:
+                for value in values[pk]:
+                    if value in existing:
+                        links.append(through(**{f"{source}_id": pk, f"{target}_id": value}))
+                    else:
+                        self.log(f"{self.model._meta.label} {pk}: {column} {value} not found, skipped")
+            through._base_manager.bulk_create(links, ignore_conflicts=True)
+
+    def load_chunk(self, raw_rows, columns, m2m_columns):
+        with transaction.atomic():
+            rows, m2m_values = self.parse_chunk(raw_rows, columns, m2m_columns)
+            rows = self.check_foreign_keys(rows, columns)
+            objs = self.upsert(rows, columns)
+            if m2m_columns:
+                self.set_many_to_many(objs, m2m_columns, m2m_values)
+        return len(objs)
+
+    def load(self, csv_file):
+        result = LoadResult()
+        start = time.perf_counter()
+        opener = gzip.open if str(csv_file).endswith(".gz") else open
+        with opener(csv_file, mode="rt", newline="") as file, transaction.atomic():
+            reader = csv.DictReader(file)
+            columns, m2m_columns = self.map_columns(reader.fieldnames or [])
+            while raw_rows := list(islice(reader, self.chunk_size)):
+                first_line = result.rows + 2  # after the header, 1-based
+                result.rows += len(raw_rows)
+                try:
+                    loaded = self.load_chunk(raw_rows, columns, m2m_columns)
+                except Exception:
+                    # Retry the failed chunk row by row so a single bad row doesn't drop its neighbours
+                    loaded = 0
+                    for line, raw in enumerate(raw_rows, start=first_line):
+                        try:
+                            loaded += self.load_chunk([raw], columns, m2m_columns)
+                        except Exception as e:
+                            result.errors.append(f"Line {line}: {e}")
+                result.loaded += loaded
+                result.skipped += len(raw_rows) - loaded
+        result.seconds = time.perf_counter() - start
+        return result
+
+
+def fixture_path(model):
+    """Fixtures live in ``<app>/fixtures/<model-name-in-kebab-case>-fixture.csv``."""
+    name = re.sub(r"(?<!^)(?=[A-Z])", "-", model.__name__).lower()
+    return os.path.join(model._meta.app_config.path, "fixtures", f"{name}-fixture.csv")
+
+
+def find_fixtures(app_configs):
+    fixtures = {}
+    for app_config in app_configs:
+        for model in app_config.get_models():
+            path = fixture_path(model)
+            if os.path.exists(path):
+                fixtures[model] = path
+    return fixtures
+
+
+def get_dependencies(model, models_to_load, include_nullable=True):
+    dependencies = set()
+    for model_field in model._meta.concrete_fields + model._meta.many_to_many:
+        related_model = model_field.related_model if model_field.is_relation else None
+        if related_model is None or related_model is model or related_model not in models_to_load:
+            continue
+        if include_nullable or not model_field.null:
+            dependencies.add(related_model)
+    return dependencies
+
+
+def dependency_levels(models_to_load):
+    """
+    Groups models so that every model comes after the models its foreign keys point to. Models in the same level
+    don't depend on each other and can be loaded concurrently. Cycles are broken by ignoring nullable foreign keys,
+    whose missing targets are then loaded as null.
+    """
+    models_to_load = set(models_to_load)
+    dependencies = {model: get_dependencies(model, models_to_load) for model in models_to_load}
+    levels, loaded = [], set()
+    while len(loaded) < len(models_to_load):
+        remaining = models_to_load - loaded
+        level = {model for model in remaining if dependencies[model] <= loaded}
+        if not level:
+            for model in remaining:
+                dependencies[model] = get_dependencies(model, models_to_load, include_nullable=False)
+            level = {model for model in remaining if dependencies[model] <= loaded}
+        if not level:
+            # Required foreign keys form a cycle; let the loader skip what it can't resolve
+            level = remaining
+        levels.append(sorted(level, key=lambda model: model._meta.label))
+        loaded |= level
+    return levels
+
+
+def load_fixture(label, path, chunk_size=1000):
+    """Loads one fixture file. Runs in a worker process, which opens its own database connection."""
+    messages = []
+    try:
+        result = BulkCSVLoader(apps.get_model(label), chunk_size=chunk_size, log=messages.append).load(path)
+    except Exception as e:
+        result = LoadResult(errors=[str(e)])
+    return label, result, messages
+
+
+def import_fixtures(fixtures, workers=None, chunk_size=1000):
+    """
+    Loads ``{model: path}`` fixtures level by level. Each level is loaded by a pool of forked workers; with
+    ``workers=1`` everything runs in the current process and connection. Yields ``(label, result, messages)``.
+    """
+    for level in dependency_levels(fixtures):
+        jobs = [(model._meta.label, fixtures[model], chunk_size) for model in level]
+        if workers == 1 or len(jobs) == 1:
+            yield from (load_fixture(*job) for job in jobs)
+            continue
+        # Forked workers must not share the parent's connection; each one connects on first use
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            yield from executor.map(load_fixture, *zip(*jobs))
+
+
+TIMESTAMP_FIELDS = ("updated_at", "timestamp", "created_at")
+
+
+def get_timestamp_field(model):
+    names = {f.name for f in model._meta.concrete_fields}
+    return next((name for name in TIMESTAMP_FIELDS if name in names), None)
+
+
+def export_queryset(model, since=None):
+    """Rows of ``model`` with attname columns, optionally only those changed since ``since``."""
+    # No ordering, so the database can stream the rows without sorting the table first
+    queryset = models.QuerySet(model).order_by()
+    if since is not None:
+        timestamp_field = get_timestamp_field(model)
+        if timestamp_field is None:
+            raise ValueError(f"{model._meta.label} has no timestamp field to export changes since {since}")
+        queryset = queryset.filter(**{f"{timestamp_field}__gte": since})
+    return queryset.values_list(*[f.attname for f in model._meta.concrete_fields])
+
+
+def export_fixture(model, path, since=None, using="default"):
+    """Writes ``model`` as gzip compressed CSV to ``path`` and returns the number of rows written."""
+    sql, params = export_queryset(model, since).query.sql_with_params()
+    with connections[using].cursor() as cursor, gzip.open(path, "wb") as file:
+        query = cursor.mogrify(sql, params).decode()
+        cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)", file)
+        return cursor.rowcount
@@ -1,8 +1,105 @@
+import os
+import threading
+import time
 import uuid
-import base58
+from django import forms
+from django.core import exceptions
 from django.db import models
 from django.conf import settings
 
+# The Bitcoin alphabet used by the base58 package. It is in ASCII order, so for ids of the same length the
+# Base58 strings sort like the integers they encode (under the "C" collation).
+BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+BASE58_INDEX = {char: index for index, char in enumerate(BASE58_ALPHABET)}
+
+# Encoding two digits per division halves the number of big integer divisions
+_BASE58_PAIRS = [a + b for a in BASE58_ALPHABET for b in BASE58_ALPHABET]
+_BASE58_PAIR_BASE = 58 * 58
+
+
+def b58encode_int(value):
+    """Base58 digits of a non-negative integer, without leading zeros."""
+    digits = []
+    while value >= _BASE58_PAIR_BASE:
+        value, remainder = divmod(value, _BASE58_PAIR_BASE)
+        digits.append(_BASE58_PAIRS[remainder])
+    digits.append(_BASE58_PAIRS[value] if value >= 58 else BASE58_ALPHABET[value])
+    return ''.join(reversed(digits))
+
+
+def encode_uuid(value):
+    """
+    Base58 encodes a UUID (or its 128 bit integer). The result is identical to
+    ``base58.b58encode(value.bytes)``, including the '1' written for each leading zero byte, so existing ids
+    decode the same way.
+    """
+    number = value if isinstance(value, int) else value.int
+    if not number:
+        return '1' * 16
+    return '1' * ((128 - number.bit_length()) // 8) + b58encode_int(number)
+
+
+def decode_uuid(value):
+    """Turns a Base58 id created by ``encode_uuid`` or ``base58.b58encode`` back into a UUID."""
+    number = 0
+    try:
+        for char in value:
+            number = number * 58 + BASE58_INDEX[char]
+    except KeyError:
+        raise ValueError(f'{value!r} is not a Base58 string')
+    if number >> 128:
+        raise ValueError(f'{value!r} does not encode a UUID')
+    return uuid.UUID(int=number)
+
+
+class UUID7Generator:
+    """
+    Generates UUIDv7 values (RFC 9562): a 48 bit Unix timestamp in milliseconds, followed by a 12 bit counter
+    and 62 random bits. The counter starts at a random value every millisecond and is incremented for each id
+    created in the same millisecond, so ids from one process are strictly increasing.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.last_ms = 0
+        self.counter = 0
+
+    def generate(self, n=1):
+        randomness = os.urandom(8 * n + 1)
+        with self.lock:
+            now = time.time_ns() // 1_000_000
+            if now > self.last_ms:
+                # Leave room in the counter for ids created later in the same millisecond
+                self.last_ms, self.counter = now, randomness[-1] << 3
+            else:
+                self.counter += 1
+            ms, counter = self.last_ms, self.counter
+            values = []
+            for offset in range(0, 8 * n, 8):
+                if counter > 0xFFF:
+                    # Counter overflow: borrow the next millisecond rather than lose the ordering
+                    ms, counter = ms + 1, 0
+                random_bits = int.from_bytes(randomness[offset:offset + 8], "big") & 0x3FFF_FFFF_FFFF_FFFF
+                values.append((ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | random_bits)
+                counter += 1
+            self.last_ms, self.counter = ms, counter - 1
+        return values
+
+
+uuid7_generator = UUID7Generator()
+
+
+def uuid7():
+    return uuid.UUID(int=uuid7_generator.generate()[0])
+
+
+def generate_ids(n):
+    """
+    ``n`` Base58 encoded UUIDv7 ids in increasing order, for assigning primary keys before a ``bulk_create``.
+    """
+    return [encode_uuid(value) for value in uuid7_generator.generate(n)]
+
+
 class Base58UUIDv5Field(models.CharField):
     """
     A reusable custom Django field that generates a Base58 encoded UUIDv5
@@ -12,31 +109,24 @@ class Base58UUIDv5Field(models.CharField):
     description = "A Base58 encoded UUIDv5 field based on a custom namespace and per-record UUIDv4."
 
     def __init__(self, *args, **kwargs):
-        # Set the max length for Base58 encoded UUIDs and ensure uniqueness
+        # Set the max length for Base58 encoded UUIDs
         kwargs['max_length'] = 22  # Base58-encoded UUID is 22 characters long
-        kwargs['unique'] = True  # Ensure unique UUIDs
-        if kwargs.get('primary_key', False):
-            kwargs['primary_key'] = True  # Set as primary key if needed
+        if not kwargs.get('primary_key', False):
+            kwargs['unique'] = True  # Primary keys are unique already, other ids get a unique constraint
         super().__init__(*args, **kwargs)
 
+    def generate_id(self):
+        # Generate a UUIDv5 using the custom namespace (from settings) and a record-specific UUIDv4 as the name
+        uuid_obj = uuid.uuid5(settings.PLATFORM_NAMESPACE, str(uuid.uuid4()))
+        return encode_uuid(uuid_obj)
+
     def pre_save(self, model_instance, add):
         """
-        Automatically assign a Base58 encoded UUIDv5 when creating a new record.
-        Combines the custom namespace (retrieved from environment/settings) and a per-record UUIDv4.
+        Automatically assign a generated Base58 id when creating a new record.
         """
         value = getattr(model_instance, self.attname, None)
         if not value:  # If no value is set, generate one
-            # Retrieve the custom namespace from settings (or use a default)
-            custom_namespace = settings.PLATFORM_NAMESPACE
-
-            # Generate a UUIDv4 for this record
-            record_uuid = uuid.uuid4()
-
-            # Generate a UUIDv5 using the custom namespace and the record-specific UUIDv4 as the name
-            uuid_obj = uuid.uuid5(custom_namespace, str(record_uuid))
-
-            # Encode the UUIDv5 as Base58
-            value = base58.b58encode(uuid_obj.bytes).decode('ascii')
+            value = self.generate_id()
             setattr(model_instance, self.attname, value)
         return value
 
@@ -47,4 +137,82 @@ class Base58UUIDv5Field(models.CharField):
         name, path, args, kwargs = super().deconstruct()
         kwargs.pop('max_length', None)
         kwargs.pop('unique', None)
-        return name, path, args, kwargs
\ No newline at end of file
+        return name, path, args, kwargs
+
+
+class Base58UUIDv7Field(Base58UUIDv5Field):
+    """
+    A Base58 encoded UUIDv7 field. New ids start with a millisecond timestamp, so they are inserted at the right
+    edge of the primary key index instead of splitting pages all over it, which suits append-heavy tables.
+
+    Ids are 21 characters until the year 2248 and keep the 22 character column, so ids created earlier by
+    ``Base58UUIDv5Field`` stay valid. The column uses the "C" collation, which compares the strings byte by
+    byte and therefore in the same order as the timestamps.
+    """
+    description = "A Base58 encoded, time-ordered UUIDv7 field."
+
+    def __init__(self, *args, **kwargs):
+        kwargs['db_collation'] = 'C'
+        super().__init__(*args, **kwargs)
+
+    def generate_id(self):
+        return generate_ids(1)[0]
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs.pop('db_collation', None)
+        return name, path, args, kwargs
+
+
+class Base58NativeUUIDField(models.UUIDField):
+    """
+    Stores ids as a native 16 byte PostgreSQL ``uuid`` while Python code, URLs, forms and CSV fixtures keep
+    using the Base58 strings of ``Base58UUIDv5Field``. Foreign keys to a model using this field get a ``uuid``
+    column too, which halves the size of the keys in indexes and joins.
+
+    New ids are time-ordered UUIDv7 values. Existing tables are converted with
+    ``apps.common.operations.ConvertBase58IdToUUID``, which keeps their current ids.
+    """
+    description = "A Base58 encoded UUID stored as a native uuid."
+
+    def generate_id(self):
+        return generate_ids(1)[0]
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.attname, None)
+        if not value:
+            value = self.generate_id()
+            setattr(model_instance, self.attname, value)
+        return value
+
+    def to_uuid(self, value):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        if isinstance(value, int):
+            return uuid.UUID(int=value)
+        try:
+            # Canonical hex UUIDs (as written by COPY exports) are longer than any Base58 id
+            return uuid.UUID(value) if len(value) > 22 else decode_uuid(value)
+        except (AttributeError, ValueError):
+            raise exceptions.ValidationError(
+                self.error_messages['invalid'], code='invalid', params={'value': value}
+            )
+
+    def to_python(self, value):
+        if value is None or value == '':
+            return None
+        return encode_uuid(self.to_uuid(value))
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return encode_uuid(value if isinstance(value, uuid.UUID) else uuid.UUID(value))
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        value = self.to_uuid(value or None)
+        if value is None or connection.features.has_native_uuid_field:
+            return value
+        return value.hex
+
+    def formfield(self, **kwargs):
+        return models.Field.formfield(self, **{'form_class': forms.CharField, 'max_length': 22, **kwargs})
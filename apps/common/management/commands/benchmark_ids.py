@@ -0,0 +1,128 @@
+import time
+import uuid
+
+import base58
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from psycopg2.extras import execute_values
+
+from apps.common.fields import Base58UUIDv5Field, Base58UUIDv7Field, decode_uuid, generate_ids
+
+INDEX_TABLE = "benchmark_ids"
+# BountyClaim -> Bounty -> Challenge -> Product, with the number of rows per claim
+JOIN_TABLES = [
+    ("benchmark_claim", 1),
+    ("benchmark_bounty", 1),
+    ("benchmark_challenge", 10),
+    ("benchmark_product", 100),
+]
+JOIN_QUERY = """
+    SELECT count(*) FROM benchmark_claim
+    JOIN benchmark_bounty ON benchmark_bounty.id = benchmark_claim.parent_id
+    JOIN benchmark_challenge ON benchmark_challenge.id = benchmark_bounty.parent_id
+    JOIN benchmark_product ON benchmark_product.id = benchmark_challenge.parent_id
+"""
+
+
+def legacy_id():
+    # What Base58UUIDv5Field.pre_save did before the fast encoder
+    uuid_obj = uuid.uuid5(settings.PLATFORM_NAMESPACE, str(uuid.uuid4()))
+    return base58.b58encode(uuid_obj.bytes).decode("ascii")
+
+
+class Command(BaseCommand):
+    help = "Compare the cost of generating Base58 primary keys, their index sizes and join speed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=100_000, help="Ids generated per generator")
+        parser.add_argument("--rows", type=int, default=200_000, help="Rows inserted per index test")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per insert statement")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs of the join query per key type")
+
+    def time_generator(self, generate, count):
+        start = time.perf_counter()
+        generate(count)
+        return (time.perf_counter() - start) / count * 1_000_000
+
+    def generators(self):
+        v5_field, v7_field = Base58UUIDv5Field(), Base58UUIDv7Field()
+        return [
+            ("uuid5 + base58 package", lambda n: [legacy_id() for _ in range(n)]),
+            ("Base58UUIDv5Field", lambda n: [v5_field.generate_id() for _ in range(n)]),
+            ("Base58UUIDv7Field", lambda n: [v7_field.generate_id() for _ in range(n)]),
+            ("generate_ids(n)", generate_ids),
+        ]
+
+    def index_test(self, ids, batch_size):
+        """Inserts the ids in order of generation and returns (seconds, primary key index size in bytes)."""
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'CREATE TEMPORARY TABLE "{INDEX_TABLE}" (id varchar(22) COLLATE "C" PRIMARY KEY)')
+            start = time.perf_counter()
+            for offset in range(0, len(ids), batch_size):
+                batch = ids[offset:offset + batch_size]
+                execute_values(cursor, f'INSERT INTO "{INDEX_TABLE}" (id) VALUES %s', [(id,) for id in batch])
+            elapsed = time.perf_counter() - start
+            cursor.execute("SELECT pg_relation_size(%s)", [f"{INDEX_TABLE}_pkey"])
+            size = cursor.fetchone()[0]
+            cursor.execute(f'DROP TABLE "{INDEX_TABLE}"')
+        return elapsed, size
+
+    def join_test(self, column_type, new_id, rows, repeat):
+        """
+        Builds the claim -> bounty -> challenge -> product chain with ``column_type`` keys and returns
+        (seconds per join of all rows, size of all indexes in bytes).
+        """
+        with transaction.atomic(), connection.cursor() as cursor:
+            parent_ids = []
+            for table, divisor in reversed(JOIN_TABLES):
+                table_ids = [new_id() for _ in range(rows // divisor)]
+                cursor.execute(
+                    f'CREATE TEMPORARY TABLE "{table}" (id {column_type} PRIMARY KEY, parent_id {column_type})'
+                )
+                cursor.execute(f'CREATE INDEX ON "{table}" (parent_id)')
+                values = [
+                    (id, parent_ids[index % len(parent_ids)] if parent_ids else None)
+                    for index, id in enumerate(table_ids)
+                ]
+                execute_values(cursor, f'INSERT INTO "{table}" (id, parent_id) VALUES %s', values, page_size=1000)
+                cursor.execute(f'ANALYZE "{table}"')
+                parent_ids = table_ids
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                cursor.execute(JOIN_QUERY)
+                cursor.fetchone()
+            elapsed = (time.perf_counter() - start) / repeat
+
+            tables = [table for table, _ in JOIN_TABLES]
+            cursor.execute("SELECT sum(pg_indexes_size(name::regclass)) FROM unnest(%s) AS name", [tables])
+            size = cursor.fetchone()[0]
+            for table in tables:
+                cursor.execute(f'DROP TABLE "{table}"')
+        return elapsed, size
+
+    def handle(self, *args, **options):
+        count, rows = options["count"], options["rows"]
+
+        self.stdout.write(f"{'generator':<30}{'us per id':>12}")
+        for name, generate in self.generators():
+            self.stdout.write(f"{name:<30}{self.time_generator(generate, count):>12.2f}")
+
+        v5_field = Base58UUIDv5Field()
+        random_ids = [v5_field.generate_id() for _ in range(rows)]
+        ordered_ids = generate_ids(rows)
+
+        self.stdout.write(f"\n{'primary key':<30}{'insert s':>12}{'rows/s':>12}{'index MB':>12}")
+        for name, ids in [("Base58UUIDv5Field (random)", random_ids), ("Base58UUIDv7Field (ordered)", ordered_ids)]:
+            elapsed, size = self.index_test(ids, options["batch_size"])
+            self.stdout.write(f"{name:<30}{elapsed:>12.2f}{rows / elapsed:>12.0f}{size / 1024 / 1024:>12.2f}")
+
+        keys = [
+            ("varchar(22)", v5_field.generate_id),
+            ("uuid", lambda: decode_uuid(v5_field.generate_id())),
+        ]
+        self.stdout.write(f"\n{'join key':<30}{'join ms':>12}{'index MB':>12}")
+        for column_type, new_id in keys:
+            elapsed, size = self.join_test(column_type, new_id, rows, options["repeat"])
+            self.stdout.write(f"{column_type:<30}{elapsed * 1000:>12.1f}{size / 1024 / 1024:>12.2f}")
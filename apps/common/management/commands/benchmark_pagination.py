@@ -0,0 +1,73 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.db import connection, transaction
+
+from apps.common.fields import generate_ids
+from apps.common.pagination import paginate_by_cursor
+from apps.product_management.models import Product
+
+
+class Command(BaseCommand):
+    help = "Compare offset and keyset (cursor) pagination of the product list on shallow and deep pages"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100_000, help="Products created for the test")
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--pages", type=int, nargs="+", default=[1, 1000], help="Page numbers to time")
+        parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement, the median is shown")
+
+    def median_ms(self, fetch, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fetch()
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings) * 1000
+
+    def create_products(self, rows):
+        # bulk_create needs the ids up front, pre_save only assigns them to single saves
+        ids = generate_ids(rows)
+        for offset in range(0, rows, 5000):
+            Product.objects.bulk_create(
+                Product(
+                    id=id,
+                    name=f"Product {offset + index}",
+                    slug=f"benchmark-product-{offset + index}",
+                    short_description="",
+                    full_description="",
+                )
+                for index, id in enumerate(ids[offset:offset + 5000])
+            )
+
+    def handle(self, *args, **options):
+        size, repeat = options["page_size"], options["repeat"]
+        with transaction.atomic():
+            self.create_products(options["rows"])
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {connection.ops.quote_name(Product._meta.db_table)}")
+            queryset = Product.objects.all()
+            ordered = queryset.order_by("created_at", "id")
+
+            self.stdout.write(f"{'page':>8}{'offset ms':>12}{'keyset ms':>12}")
+            for number in options["pages"]:
+                # What the page-numbered ListView did: count the rows, then skip to the page
+                def offset_page():
+                    return list(Paginator(ordered, size).page(number).object_list)
+
+                cursor = None
+                if number > 1:
+                    last = ordered[(number - 1) * size - 1]
+                    cursor = (last.created_at, last.pk)
+
+                def keyset_page():
+                    return paginate_by_cursor(queryset, cursor, size, descending=False).object_list
+
+                assert [product.pk for product in offset_page()] == [product.pk for product in keyset_page()]
+                offset_ms, keyset_ms = self.median_ms(offset_page, repeat), self.median_ms(keyset_page, repeat)
+                self.stdout.write(f"{number:>8}{offset_ms:>12.2f}{keyset_ms:>12.2f}")
+
+            # The test products are never committed
+            transaction.set_rollback(True)
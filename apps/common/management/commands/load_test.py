@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from load_tests import report, runner
+from load_tests.journeys import BountyJourney, World, login
+from load_tests.stack import LocalStack
+
+
+class Command(BaseCommand):
+    help = "Replay the bounty workflow with concurrent users against a local gunicorn and a throwaway database"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+        parser.add_argument("--iterations", type=int, default=5, help="Journeys per user, each on a new bounty")
+        parser.add_argument("--think-time", type=float, default=0, help="Seconds a user waits between steps")
+        parser.add_argument("--workers", type=int, default=4, help="gunicorn worker processes")
+        parser.add_argument("--report-dir", default=report.REPORT_DIR, help="Where the JSON report is written")
+        parser.add_argument("--compare", help="Report of an earlier run to show the changes against")
+
+    def handle(self, *args, **options):
+        users, iterations = options["users"], options["iterations"]
+        baseline = report.load(options["compare"]) if options["compare"] else None
+
+        with LocalStack(workers=options["workers"]) as stack:
+            self.stdout.write(f"Seeding {users} users with {iterations} bounties each")
+            world = World.seed(users, iterations)
+            journeys = [
+                (
+                    BountyJourney(
+                        world,
+                        contributor,
+                        manager_session=login(stack.base_url, world.manager.user),
+                        contributor_session=login(stack.base_url, contributor.user),
+                    ),
+                    world.bounties[contributor.pk],
+                )
+                for contributor in world.contributors
+            ]
+            self.stdout.write(f"Running against {stack.base_url} with {options['workers']} workers")
+            recorder = runner.run(journeys, think_time=options["think_time"])
+
+        result = report.summarise(
+            recorder, users=users, iterations=iterations, think_time=options["think_time"], workers=options["workers"]
+        )
+        for line in report.format_table(result, baseline):
+            self.stdout.write(line)
+        path = report.write(result, options["report_dir"])
+        self.stdout.write(self.style.SUCCESS(f"Report written to {path}"))
@@ -11,6 +11,8 @@ import uuid
 from django.utils.dateparse import parse_datetime
 from django.utils.timezone import make_aware
 
+from apps.common.csv_fixtures import BulkCSVLoader
+
 
 def debug_print(message):
     print(f"DEBUG: {message}")
@@ -21,6 +23,8 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('csv_file', type=str, help='The CSV file to load')
         parser.add_argument('--model', type=str, help='The model to use for the CSV file', required=True)
+        parser.add_argument('--bulk', action='store_true', help='Stream the file and upsert it in chunks')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows per upsert in bulk mode')
 
     def parse_csv(self, file_path):
         with open(file_path, mode='r', newline='') as file:
@@ -74,12 +78,26 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR(f'Model {model_name} not found.'))
             return
 
+        if options['bulk']:
+            self.bulk_load(model, csv_file, options['chunk_size'])
+            return
+
         data = self.parse_csv(csv_file)
         parser = self.get_parser(model)
         objects = self.create_objects(model, data, parser)
 
         self.stdout.write(self.style.SUCCESS(f'Successfully processed {len(objects)} objects from {csv_file} into {model_name}'))
 
+    def bulk_load(self, model, csv_file, chunk_size):
+        loader = BulkCSVLoader(model, chunk_size=chunk_size, log=self.stdout.write)
+        result = loader.load(csv_file)
+        for error in result.errors:
+            self.stdout.write(self.style.ERROR(error))
+        self.stdout.write(self.style.SUCCESS(
+            f'Loaded {result.loaded} of {result.rows} rows from {csv_file} into {model._meta.label} '
+            f'in {result.seconds:.2f}s ({result.rows_per_second:.0f} rows/sec)'
+        ))
+
 class ModelParser:
     def parse_row(self, row):
         parsed_row = {}
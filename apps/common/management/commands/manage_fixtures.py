@@ -8,10 +8,12 @@ Usage:
     python manage.py manage_fixtures <action> [--app <app_name>]
 
 Actions:
-    export          - Export data from the database to CSV fixtures for all models in all apps
-                      (or a specific app if --app is specified).
+    export          - Export data from the database to gzip compressed CSV for all models in all apps
+                      (or a specific app if --app is specified). Rows are streamed with COPY, so
+                      large tables are exported in constant memory.
     import          - Import data from CSV fixtures into the database for all models in all apps
-                      (or a specific app if --app is specified).
+                      (or a specific app if --app is specified). Models are loaded in foreign key order,
+                      models that don't depend on each other in parallel worker processes.
     validate        - Validate CSV fixtures against model definitions for all apps
                       (or a specific app if --app is specified).
     convert_json    - Convert existing JSON fixtures to CSV format for all apps
@@ -19,6 +21,11 @@ Actions:
 
 Options:
     --app <app_name>    Specify a single app to process instead of all apps.
+    --workers <n>       Number of worker processes for import (1 loads everything in this process).
+    --chunk-size <n>    Number of rows per bulk upsert for import.
+    --since <date>      Export only rows whose updated_at (or timestamp/created_at) is at or after the date.
+    --model <label>     Export a single model, e.g. security.SignInAttempt.
+    --output <dir>      Export into this directory instead of each app's 'fixtures/csv' directory.
 
 Examples:
     1. Export fixtures for all apps:
@@ -33,8 +40,12 @@ Examples:
     4. Convert JSON fixtures to CSV for a specific app:
        python manage.py manage_fixtures convert_json --app myapp
 
+    5. Incremental snapshot of the sign in attempts changed since a date:
+       python manage.py manage_fixtures export --app security --model security.SignInAttempt --since 2024-10-01
+
 Notes:
-    - CSV files are stored in and read from each app's 'fixtures/csv' directory.
+    - Import reads each app's 'fixtures/<model-name>-fixture.csv' files, e.g. 'fixtures/bounty-bid-fixture.csv'.
+    - Export, validate and convert_json use each app's 'fixtures/csv' directory.
     - JSON files are read from each app's 'fixtures' directory when converting.
     - Always backup your database before performing import operations.
     - It's recommended to run import operations in a test environment first.
@@ -45,9 +56,15 @@ For more information, see the method docstrings within this file.
 import os
 import csv
 import json
+import time
+from datetime import datetime
 from django.core.management.base import BaseCommand, CommandError
 from django.apps import apps
 from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.timezone import is_naive, make_aware
+
+from apps.common.csv_fixtures import export_fixture, find_fixtures, get_timestamp_field, import_fixtures
 
 
 class Command(BaseCommand):
@@ -61,6 +78,15 @@ class Command(BaseCommand):
             help="Action to perform on fixtures",
         )
         parser.add_argument("--app", type=str, help="Specific app to process (optional)")
+        parser.add_argument(
+            "--workers", type=int, default=None, help="Worker processes for import (default: number of CPUs)"
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Rows per bulk upsert for import")
+        parser.add_argument(
+            "--since", type=str, help="Export only rows changed since this ISO date or datetime (export only)"
+        )
+        parser.add_argument("--model", type=str, help="Export a single model, e.g. security.SignInAttempt")
+        parser.add_argument("--output", type=str, help="Directory to export to instead of each app's fixtures/csv")
 
     def handle(self, *args, **options):
         action = options["action"]
@@ -74,11 +100,14 @@ class Command(BaseCommand):
         else:
             app_configs = apps.get_app_configs()
 
+        if action == "import":
+            self.import_from_csv(app_configs, options["workers"], options["chunk_size"])
+
+        since = self.parse_since(options["since"]) if options.get("since") else None
+
         for app_config in app_configs:
             if action == "export":
-                self.export_to_csv(app_config)
-            elif action == "import":
-                self.import_from_csv(app_config)
+                self.export_to_csv(app_config, since, options.get("model"), options.get("output"))
             elif action == "validate":
                 self.validate_csv(app_config)
             elif action == "convert_json":
@@ -86,50 +115,54 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.SUCCESS(f"{action.capitalize()} operation completed."))
 
-    def export_to_csv(self, app_config):
+    def parse_since(self, value):
+        since = parse_datetime(value)
+        if since is None and (date := parse_date(value)) is not None:
+            since = datetime.combine(date, datetime.min.time())
+        if since is None:
+            raise CommandError(f"Invalid --since value '{value}', expected an ISO date or datetime")
+        return make_aware(since) if is_naive(since) else since
+
+    def export_to_csv(self, app_config, since=None, model_label=None, output=None):
         app_name = app_config.name
-        csv_fixture_dir = os.path.join(app_name, "fixtures", "csv")
+        csv_fixture_dir = output or os.path.join(app_config.path, "fixtures", "csv")
         os.makedirs(csv_fixture_dir, exist_ok=True)
 
         for model in app_config.get_models():
-            model_name = model._meta.model_name
-            csv_path = os.path.join(csv_fixture_dir, f"{model_name}.csv")
-
-            with open(csv_path, "w", newline="") as csvfile:
-                writer = csv.writer(csvfile)
-                fields = [field.name for field in model._meta.fields]
-                writer.writerow(fields)
+            if model_label and model._meta.label_lower != model_label.lower():
+                continue
+            if since is not None and get_timestamp_field(model) is None:
+                self.stdout.write(self.style.WARNING(f"Skipped {model._meta.label}: no timestamp to compare --since"))
+                continue
 
-                for instance in model.objects.all():
-                    row = [getattr(instance, field) for field in fields]
-                    writer.writerow(row)
+            model_name = model._meta.model_name
+            csv_path = os.path.join(csv_fixture_dir, f"{model_name}.csv.gz")
+            rows = export_fixture(model, csv_path, since=since)
 
-            self.stdout.write(self.style.SUCCESS(f"Exported {app_name}/{model_name} to CSV"))
+            self.stdout.write(self.style.SUCCESS(f"Exported {rows} rows of {app_name}/{model_name} to {csv_path}"))
 
-    def import_from_csv(self, app_config):
-        app_name = app_config.name
-        csv_fixture_dir = os.path.join(app_name, "fixtures", "csv")
-
-        if not os.path.exists(csv_fixture_dir):
-            self.stdout.write(self.style.WARNING(f"No CSV fixtures found for app: {app_name}"))
+    def import_from_csv(self, app_configs, workers, chunk_size):
+        fixtures = find_fixtures(app_configs)
+        if not fixtures:
+            self.stdout.write(self.style.WARNING("No CSV fixtures found"))
             return
 
-        for filename in os.listdir(csv_fixture_dir):
-            if filename.endswith(".csv"):
-                model_name = os.path.splitext(filename)[0]
-                try:
-                    model = app_config.get_model(model_name)
-                except LookupError:
-                    self.stdout.write(self.style.ERROR(f"No corresponding model found for CSV: {filename}"))
-                    continue
-
-                csv_path = os.path.join(csv_fixture_dir, filename)
-                with open(csv_path, "r") as csvfile:
-                    reader = csv.DictReader(csvfile)
-                    for row in reader:
-                        model.objects.create(**row)
-
-                self.stdout.write(self.style.SUCCESS(f"Imported {app_name}/{model_name} from CSV"))
+        start = time.perf_counter()
+        total = 0
+        for label, result, messages in import_fixtures(fixtures, workers=workers, chunk_size=chunk_size):
+            for message in messages:
+                self.stdout.write(message)
+            for error in result.errors:
+                self.stdout.write(self.style.ERROR(f"{label}: {error}"))
+            total += result.loaded
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Imported {result.loaded} of {result.rows} rows into {label} "
+                    f"({result.rows_per_second:.0f} rows/sec)"
+                )
+            )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f"Imported {total} rows from {len(fixtures)} fixtures in {elapsed:.2f}s")
 
     def validate_csv(self, app_config):
         app_name = app_config.name
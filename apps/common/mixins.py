@@ -76,6 +76,63 @@ class PersonSearchMixin:
         context["search_result"] = self.get_person_queryset()
         return context
 
+class CursorPaginationMixin:
+    """
+    Paginates a ``ListView`` by ``(created_at, id)`` cursors (see ``apps.common.pagination``) instead of page numbers.
+
+    ``page_obj.next_page_query`` is the query string of the next page. HTMX requests for a later page (the
+    ``partials/infinite_scroll.html`` sentinel) render ``items_template_name``, which should render the rows and
+    include the sentinel again, so the list grows as it is scrolled.
+    """
+
+    paginate_by = 20
+    cursor_param = "after"
+    cursor_descending = True
+    items_template_name = None
+
+    def get_template_names(self):
+        if self.request.htmx and self.cursor_param in self.request.GET and self.items_template_name:
+            return [self.items_template_name]
+        return super().get_template_names()
+
+    def get_cursor(self, queryset):
+        from django.core.exceptions import ValidationError
+
+        from apps.common.pagination import decode_cursor
+
+        cursor = decode_cursor(self.request.GET.get(self.cursor_param))
+        if cursor is None:
+            return None
+        try:
+            queryset.model._meta.pk.to_python(cursor[1])
+        except ValidationError:
+            return None
+        return cursor
+
+    def get_page_objects(self, rows):
+        """The objects shown for the paginated ``rows``, for views paginating something other than what they show."""
+        return rows
+
+    def get_page_query(self):
+        """The query parameters every page of the list is requested with."""
+        return self.request.GET.copy()
+
+    def get_next_page_query(self, page):
+        if not page.has_next():
+            return None
+        query = self.get_page_query()
+        query[self.cursor_param] = page.next_cursor
+        return query.urlencode()
+
+    def paginate_queryset(self, queryset, page_size):
+        from apps.common.pagination import paginate_by_cursor
+
+        page = paginate_by_cursor(queryset, self.get_cursor(queryset), page_size, self.cursor_descending)
+        page.object_list = self.get_page_objects(page.object_list)
+        page.next_page_query = self.get_next_page_query(page)
+        return None, page, page.object_list, page.has_other_pages()
+
+
 class TimeStampMixin(models.Model):
     """
     Abstract base class to add timestamp fields to a Django model.
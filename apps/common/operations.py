@@ -0,0 +1,118 @@
+"""
+Migration operations for moving Base58 primary keys to native ``uuid`` columns.
+
+``ConvertBase58IdToUUID`` changes the primary key of a model to ``Base58NativeUUIDField``. In the database the
+key and every foreign key column pointing at it (including many-to-many tables) are converted in place with
+``base58_to_uuid()``, so ids don't change and fixtures, URLs and audit records keep working. The operation is
+reversible; going back converts the columns to Base58 strings with ``uuid_to_base58()``.
+"""
+from django.db import migrations
+
+BASE58_FUNCTIONS_SQL = """
+CREATE OR REPLACE FUNCTION base58_to_uuid(value text) RETURNS uuid
+LANGUAGE plpgsql IMMUTABLE STRICT PARALLEL SAFE AS $$
+DECLARE
+    alphabet CONSTANT text := '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz';
+    number numeric := 0;
+    digit integer;
+    hex text := '';
+BEGIN
+    FOR i IN 1..length(value) LOOP
+        digit := strpos(alphabet, substr(value, i, 1)) - 1;
+        IF digit < 0 THEN
+            RAISE EXCEPTION 'invalid Base58 id: %', value;
+        END IF;
+        number := number * 58 + digit;
+    END LOOP;
+    FOR i IN 1..32 LOOP
+        hex := substr('0123456789abcdef', mod(number, 16)::integer + 1, 1) || hex;
+        number := div(number, 16);
+    END LOOP;
+    IF number > 0 THEN
+        RAISE EXCEPTION 'Base58 id does not fit in a uuid: %', value;
+    END IF;
+    RETURN hex::uuid;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION uuid_to_base58(value uuid) RETURNS varchar
+LANGUAGE plpgsql IMMUTABLE STRICT PARALLEL SAFE AS $$
+DECLARE
+    alphabet CONSTANT text := '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz';
+    hex CONSTANT text := replace(value::text, '-', '');
+    number numeric := 0;
+    result text := '';
+BEGIN
+    FOR i IN 1..32 LOOP
+        number := number * 16 + strpos('0123456789abcdef', substr(hex, i, 1)) - 1;
+    END LOOP;
+    WHILE number > 0 LOOP
+        result := substr(alphabet, mod(number, 58)::integer + 1, 1) || result;
+        number := div(number, 58);
+    END LOOP;
+    -- Like base58.b58encode, every leading zero byte is written as '1'
+    RETURN repeat('1', (32 - length(ltrim(hex, '0'))) / 2) || result;
+END
+$$;
+"""
+
+
+def get_referencing_fields(model):
+    """(model, field) for every foreign key column, auto-created many-to-many tables included, to the primary key."""
+    pk_name = model._meta.pk.name
+    return [
+        (relation.related_model, relation.field)
+        for relation in model._meta._get_fields(forward=False, reverse=True, include_hidden=True)
+        if relation.field.concrete and relation.field.target_field.name == pk_name
+    ]
+
+
+class ConvertBase58IdToUUID(migrations.AlterField):
+    """Alters the primary key ``name`` of ``model_name`` between a Base58 string and a native uuid column."""
+
+    reduces_to_sql = False
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self.convert_columns(app_label, schema_editor, to_state, "base58_to_uuid")
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        self.convert_columns(app_label, schema_editor, to_state, "uuid_to_base58")
+
+    def convert_columns(self, app_label, schema_editor, state, function):
+        """Converts the key and the columns referencing it to the type of the key in ``state``."""
+        model = state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+
+        connection, quote = schema_editor.connection, schema_editor.quote_name
+        pk = model._meta.pk
+        parameters = pk.db_parameters(connection)
+        column_type = parameters["type"]
+        if parameters.get("collation"):
+            column_type += f" COLLATE {quote(parameters['collation'])}"
+        referencing = get_referencing_fields(model)
+
+        # No parameters, so the % placeholders of RAISE are left alone
+        schema_editor.execute(BASE58_FUNCTIONS_SQL, params=None)
+        for related_model, field in referencing:
+            for name in schema_editor._constraint_names(related_model, [field.column], foreign_key=True):
+                schema_editor.execute(schema_editor._delete_fk_sql(related_model, name))
+
+        for column_model, field in [(model, pk), *referencing]:
+            table = column_model._meta.db_table
+            # varchar_pattern_ops indexes only exist on the string columns
+            like_index = schema_editor._create_index_name(table, [field.column], suffix="_like")
+            schema_editor.execute(schema_editor._delete_index_sql(column_model, like_index))
+            schema_editor.execute(
+                f"ALTER TABLE {quote(table)} ALTER COLUMN {quote(field.column)} "
+                f"TYPE {column_type} USING {function}({quote(field.column)})"
+            )
+            like_index_sql = schema_editor._create_like_index_sql(column_model, field)
+            if like_index_sql is not None:
+                schema_editor.execute(like_index_sql)
+
+        for related_model, field in referencing:
+            schema_editor.execute(schema_editor._create_fk_sql(related_model, field, "_fk_%(to_table)s_%(to_column)s"))
+
+    def describe(self):
+        return f"Convert the primary key of {self.model_name} between Base58 strings and native uuids"
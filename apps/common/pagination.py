@@ -0,0 +1,101 @@
+"""
+Keyset (cursor) pagination on ``(created_at, id)``.
+
+Offset pagination counts every row and skips ``OFFSET n`` of them on each request, so deep pages of large tables get
+linearly slower. A cursor instead holds the sort key of the last row shown, and the next page is the rows after it,
+which an index on ``(created_at, id)`` finds directly however deep the page is.
+
+``created_at`` is nullable on ``TimeStampMixin`` models. Rows without it are paginated separately by id and sort
+where PostgreSQL puts NULLs: after the other rows in ascending order and before them in descending order, so both
+parts of the walk still match the index.
+"""
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+
+CURSOR_SEPARATOR = "|"
+
+
+def encode_cursor(created_at, pk):
+    value = f"{created_at.isoformat() if created_at else ''}{CURSOR_SEPARATOR}{pk}"
+    return base64.urlsafe_b64encode(value.encode()).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """(created_at or None, pk) of a cursor from ``encode_cursor``, or None for a missing or malformed one."""
+    if not cursor:
+        return None
+    try:
+        created_at, pk = base64.urlsafe_b64decode(cursor.encode("ascii")).decode().split(CURSOR_SEPARATOR)
+        return (datetime.fromisoformat(created_at) if created_at else None), pk
+    except (UnicodeError, ValueError, binascii.Error):
+        return None
+
+
+class CursorPage:
+    """A page of rows and the cursor of the next one. Quacks enough like ``django.core.paginator.Page`` for lists."""
+
+    def __init__(self, object_list, next_cursor=None, cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.cursor = cursor
+        self.next_page_query = None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def paginate_by_cursor(queryset, cursor, size, descending=True, created_field="created_at", pk_field="pk"):
+    """
+    The page of ``size`` rows of ``queryset`` after ``cursor`` (a ``decode_cursor`` result, None for the first page),
+    ordered by ``(created_field, pk_field)``.
+    """
+    lower = "lt" if descending else "gt"
+    sign = "-" if descending else ""
+    after_created, after_pk = cursor if cursor is not None else (None, None)
+
+    def without_created_at():
+        rows = queryset.filter(**{f"{created_field}__isnull": True})
+        if cursor is not None and after_created is None:
+            rows = rows.filter(**{f"{pk_field}__{lower}": after_pk})
+        return rows.order_by(f"{sign}{pk_field}")
+
+    def with_created_at():
+        rows = queryset.filter(**{f"{created_field}__isnull": False})
+        if after_created is not None:
+            # The first condition bounds the index scan, the second breaks ties
+            rows = rows.filter(**{f"{created_field}__{lower}e": after_created}).filter(
+                Q(**{f"{created_field}__{lower}": after_created}) | Q(**{f"{pk_field}__{lower}": after_pk})
+            )
+        return rows.order_by(f"{sign}{created_field}", f"{sign}{pk_field}")
+
+    parts = [without_created_at, with_created_at] if descending else [with_created_at, without_created_at]
+    if cursor is not None and (after_created is None) == (not descending):
+        # The cursor is already past the first part
+        parts = parts[1:]
+
+    rows = []
+    for part in parts:
+        rows += part()[:size + 1 - len(rows)]
+        if len(rows) > size:
+            break
+
+    next_cursor = None
+    if len(rows) > size:
+        last = rows[size - 1]
+        next_cursor = encode_cursor(getattr(last, created_field), getattr(last, pk_field))
+    return CursorPage(rows[:size], next_cursor, cursor)
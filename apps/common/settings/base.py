@@ -48,6 +48,7 @@ BUILTIN_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     'treebeard'
 ]
 
@@ -59,6 +60,8 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.security.audit.AuditMiddleware",
+    "apps.security.permissions.RoleAssignmentsMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django_htmx.middleware.HtmxMiddleware",
@@ -139,6 +142,16 @@ DATABASES = {
     }
 }
 
+# The cache is shared by the web and Celery processes, so what one process invalidates (role assignments, the
+# taxonomy, product trees, matching changes) is gone for all of them. Run `manage.py createcachetable` after migrating.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "django_cache",
+        "OPTIONS": {"MAX_ENTRIES": 100_000},
+    }
+}
+
 AUTH_USER_MODEL = "security.User"
 
 # Password validation
@@ -251,6 +264,15 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 SENDGRID_API_KEY = os.getenv("SENDGRID_API_KEY")
+# Notification emails go to SENDGRID_BATCH_SIZE receivers per request (SendGrid takes up to 1000), at most
+# SENDGRID_MAX_REQUESTS_PER_SECOND requests per process (None for no limit). In DEBUG they are only printed,
+# unless SENDGRID_API_HOST points somewhere, like a local fake SendGrid.
+SENDGRID_API_HOST = os.getenv("SENDGRID_API_HOST")
+SENDGRID_BATCH_SIZE = 1000
+SENDGRID_MAX_REQUESTS_PER_SECOND = 10
+# Notifications are written to an outbox with the change they are about, and relayed to Celery in batches of
+# OUTBOX_BATCH_SIZE by the relay_outbox task or `manage.py relay_outbox`.
+OUTBOX_BATCH_SIZE = 100
 EMAIL_HOST = "smtp.sendgrid.net"
 EMAIL_HOST_USER = "apikey"  # this is exactly the value 'apikey'
 EMAIL_HOST_PASSWORD = SENDGRID_API_KEY
@@ -266,3 +288,33 @@ if os.environ.get("SENTRY_DSN"):
         # of transactions for performance monitoring.
         traces_sample_rate=1.0,
     )
+
+# Audit trail: models are audited when their app label or "app_label.ModelName" is listed here.
+# Events are buffered per request and written with one bulk insert after commit, or queued to Celery
+# when AUDIT_ASYNC is enabled. The table is partitioned by month; `manage.py audit_partitions` creates
+# upcoming months and drops those older than AUDIT_RETENTION_MONTHS (None keeps everything).
+AUDIT_MODELS = [
+    "product_management",
+    "talent",
+    "commerce",
+    "security.User",
+    "security.ProductRoleAssignment",
+    "security.OrganisationPersonRoleAssignment",
+]
+AUDIT_ASYNC = os.getenv("AUDIT_ASYNC", "False") == "True"
+AUDIT_BATCH_SIZE = 500
+AUDIT_RETENTION_MONTHS = None
+
+# Role assignments are cached per person and dropped when an assignment changes; the timeout bounds how long
+# changes made without signals (queryset updates) can go unnoticed.
+ROLE_ASSIGNMENTS_CACHE_TIMEOUT = 300
+
+# Matching changes stay in the cache for MATCHING_CHANGE_TIMEOUT seconds; each process also rebuilds its matcher
+# once it is MATCHING_MAX_AGE seconds old, which picks up changes that were never recorded.
+MATCHING_CHANGE_TIMEOUT = 60 * 60 * 24
+MATCHING_MAX_AGE = 60 * 60
+
+# The taxonomy and product trees are dropped from the cache when a skill, expertise or product area is saved; the
+# timeouts bound how long changes made without signals (queryset updates, fixture loads) can go unnoticed.
+TAXONOMY_CACHE_TIMEOUT = 60 * 60
+PRODUCT_TREE_CACHE_TIMEOUT = 60 * 60
@@ -10,3 +10,6 @@ INSTALLED_APPS += ["debug_toolbar"]
 MIDDLEWARE += [
     "debug_toolbar.middleware.DebugToolbarMiddleware",
 ]
+
+# Tests run in one process, and cache lookups shouldn't count as queries
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
@@ -6,22 +6,6 @@ from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail
 
 
-import uuid
-
-def serialize_tree(node):
-    """Serializer for the tree."""
-    return {
-        "id": node.pk,
-        "node_id": uuid.uuid4(),
-        "name": node.name,
-        "description": node.description,
-        "video_link": node.video_link,
-        "video_name": node.video_name,
-        "video_duration": node.video_duration,
-        "has_saved": True,
-        "children": [serialize_tree(child) for child in node.get_children()],
-    }
-
 def send_sendgrid_email(to_emails, subject, content):
     try:
         message = Mail(
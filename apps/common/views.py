@@ -24,7 +24,7 @@ def enterprise_customers(request):
 
 
 def custom_404_view(request, exception):
-    return render(request, "404.html")
+    return render(request, "404.html", status=404)
 
 
 def version_view(request):
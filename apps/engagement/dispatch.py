@@ -0,0 +1,129 @@
+"""
+Sending notification emails in batches.
+
+Notifications used to be sent one receiver at a time: a ``send_email`` task per receiver, each looking up the
+receiver's address and the template, and building a new SendGrid client for one request. ``dispatch`` resolves all
+receivers' addresses in one query, fetches the template once, renders it once (the parameters are the same
+for every receiver) and sends it with up to ``SENDGRID_BATCH_SIZE`` receivers per request, one personalization each
+so receivers don't see each other. A template addressing the receiver by ``{user_name}`` without a ``user_name``
+parameter (one event for many people, like a bounty announcement) is rendered with ``USER_NAME_TAG`` in its place,
+which SendGrid substitutes with each receiver's name in their personalization. The client is created once per
+process, and requests are spaced to stay under ``SENDGRID_MAX_REQUESTS_PER_SECOND`` (per process).
+"""
+import functools
+import logging
+import threading
+import time
+
+from django.conf import settings
+from sendgrid import SendGridAPIClient
+from sendgrid.helpers.mail import Mail, To
+
+from apps.engagement.models import EmailNotification
+from apps.talent.models import Person
+
+logger = logging.getLogger(__name__)
+
+# Stands in for the receiver's name until SendGrid substitutes it per personalization
+USER_NAME_TAG = "-user_name-"
+
+
+class Dispatcher:
+    """
+    Sends a message to many addresses through ``client``, a ``SendGridAPIClient``, ``batch_size`` addresses per
+    request. Without a client the messages are printed instead, like ``send_sendgrid_email`` does in DEBUG.
+    """
+
+    def __init__(self, client, batch_size, max_requests_per_second=None):
+        self.client = client
+        self.batch_size = batch_size
+        self.interval = 1 / max_requests_per_second if max_requests_per_second else 0
+        self.lock = threading.Lock()
+        self.next_request = 0.0
+
+    def wait_for_turn(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            turn = max(now, self.next_request)
+            self.next_request = turn + self.interval
+        if turn > now:
+            time.sleep(turn - now)
+
+    def send(self, to_emails, subject, content, substitutions=None):
+        """
+        Sends the message to each of ``to_emails``, with the matching dict of ``substitutions`` for each if given.
+        Returns how many of them SendGrid accepted.
+        """
+        if substitutions is not None:
+            to_emails = [To(email, substitutions=subs) for email, subs in zip(to_emails, substitutions)]
+        sent = 0
+        for start in range(0, len(to_emails), self.batch_size):
+            batch = to_emails[start:start + self.batch_size]
+            message = Mail(
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to_emails=batch,
+                subject=subject,
+                html_content=content,
+                is_multiple=True,
+            )
+            if self.client is None:
+                print("Email sent:", flush=True)
+                print(message, flush=True)
+                sent += len(batch)
+                continue
+
+            self.wait_for_turn()
+            try:
+                self.client.send(message)
+            except Exception:
+                # A failed batch doesn't stop the others
+                logger.exception(f"SendGrid failed to send {subject!r} to {len(batch)} receivers")
+            else:
+                sent += len(batch)
+        return sent
+
+
+@functools.cache
+def get_dispatcher():
+    """The process wide ``Dispatcher``, sending for real unless in DEBUG without a ``SENDGRID_API_HOST``."""
+    client = None
+    if not settings.DEBUG or settings.SENDGRID_API_HOST:
+        host = settings.SENDGRID_API_HOST or "https://api.sendgrid.com"
+        client = SendGridAPIClient(settings.SENDGRID_API_KEY, host=host)
+    return Dispatcher(client, settings.SENDGRID_BATCH_SIZE, settings.SENDGRID_MAX_REQUESTS_PER_SECOND)
+
+
+def get_template(event_type):
+    """The (title, template) of the ``EmailNotification`` for ``event_type``, ``None`` if there is none."""
+    return EmailNotification.objects.values_list("title", "template").filter(event_type=event_type).first()
+
+
+def resolve_recipients(receivers):
+    """The (email address, name) of the people with ids in ``receivers``."""
+    return list(
+        Person.objects.filter(pk__in=receivers)
+        .exclude(user__email="")
+        .order_by()
+        .values_list("user__email", "full_name")
+        .distinct()
+    )
+
+
+def dispatch(event_type, receivers, params, dispatcher=None):
+    """Emails the notification for ``event_type`` rendered with ``params`` to ``receivers``. Returns how many."""
+    template = get_template(event_type)
+    if template is None:
+        logger.warning(f"No email template for {event_type}, not sending it to {len(receivers)} receivers")
+        return 0
+    title, template = template
+    recipients = resolve_recipients(receivers)
+    substitutions = None
+    if "user_name" not in params:
+        params = {**params, "user_name": USER_NAME_TAG}
+        substitutions = [{USER_NAME_TAG: name} for _, name in recipients]
+    subject, content = title.format(**params), template.format(**params)
+    logger.info(f"Email with subject {subject} sending to {len(recipients)} receivers")
+    to_emails = [email for email, _ in recipients]
+    return (dispatcher or get_dispatcher()).send(to_emails, subject, content, substitutions)
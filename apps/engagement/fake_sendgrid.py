@@ -0,0 +1,70 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# What SendGrid accepts in one mail/send request
+MAX_PERSONALIZATIONS = 1000
+
+
+class FakeSendGrid:
+    """
+    A local stand-in for the SendGrid mail/send API, for tests and benchmarks. Used as a context manager; point a
+    ``SendGridAPIClient`` (or ``SENDGRID_API_HOST``) at ``url``.
+
+    ``requests`` counts the requests received, the accepted ones are kept in ``messages`` as the JSON they sent.
+    Each request takes at least ``latency`` seconds, to stand in for the round trip to SendGrid, and is answered
+    with ``status``.
+    """
+
+    def __init__(self, latency=0, status=202):
+        self.latency = latency
+        self.status = status
+        self.requests = 0
+        self.messages = []
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                start = time.monotonic()
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                status = fake.receive(self.path, body)
+                time.sleep(max(fake.latency - (time.monotonic() - start), 0))
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def receive(self, path, body):
+        with self.lock:
+            self.requests += 1
+        if path != "/v3/mail/send":
+            return 404
+        if not 1 <= len(body.get("personalizations", [])) <= MAX_PERSONALIZATIONS:
+            return 400
+        if self.status < 300:
+            with self.lock:
+                self.messages.append(body)
+        return self.status
+
+    @property
+    def recipients(self):
+        """The addresses the accepted messages went to, one per personalization."""
+        return [to["email"] for message in self.messages for p in message["personalizations"] for to in p["to"]]
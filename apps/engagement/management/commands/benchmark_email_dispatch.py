@@ -0,0 +1,101 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from sendgrid import SendGridAPIClient
+from sendgrid.helpers.mail import Mail
+
+from apps.engagement.dispatch import Dispatcher, dispatch
+from apps.engagement.fake_sendgrid import FakeSendGrid
+from apps.engagement.models import EmailNotification, Notification
+from apps.security.models import User
+from apps.talent.models import Person
+
+EVENT_TYPE = Notification.EventType.BOUNTY_CREATED
+PARAMS = {"user_name": "Benchmark", "bounty_title": "Benchmark bounty"}
+
+
+def send_one_by_one(receivers, url):
+    # What a send_email task per receiver did
+    for receiver in receivers:
+        email = Person.objects.values_list("user__email", flat=True).get(pk=receiver)
+        notification = EmailNotification.objects.filter(event_type=EVENT_TYPE).get()
+        message = Mail(
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to_emails=[email],
+            subject=notification.title.format(**PARAMS),
+            html_content=notification.template.format(**PARAMS),
+        )
+        SendGridAPIClient("benchmark", host=url).send(message)
+    return len(receivers)
+
+
+class Command(BaseCommand):
+    help = "Send a notification to many receivers through a local fake SendGrid, one by one and in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--receivers", type=int, default=2000, help="People the notification goes to")
+        parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 1000], help="Receivers per request")
+        parser.add_argument(
+            "--latency", type=float, default=0.02, help="Seconds the fake SendGrid takes per request, a round trip"
+        )
+        parser.add_argument("--max-requests-per-second", type=float, help="Rate limit of the batched dispatcher")
+
+    def create_receivers(self, count):
+        users = User.objects.bulk_create(
+            User(
+                id=User._meta.pk.generate_id(),
+                username=f"email-benchmark-{number}",
+                email=f"email-benchmark-{number}@example.com",
+            )
+            for number in range(count)
+        )
+        people = Person.objects.bulk_create(
+            Person(id=Person._meta.pk.generate_id(), user=user, full_name=user.username, headline="")
+            for user in users
+        )
+        return [person.pk for person in people]
+
+    def run(self, send, receivers, latency):
+        with FakeSendGrid(latency=latency) as fake:
+            start = time.perf_counter()
+            sent = send(receivers, fake.url)
+            elapsed = time.perf_counter() - start
+        assert len(fake.recipients) == sent == len(receivers), "not every receiver got the email"
+        return len(fake.messages), elapsed
+
+    def handle(self, *args, **options):
+        rate = options["max_requests_per_second"]
+        strategies = [("one by one", send_one_by_one)] + [
+            (
+                f"batches of {size}",
+                lambda receivers, url, size=size: dispatch(
+                    EVENT_TYPE,
+                    receivers,
+                    PARAMS,
+                    Dispatcher(SendGridAPIClient("benchmark", host=url), size, rate),
+                ),
+            )
+            for size in options["batch_sizes"]
+        ]
+
+        with transaction.atomic():
+            EmailNotification.objects.filter(event_type=EVENT_TYPE).delete()
+            EmailNotification.objects.create(
+                event_type=EVENT_TYPE,
+                permitted_params="user_name,bounty_title",
+                title="New Bounty Created",
+                template='A new bounty "{bounty_title}" has been created. Check it out, {user_name}!',
+            )
+            receivers = self.create_receivers(options["receivers"])
+            try:
+                self.stdout.write(
+                    f"{len(receivers)} receivers, {options['latency'] * 1000:g} ms per request to the fake SendGrid"
+                )
+                self.stdout.write(f"{'strategy':<20}{'requests':>10}{'seconds':>10}{'messages/s':>12}")
+                for name, send in strategies:
+                    requests, elapsed = self.run(send, receivers, options["latency"])
+                    self.stdout.write(f"{name:<20}{requests:>10}{elapsed:>10.2f}{len(receivers) / elapsed:>12.0f}")
+            finally:
+                transaction.set_rollback(True)
@@ -0,0 +1,28 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.engagement.outbox import relay_all
+
+
+class Command(BaseCommand):
+    help = "Relay the notifications in the outbox to Celery, once or continuously"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE)
+        parser.add_argument(
+            "--interval", type=float, help="Keep relaying, waiting this many seconds when the outbox is drained"
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            relayed = relay_all(options["batch_size"])
+            if relayed:
+                self.stdout.write(f"Relayed {relayed} outbox events")
+            if options["interval"] is None:
+                return
+            # Don't hold a connection while idle
+            connection.close()
+            time.sleep(options["interval"])
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.1 on 2026-10-17 07:44
+
+import apps.common.fields
+import apps.engagement.models
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("engagement", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEvent",
+            fields=[
+                ("created_at", models.DateTimeField(auto_now_add=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True, null=True)),
+                ("id", apps.common.fields.Base58UUIDv7Field(primary_key=True, serialize=False)),
+                (
+                    "event_type",
+                    models.CharField(
+                        choices=[
+                            ("BOUNTY_CREATED", "Bounty Created"),
+                            ("BOUNTY_CLAIMED", "Bounty Claimed"),
+                            ("BOUNTY_COMPLETED", "Bounty Completed"),
+                            ("BOUNTY_AWARDED", "Bounty Awarded"),
+                            ("CHALLENGE_STARTED", "Challenge Started"),
+                            ("CHALLENGE_COMPLETED", "Challenge Completed"),
+                            ("COMPETITION_OPENED", "Competition Opened"),
+                            ("COMPETITION_CLOSED", "Competition Closed"),
+                            ("ENTRY_SUBMITTED", "Entry Submitted"),
+                            ("WINNER_ANNOUNCED", "Winner Announced"),
+                            ("ORDER_PLACED", "Order Placed"),
+                            ("PAYMENT_RECEIVED", "Payment Received"),
+                            ("FUNDS_ADDED", "Funds Added to Wallet"),
+                            ("POINTS_TRANSFERRED", "Points Transferred"),
+                            ("PRODUCT_MADE_PUBLIC", "Product Made Public"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                ("notification_types", models.JSONField(default=apps.engagement.models.default_notification_types)),
+                ("receivers", models.JSONField(help_text="Ids of the people to notify")),
+                ("params", models.JSONField(default=dict)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                (
+                    "available_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, help_text="Not relayed before, set back after failures"
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["available_at", "id"], name="outbox_available_idx")],
+            },
+        ),
+    ]
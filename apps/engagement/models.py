@@ -1,8 +1,9 @@
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from apps.common.fields import Base58UUIDv5Field
+from apps.common.fields import Base58UUIDv5Field, Base58UUIDv7Field
 from apps.common.mixins import TimeStampMixin
 
 
@@ -25,6 +26,10 @@ class Notification(TimeStampMixin):
         POINTS_TRANSFERRED = 'POINTS_TRANSFERRED', _("Points Transferred")
         PRODUCT_MADE_PUBLIC = 'PRODUCT_MADE_PUBLIC', _("Product Made Public")
 
+    class Type(models.TextChoices):
+        EMAIL = 'EMAIL', _("Email")
+        SMS = 'SMS', _("SMS")
+
     event_type = models.CharField(max_length=30, choices=EventType.choices)
     permitted_params = models.CharField(max_length=500)
 
@@ -44,6 +49,31 @@ class EmailNotification(Notification):
         _template_is_valid(self.template, self.permitted_params)
 
 
+def default_notification_types():
+    return [Notification.Type.EMAIL]
+
+
+class OutboxEvent(TimeStampMixin):
+    """
+    A notification to send, written in the same transaction as the change it is about and handed to
+    ``send_notification`` by the relay once that committed. See ``apps.engagement.outbox``.
+    """
+
+    id = Base58UUIDv7Field(primary_key=True)
+    event_type = models.CharField(max_length=30, choices=Notification.EventType.choices)
+    notification_types = models.JSONField(default=default_notification_types)
+    receivers = models.JSONField(help_text="Ids of the people to notify")
+    params = models.JSONField(default=dict)
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now, help_text="Not relayed before, set back after failures")
+
+    class Meta:
+        indexes = [models.Index(fields=["available_at", "id"], name="outbox_available_idx")]
+
+    def __str__(self):
+        return f"{self.get_event_type_display()} for {len(self.receivers)} receivers"
+
+
 def _template_is_valid(template, permitted_params):
     permitted_params_list = permitted_params.split(",")
     params = {param: "" for param in permitted_params_list}
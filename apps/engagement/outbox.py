@@ -0,0 +1,83 @@
+"""
+The transactional outbox for notifications.
+
+A state change that should notify someone (a bid accepted, an order paid, a competition closing) calls ``emit``,
+which only inserts an ``OutboxEvent`` row in the transaction making the change. The request doesn't wait for the
+broker, and the event exists exactly when the change committed: a rolled back change leaves nothing to send, and a
+committed one is sent even if the broker was down at the time.
+
+``relay`` drains the outbox: it locks up to ``OUTBOX_BATCH_SIZE`` due events with ``SELECT ... FOR UPDATE SKIP
+LOCKED``, so any number of relays can run side by side without waiting on or double sending each other's rows,
+queues a ``send_notification`` task for each and deletes the ones queued, all in one transaction. An event whose
+task couldn't be queued stays, with ``available_at`` moved back further after each failed attempt. A relay dying
+after queueing but before committing leaves its events to be queued again, so delivery is at least once.
+"""
+import datetime
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.engagement.models import OutboxEvent
+from apps.engagement.tasks import send_notification
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before retrying an event after its first failed attempt, doubled after each further one
+RETRY_DELAY = 10
+MAX_RETRY_DELAY = 60 * 60
+
+
+def emit(event_type, receivers, **params):
+    """
+    Records that ``receivers`` (people or their ids) are to be notified of ``event_type``, with ``params`` for the
+    template. Call it inside the transaction making the change.
+    """
+    return OutboxEvent.objects.create(
+        event_type=event_type,
+        receivers=[getattr(receiver, "pk", receiver) for receiver in receivers],
+        params=params,
+    )
+
+
+def retry_delay(attempts):
+    return datetime.timedelta(seconds=min(RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY))
+
+
+def relay(batch_size=None):
+    """Queues the notifications of one batch of due events. Returns how many events it took."""
+    batch_size = batch_size or getattr(settings, "OUTBOX_BATCH_SIZE", 100)
+    now = timezone.now()
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(available_at__lte=now)
+            .order_by("available_at", "id")[:batch_size]
+        )
+        queued, failed = [], []
+        for event in events:
+            try:
+                send_notification.delay(event.notification_types, event.event_type, event.receivers, **event.params)
+            except Exception:
+                logger.exception(f"Couldn't queue outbox event {event.pk}, attempt {event.attempts + 1}")
+                event.attempts += 1
+                event.available_at = now + retry_delay(event.attempts)
+                failed.append(event)
+            else:
+                queued.append(event.pk)
+
+        OutboxEvent.objects.filter(pk__in=queued).delete()
+        OutboxEvent.objects.bulk_update(failed, ["attempts", "available_at"])
+    return len(events)
+
+
+def relay_all(batch_size=None):
+    """Relays batches until the outbox has no more due events. Returns how many events it took."""
+    batch_size = batch_size or getattr(settings, "OUTBOX_BATCH_SIZE", 100)
+    total = 0
+    while True:
+        taken = relay(batch_size)
+        total += taken
+        if taken < batch_size:
+            return total
@@ -1,14 +1,13 @@
 from celery import shared_task
 from celery.utils.log import get_task_logger
 
-from apps.engagement.models import EmailNotification, Notification
-from apps.common.utils import send_sendgrid_email
-from apps.talent.models import Person
+from apps.engagement.dispatch import dispatch
+from apps.engagement.models import Notification
 
 
-def _forward_notification(notification_types, event_type, params):
+def _forward_notification(notification_types, event_type, receivers, params):
     if Notification.Type.EMAIL in notification_types:
-        send_email.delay(event_type, **params)
+        send_emails.delay(event_type, receivers, **params)
     elif Notification.Type.SMS in notification_types:
         # TODO add task to send sms
         pass
@@ -16,9 +15,9 @@ def _forward_notification(notification_types, event_type, params):
 
 def _build_notification_params(event_type, notification_params):
     params = notification_params.copy()
-    if event_type == Notification.EventType.TASK_CLAIMED:
+    if event_type == Notification.EventType.BOUNTY_CLAIMED:
         pass
-    elif event_type == Notification.EventType.SUBMISSION_APPROVED:
+    elif event_type == Notification.EventType.BOUNTY_COMPLETED:
         pass
     return params
 
@@ -27,28 +26,26 @@ def _build_notification_params(event_type, notification_params):
 def send_notification(notification_types, event_type, receivers, **kwargs):
     logger = get_task_logger(__name__)
 
-    for receiver in receivers:
-        logger.info(f"Notification {event_type} sending to {receiver}")
-        params = _build_notification_params(event_type, kwargs)
-        params["receiver"] = receiver
-        _forward_notification(notification_types, event_type, params)
+    logger.info(f"Notification {event_type} sending to {len(receivers)} receivers")
+    params = _build_notification_params(event_type, kwargs)
+    _forward_notification(notification_types, event_type, receivers, params)
 
 
 @shared_task(queue="email", ignore_result=True)
-def send_email(event_type, **kwargs):
-    logger = get_task_logger(__name__)
+def send_emails(event_type, receivers, **kwargs):
+    dispatch(event_type, receivers, kwargs)
+
 
-    email_receiver = (
-        Person.objects.values_list("email_address", flat=True)
-        .distinct("email_address")
-        .filter(id=kwargs["receiver"])
-        .get()
-    )
-    email_notification = EmailNotification.objects.filter(event_type=event_type).get()
+@shared_task(queue="email", ignore_result=True)
+def send_email(event_type, **kwargs):
+    # Tasks queued before send_emails existed, one per receiver
+    receiver = kwargs.pop("receiver")
+    dispatch(event_type, [receiver], kwargs)
 
-    email_subject = email_notification.title.format(**kwargs)
-    email_content = email_notification.template.format(**kwargs)
 
-    logger.info(f"Email with subject {email_subject} and message {email_content} sending to {email_receiver}")
+@shared_task(queue="notification", ignore_result=True)
+def relay_outbox():
+    # Scheduled every few seconds, see apps.engagement.outbox
+    from apps.engagement.outbox import relay_all
 
-    send_sendgrid_email([email_receiver], email_subject, email_content)
+    relay_all()
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.product_management.search import REBUILD_BATCH_SIZE, rebuild_search_documents
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search documents of every bounty"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=REBUILD_BATCH_SIZE, help="Bounties indexed per query")
+
+    def handle(self, *args, **options):
+        count = rebuild_search_documents(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} bounties."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.product_management.stats import REBUILD_BATCH_SIZE, rebuild_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute ProductStats and ChallengeStats for every product and challenge"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=REBUILD_BATCH_SIZE, help="Rows recomputed per query")
+
+    def handle(self, *args, **options):
+        products, challenges = rebuild_stats(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt stats for {products} products and {challenges} challenges."))
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.1 on 2026-10-17 06:39
+
+import apps.common.fields
+from django.db import migrations
+
+from apps.common.operations import ConvertBase58IdToUUID
+
+
+class Migration(migrations.Migration):
+
+    # Every table with a foreign key to the converted models must exist in the migration state, so its columns
+    # are converted in both directions
+    dependencies = [
+        ("product_management", "0002_initial"),
+        ("commerce", "0003_time_ordered_ids"),
+        ("security", "0005_time_ordered_ids"),
+        ("talent", "0001_initial"),
+    ]
+
+    operations = [
+        ConvertBase58IdToUUID(
+            model_name="bounty",
+            name="id",
+            field=apps.common.fields.Base58NativeUUIDField(primary_key=True, serialize=False),
+        ),
+        ConvertBase58IdToUUID(
+            model_name="challenge",
+            name="id",
+            field=apps.common.fields.Base58NativeUUIDField(primary_key=True, serialize=False),
+        ),
+        ConvertBase58IdToUUID(
+            model_name="product",
+            name="id",
+            field=apps.common.fields.Base58NativeUUIDField(primary_key=True, serialize=False),
+        ),
+    ]
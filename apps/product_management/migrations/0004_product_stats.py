@@ -0,0 +1,65 @@
+# Generated by Django 5.1.1 on 2026-10-17 06:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product_management", "0003_native_uuid_ids"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChallengeStats",
+            fields=[
+                (
+                    "challenge",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="product_management.challenge",
+                    ),
+                ),
+                ("bounties", models.IntegerField(default=0)),
+                ("open_bounties", models.IntegerField(default=0)),
+                ("reward_in_usd_cents", models.BigIntegerField(default=0)),
+                ("reward_in_points", models.BigIntegerField(default=0)),
+                ("open_reward_in_usd_cents", models.BigIntegerField(default=0)),
+                ("open_reward_in_points", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "Challenge stats",
+            },
+        ),
+        migrations.CreateModel(
+            name="ProductStats",
+            fields=[
+                (
+                    "product",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="product_management.product",
+                    ),
+                ),
+                ("open_bounties", models.IntegerField(default=0)),
+                ("open_reward_in_usd_cents", models.BigIntegerField(default=0)),
+                ("open_reward_in_points", models.BigIntegerField(default=0)),
+                ("draft_challenges", models.IntegerField(default=0)),
+                ("blocked_challenges", models.IntegerField(default=0)),
+                ("active_challenges", models.IntegerField(default=0)),
+                ("completed_challenges", models.IntegerField(default=0)),
+                ("cancelled_challenges", models.IntegerField(default=0)),
+                ("initiatives", models.IntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "Product stats",
+            },
+        ),
+    ]
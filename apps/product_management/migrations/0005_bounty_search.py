@@ -0,0 +1,86 @@
+# Generated by Django 5.1.1 on 2026-10-17 06:53
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product_management", "0004_product_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BountySearchDocument",
+            fields=[
+                (
+                    "bounty",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_document",
+                        serialize=False,
+                        to="product_management.bounty",
+                    ),
+                ),
+                ("is_listed", models.BooleanField(default=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("Draft", "Draft"),
+                            ("Open", "Open"),
+                            ("In Progress", "In Progress"),
+                            ("In Review", "In Review"),
+                            ("Completed", "Completed"),
+                            ("Cancelled", "Cancelled"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("reward_type", models.CharField(max_length=10)),
+                ("reward_in_usd_cents", models.IntegerField(null=True)),
+                ("reward_in_points", models.IntegerField(null=True)),
+                (
+                    "skill_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=22), default=list, size=None
+                    ),
+                ),
+                (
+                    "expertise_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=22), default=list, size=None
+                    ),
+                ),
+                ("search_vector", django.contrib.postgres.search.SearchVectorField(null=True)),
+                ("created_at", models.DateTimeField()),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="product_management.product"
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["search_vector"], name="bounty_search_vector_idx"
+                    ),
+                    django.contrib.postgres.indexes.GinIndex(fields=["skill_ids"], name="bounty_search_skills_idx"),
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["expertise_ids"], name="bounty_search_expertise_idx"
+                    ),
+                    models.Index(
+                        condition=models.Q(("is_listed", True)),
+                        fields=["-created_at", "-bounty"],
+                        name="bounty_search_listed_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
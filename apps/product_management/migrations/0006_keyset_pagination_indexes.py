@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-17 06:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("commerce", "0004_keyset_pagination_indexes"),
+        ("product_management", "0005_bounty_search"),
+        ("talent", "0002_native_uuid_ids"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="challenge",
+            index=models.Index(fields=["created_at", "id"], name="challenge_created_at_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["created_at", "id"], name="product_created_at_id_idx"),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.1 on 2026-10-17 07:03
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product_management", "0006_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="productarea",
+            index=models.Index(fields=["path"], name="productarea_path_like_idx", opclasses=["varchar_pattern_ops"]),
+        ),
+        migrations.AddIndex(
+            model_name="productarea",
+            index=models.Index(django.db.models.functions.text.Substr("path", 1, 4), name="productarea_root_path_idx"),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.1 on 2026-10-17 07:04
+
+from django.db import migrations, models
+
+
+BACKFILL_VOTE_COUNT = """
+UPDATE product_management_idea idea
+SET vote_count = votes.total
+FROM (SELECT idea_id, count(*) AS total FROM product_management_ideavote GROUP BY idea_id) votes
+WHERE votes.idea_id = idea.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product_management", "0007_product_tree_path_indexes"),
+        ("talent", "0002_native_uuid_ids"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="idea",
+            name="vote_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="idea",
+            index=models.Index(fields=["product", "-vote_count", "-created_at"], name="idea_product_popularity_idx"),
+        ),
+        migrations.RunSQL(BACKFILL_VOTE_COUNT, migrations.RunSQL.noop),
+    ]
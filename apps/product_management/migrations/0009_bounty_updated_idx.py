@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-17 08:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product_management", "0008_idea_vote_count"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="bounty",
+            index=models.Index(fields=["updated_at"], name="bounty_updated_idx"),
+        ),
+    ]
@@ -1,12 +1,16 @@
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.urls import reverse
 from django.utils.text import slugify
 from django.apps import apps
+from django.db import transaction
 from django.utils import timezone
 
 from model_utils import FieldTracker
@@ -18,7 +22,8 @@ from apps.common.mixins import TimeStampMixin
 from django.core.exceptions import ValidationError
 
 from django.db.models import Sum
-from apps.common.fields import Base58UUIDv5Field
+from django.db.models.functions import Substr
+from apps.common.fields import Base58NativeUUIDField, Base58UUIDv5Field
 
 from apps.talent.models import Skill, Expertise
 
@@ -61,13 +66,30 @@ class ProductArea(common.AttachmentAbstract, MP_Node, TimeStampMixin):
         related_name="product_areas",
         on_delete=models.SET_NULL,
     )
+    tracker = FieldTracker(fields=["product_tree_id"])
+
+    class Meta:
+        indexes = [
+            # Subtree (path__startswith) lookups, the unique index on path can't serve LIKE prefixes
+            models.Index(fields=["path"], opclasses=["varchar_pattern_ops"], name="productarea_path_like_idx"),
+            # The areas of a product tree, found through the paths of its roots
+            models.Index(Substr("path", 1, MP_Node.steplen), name="productarea_root_path_idx"),
+        ]
 
     def __str__(self):
         return self.name
 
+    def move(self, target, pos=None):
+        from .tree import get_product_tree_ids, invalidate_product_trees
+
+        product_tree_ids = get_product_tree_ids([self, target])
+        super().move(target, pos)
+        # Moves rewrite paths with bulk updates, which send no signals
+        invalidate_product_trees(product_tree_ids)
+
 
 class Product(TimeStampMixin, common.AttachmentAbstract):
-    id = Base58UUIDv5Field(primary_key=True)
+    id = Base58NativeUUIDField(primary_key=True)
     person = models.ForeignKey("talent.Person", on_delete=models.CASCADE, null=True, blank=True)
     organisation = models.ForeignKey("commerce.Organisation", on_delete=models.SET_NULL, null=True, blank=True)
     photo = models.ImageField(upload_to="products/", blank=True, null=True)
@@ -79,6 +101,11 @@ class Product(TimeStampMixin, common.AttachmentAbstract):
     video_url = models.URLField(blank=True, null=True)
     slug = models.SlugField(unique=True)
     is_private = models.BooleanField(default=False)
+    tracker = FieldTracker(fields=["name"])
+
+    class Meta:
+        # Keyset pagination of the product list
+        indexes = [models.Index(fields=["created_at", "id"], name="product_created_at_id_idx")]
 
     def get_owner(self):
         if self.organisation:
@@ -138,6 +165,11 @@ class Product(TimeStampMixin, common.AttachmentAbstract):
         except AttributeError:
             return 0
 
+    def get_stats(self):
+        from .stats import get_product_stats
+
+        return get_product_stats(self)
+
 class Initiative(TimeStampMixin):
     
     class InitiativeStatus(models.TextChoices):
@@ -156,6 +188,7 @@ class Initiative(TimeStampMixin):
         default=InitiativeStatus.ACTIVE,
     )
     video_url = models.URLField(blank=True, null=True)
+    tracker = FieldTracker(fields=["product_id"])
 
     def __str__(self):
         return self.name
@@ -219,7 +252,7 @@ class Challenge(TimeStampMixin, common.AttachmentAbstract):
         MEDIUM = "Medium"
         LOW = "Low"
 
-    id = Base58UUIDv5Field(primary_key=True)
+    id = Base58NativeUUIDField(primary_key=True)
     initiative = models.ForeignKey(Initiative, on_delete=models.SET_NULL, blank=True, null=True)
     product_area = models.ForeignKey(ProductArea, on_delete=models.SET_NULL, blank=True, null=True)
     title = models.TextField()
@@ -244,6 +277,8 @@ class Challenge(TimeStampMixin, common.AttachmentAbstract):
 
     class Meta:
         verbose_name_plural = "Challenges"
+        # Keyset pagination of the challenge list
+        indexes = [models.Index(fields=["created_at", "id"], name="challenge_created_at_id_idx")]
 
     def __str__(self):
         return self.title
@@ -251,40 +286,30 @@ class Challenge(TimeStampMixin, common.AttachmentAbstract):
     def get_absolute_url(self):
         return reverse("challenge_detail", kwargs={"product_slug": self.product.slug, "pk": self.pk})
 
+    def get_stats(self):
+        from .stats import get_challenge_stats
+
+        return get_challenge_stats(self)
+
     def get_total_reward(self):
-        return sum(bounty.reward_in_usd_cents or 0 for bounty in self.bounties.all())
+        return self.get_stats().reward_in_usd_cents
 
     def can_delete_challenge(self, person):
-        from apps.security.models import ProductRoleAssignment
+        from apps.security.permissions import get_role_assignments
 
-        product = self.product
         # That should not happen because every challenge should have a product.
         # We could remove null=True statement from the product field and this
         # if statement to prevent having challenges without a product.
-        if product is None:
-            return False
-
-        try:
-            product_role_assignment = ProductRoleAssignment.objects.get(person=person, product=product)
-
-            if product_role_assignment.role == ProductRoleAssignment.ProductRoles.CONTRIBUTOR:
-                return False
-
-        except ProductRoleAssignment.DoesNotExist:
+        if self.product_id is None:
             return False
 
-        return True
+        return get_role_assignments(person).can_modify_product(self.product_id)
 
     def has_bounty(self):
-        return self.bounties.count() > 0
+        return self.total_bounties > 0
 
     def get_bounty_points(self):
-        total = 0
-        queryset = self.bounties.all()
-        for elem in queryset:
-            total += elem.points
-
-        return total
+        return self.get_stats().reward_in_points
 
     @staticmethod
     def get_filtered_data(input_data, filter_data=None, exclude_data=None):
@@ -339,7 +364,7 @@ class Challenge(TimeStampMixin, common.AttachmentAbstract):
 
     @property
     def total_bounties(self):
-        return self.bounties.count()
+        return self.get_stats().bounties
 
 
 class Competition(TimeStampMixin, common.AttachmentAbstract):
@@ -371,7 +396,12 @@ class Competition(TimeStampMixin, common.AttachmentAbstract):
     def get_total_reward(self):
         return self.bounty_set.aggregate(Sum("reward_amount"))["reward_amount__sum"] or 0
 
+    @transaction.atomic
     def update_status(self):
+        from apps.engagement.models import Notification
+        from apps.engagement.outbox import emit
+        from apps.talent.models import Person
+
         now = timezone.now()
         new_status = self.status
         if now >= self.entry_deadline and self.status == self.CompetitionStatus.ACTIVE:
@@ -382,6 +412,11 @@ class Competition(TimeStampMixin, common.AttachmentAbstract):
         if new_status != self.status:
             self.status = new_status
             self.save(update_fields=['status'])
+            if new_status == self.CompetitionStatus.ENTRIES_CLOSED:
+                # One event for all entrants, the email dispatch greets each by name
+                entrants = Person.objects.filter(competition_entries__competition=self).values_list("pk", flat=True)
+                if entrant_ids := list(entrants.distinct()):
+                    emit(Notification.EventType.COMPETITION_CLOSED, entrant_ids, competition_title=self.title)
 
     @property
     def has_bounty(self):
@@ -400,7 +435,7 @@ class Bounty(TimeStampMixin, common.AttachmentAbstract):
         COMPLETED = "Completed"
         CANCELLED = "Cancelled"
 
-    id = Base58UUIDv5Field(primary_key=True)
+    id = Base58NativeUUIDField(primary_key=True)
     product = models.ForeignKey('Product', on_delete=models.CASCADE, related_name='bounties')  # Restored association
     challenge = models.ForeignKey('Challenge', on_delete=models.SET_NULL, null=True, blank=True, related_name='bounties')
     competition = models.OneToOneField('Competition', on_delete=models.SET_NULL, null=True, blank=True, related_name='bounty')
@@ -416,10 +451,14 @@ class Bounty(TimeStampMixin, common.AttachmentAbstract):
     reward_in_points = models.IntegerField(null=True, blank=True)
     final_reward_in_usd_cents = models.IntegerField(null=True, blank=True)
     final_reward_in_points = models.IntegerField(null=True, blank=True)
+    # Fields ProductStats and ChallengeStats are computed from
+    tracker = FieldTracker(fields=["status", "product_id", "challenge_id", "reward_in_usd_cents", "reward_in_points"])
 
     class Meta:
         ordering = ("-created_at",)
         verbose_name_plural = "Bounties"
+        # Finds the bounties whose reward changed since the last points calculation
+        indexes = [models.Index(fields=["updated_at"], name="bounty_updated_idx")]
         
     def clean(self):
         if self.reward_type == 'USD' and self.reward_in_points is not None:
@@ -447,8 +486,13 @@ class Bounty(TimeStampMixin, common.AttachmentAbstract):
         else:
             return f"{self.reward_in_points} Points"
 
+    def get_skills_as_str(self):
+        return ", ".join(bounty_skill.skill.name for bounty_skill in self.skills.all())
+
     def get_expertise_as_str(self):
-        return ", ".join([exp.name.title() for exp in self.expertise.all()])
+        return ", ".join(
+            expertise.name.title() for bounty_skill in self.skills.all() for expertise in bounty_skill.expertise.all()
+        )
 
     def __str__(self):
         reward = f"{self.reward_in_usd_cents/100:.2f} USD" if self.reward_type == 'USD' else f"{self.reward_in_points} Points"
@@ -530,12 +574,12 @@ class CompetitionEntry(TimeStampMixin):
 
     def can_user_rate(self, user):
         from apps.security.models import ProductRoleAssignment
+        from apps.security.permissions import get_user_role_assignments
 
-        is_admin_or_judge = ProductRoleAssignment.objects.filter(
-            person=user.person,
-            product=self.competition.product,
-            role__in=[ProductRoleAssignment.ProductRoles.ADMIN, ProductRoleAssignment.ProductRoles.JUDGE],
-        ).exists()
+        # There is no judge role yet, so only product admins can rate entries
+        is_admin_or_judge = get_user_role_assignments(user).has_product_role(
+            self.competition.product_id, [ProductRoleAssignment.ProductRoles.ADMIN]
+        )
         has_rated = self.ratings.filter(rater=user.person).exists()
         return is_admin_or_judge and not has_rated
 
@@ -591,10 +635,29 @@ class Idea(TimeStampMixin):
     description = models.TextField()
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     person = models.ForeignKey("talent.Person", on_delete=models.CASCADE)
+    # Kept in step with IdeaVote rows by the receivers below
+    vote_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["product", "-vote_count", "-created_at"], name="idea_product_popularity_idx")]
 
     def get_absolute_url(self):
         return reverse("add_product_idea", kwargs={"pk": self.pk})
 
+    @classmethod
+    def get_ranked_ideas(cls, product, person=None):
+        """The ideas of ``product``, most voted first, with ``user_has_voted`` for ``person``, in one query."""
+        if person is None:
+            user_has_voted = models.Value(False)
+        else:
+            user_has_voted = models.Exists(IdeaVote.objects.filter(idea=models.OuterRef("pk"), voter=person))
+        return (
+            cls.objects.filter(product=product)
+            .select_related("person")
+            .annotate(user_has_voted=user_has_voted)
+            .order_by("-vote_count", "-created_at")
+        )
+
     def __str__(self):
         return f"{self.person} - {self.title}"
 
@@ -651,6 +714,79 @@ class ProductContributorAgreement(TimeStampMixin):
     accepted_at = models.DateTimeField(auto_now_add=True, null=True)
 
 
+class ProductStats(models.Model):
+    """
+    Counters shown on product pages, so they read one row instead of aggregating bounties and challenges.
+    Kept up to date by the signal receivers below, see ``apps.product_management.stats``.
+    """
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    open_bounties = models.IntegerField(default=0)
+    open_reward_in_usd_cents = models.BigIntegerField(default=0)
+    open_reward_in_points = models.BigIntegerField(default=0)
+    draft_challenges = models.IntegerField(default=0)
+    blocked_challenges = models.IntegerField(default=0)
+    active_challenges = models.IntegerField(default=0)
+    completed_challenges = models.IntegerField(default=0)
+    cancelled_challenges = models.IntegerField(default=0)
+    initiatives = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "Product stats"
+
+    def __str__(self):
+        return f"Stats for {self.product_id}"
+
+
+class ChallengeStats(models.Model):
+    """Bounty counters and reward totals of a challenge, maintained like ``ProductStats``."""
+    challenge = models.OneToOneField(Challenge, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    bounties = models.IntegerField(default=0)
+    open_bounties = models.IntegerField(default=0)
+    reward_in_usd_cents = models.BigIntegerField(default=0)
+    reward_in_points = models.BigIntegerField(default=0)
+    open_reward_in_usd_cents = models.BigIntegerField(default=0)
+    open_reward_in_points = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "Challenge stats"
+
+    def __str__(self):
+        return f"Stats for {self.challenge_id}"
+
+
+class BountySearchDocument(models.Model):
+    """
+    What the public bounty list searches and filters on, one row per bounty with its skills, expertise, product and
+    reward flattened into it. Rebuilt by ``apps.product_management.search.index_bounties``.
+    """
+    bounty = models.OneToOneField(Bounty, on_delete=models.CASCADE, primary_key=True, related_name="search_document")
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="+")
+    # False while the bounty's challenge is a draft
+    is_listed = models.BooleanField(default=True)
+    status = models.CharField(max_length=20, choices=Bounty.BountyStatus.choices)
+    reward_type = models.CharField(max_length=10)
+    reward_in_usd_cents = models.IntegerField(null=True)
+    reward_in_points = models.IntegerField(null=True)
+    skill_ids = ArrayField(models.CharField(max_length=22), default=list)
+    expertise_ids = ArrayField(models.CharField(max_length=22), default=list)
+    search_vector = SearchVectorField(null=True)
+    # Copied from the bounty for keyset pagination, never null
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="bounty_search_vector_idx"),
+            GinIndex(fields=["skill_ids"], name="bounty_search_skills_idx"),
+            GinIndex(fields=["expertise_ids"], name="bounty_search_expertise_idx"),
+            models.Index(
+                fields=["-created_at", "-bounty"], condition=models.Q(is_listed=True), name="bounty_search_listed_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Search document for {self.bounty_id}"
+
+
 # Signal receivers
 @receiver(post_save, sender=Bounty)
 def update_challenge_status(sender, instance, **kwargs):
@@ -658,6 +794,48 @@ def update_challenge_status(sender, instance, **kwargs):
         instance.challenge.update_status()
 
 
+@receiver(post_save, sender=Bounty)
+@receiver(post_save, sender=Challenge)
+@receiver(post_save, sender=Initiative)
+def update_stats_on_save(sender, instance, created, raw=False, **kwargs):
+    from . import stats
+
+    if not raw:
+        stats.record_change(instance, created)
+
+
+@receiver(post_delete, sender=Bounty)
+@receiver(post_delete, sender=Challenge)
+@receiver(post_delete, sender=Initiative)
+def update_stats_on_delete(sender, instance, **kwargs):
+    from . import stats
+
+    stats.record_delete(instance)
+
+
+@receiver(post_save, sender=ProductArea)
+@receiver(post_delete, sender=ProductArea)
+def invalidate_product_tree(sender, instance, raw=False, **kwargs):
+    from .tree import get_product_tree_ids, invalidate_product_trees
+
+    if not raw:
+        product_tree_ids = get_product_tree_ids([instance])
+        if instance.tracker.has_changed("product_tree_id"):
+            product_tree_ids.add(instance.tracker.previous("product_tree_id"))
+        invalidate_product_trees(product_tree_ids - {None})
+
+
+@receiver(post_save, sender=IdeaVote)
+def count_vote_on_save(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Idea.objects.filter(pk=instance.idea_id).update(vote_count=models.F("vote_count") + 1)
+
+
+@receiver(post_delete, sender=IdeaVote)
+def count_vote_on_delete(sender, instance, **kwargs):
+    Idea.objects.filter(pk=instance.idea_id, vote_count__gt=0).update(vote_count=models.F("vote_count") - 1)
+
+
 @receiver(post_save, sender="talent.BountyClaim")
 def update_bounty_status_from_claim(sender, instance, **kwargs):
     instance.bounty.update_status_from_claim()
@@ -680,4 +858,50 @@ def _pre_save(sender, instance, **kwargs):
 
 @receiver(post_save, sender="product_management.Competition")
 def update_competition_status(sender, instance, **kwargs):
-    instance.update_status()
\ No newline at end of file
+    instance.update_status()
+
+
+@receiver(post_save, sender=Bounty)
+def index_saved_bounty(sender, instance, raw=False, **kwargs):
+    from .search import index_on_commit
+
+    if not raw:
+        index_on_commit([instance.pk])
+
+
+@receiver(post_save, sender=BountySkill)
+@receiver(post_delete, sender=BountySkill)
+def index_bounty_of_skill(sender, instance, raw=False, **kwargs):
+    from .search import index_on_commit
+
+    if not raw:
+        index_on_commit([instance.bounty_id])
+
+
+@receiver(m2m_changed, sender=BountySkill.expertise.through)
+def index_bounty_of_expertise(sender, instance, action, reverse, pk_set, **kwargs):
+    from .search import index_on_commit
+
+    if not reverse and action in ("post_add", "post_remove", "post_clear"):
+        index_on_commit([instance.bounty_id])
+    elif reverse and action in ("post_add", "post_remove"):
+        index_on_commit(BountySkill.objects.filter(pk__in=pk_set).values_list("bounty_id", flat=True))
+    elif reverse and action == "pre_clear":
+        # Afterwards there is no telling which bounties had this expertise
+        index_on_commit(BountySkill.objects.filter(expertise=instance).values_list("bounty_id", flat=True))
+
+
+@receiver(post_save, sender=Challenge)
+def index_bounties_of_challenge(sender, instance, created, raw=False, **kwargs):
+    from .search import index_on_commit
+
+    if not (created or raw) and instance.tracker.has_changed("status"):
+        index_on_commit(instance.bounties.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=Product)
+def index_bounties_of_product(sender, instance, created, raw=False, **kwargs):
+    from .search import index_on_commit
+
+    if not (created or raw) and instance.tracker.has_changed("name"):
+        index_on_commit(instance.bounties.values_list("pk", flat=True))
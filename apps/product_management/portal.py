@@ -0,0 +1,73 @@
+"""
+Data loaders for the portal views.
+
+Portal pages used to look the product up by slug in ``get_form_kwargs``, ``get_context_data`` and ``form_valid``
+alike, check that it existed before fetching it again, and list bounty claims and role assignments whose templates
+then followed foreign keys row by row. ``PortalData`` loads each of these once per request, with the related rows
+the templates read joined or prefetched, so every portal page runs a fixed number of queries however many products,
+claims or users it lists.
+"""
+from django.http import Http404
+from django.utils.functional import cached_property
+
+from apps.security.models import ProductRoleAssignment
+from apps.security.permissions import get_role_assignments
+from apps.talent.matching import recommended_bounties
+from apps.talent.models import BountyClaim
+
+from .models import Bounty, Product
+
+MANAGER_ROLES = (ProductRoleAssignment.ProductRoles.ADMIN, ProductRoleAssignment.ProductRoles.MANAGER)
+
+
+class PortalData:
+    """What the portal shows the current user, memoised for the request. Use ``for_request`` to get one."""
+
+    def __init__(self, request):
+        self.request = request
+        self._products = {}
+
+    @classmethod
+    def for_request(cls, request):
+        if not hasattr(request, "_portal_data"):
+            request._portal_data = cls(request)
+        return request._portal_data
+
+    @cached_property
+    def person(self):
+        return self.request.user.person
+
+    def find_product(self, slug):
+        """The product with ``slug``, or None."""
+        if slug not in self._products:
+            self._products[slug] = Product.objects.filter(slug=slug).first() if slug else None
+        return self._products[slug]
+
+    def get_product(self, slug):
+        product = self.find_product(slug)
+        if product is None:
+            raise Http404("No product matches the given slug.")
+        return product
+
+    def owned_products(self):
+        return Product.objects.filter(person=self.person)
+
+    def managed_products(self):
+        """Products the person is an admin or manager of. The role assignments come from the permission cache."""
+        return Product.objects.filter(id__in=get_role_assignments(self.person).product_ids(MANAGER_ROLES))
+
+    def active_bounty_claims(self):
+        return (
+            BountyClaim.objects.filter(person=self.person, status=BountyClaim.Status.ACTIVE)
+            .select_related("bounty__challenge__product", "accepted_bid")
+            .prefetch_related("bounty__skills__skill", "bounty__skills__expertise")
+        )
+
+    def recommended_bounties(self, limit=5):
+        """The open bounties best matching the person's skills, best first, ranked in memory by the matcher."""
+        ranked = [bounty_id for bounty_id, _ in recommended_bounties(self.person, limit)]
+        bounties = Bounty.objects.filter(challenge__isnull=False).select_related("product").in_bulk(ranked)
+        return [bounties[bounty_id] for bounty_id in ranked if bounty_id in bounties]
+
+    def product_users(self, product):
+        return ProductRoleAssignment.objects.filter(product=product).select_related("person").order_by("-role")
@@ -0,0 +1,192 @@
+"""
+Search and facet counts for the public bounty list.
+
+Each bounty has a ``BountySearchDocument`` holding everything the list filters on, with its skill and expertise ids
+as arrays and a weighted ``tsvector`` of its title, skills, expertise, product and description, all GIN indexed.
+Documents are rebuilt in one ``INSERT ... SELECT ... ON CONFLICT`` statement per batch, after the transaction
+that changed a bounty, its skills or expertise, the status of its challenge or the name of its product commits.
+Renaming a skill or expertise, bulk ``update()`` calls and fixture loads don't reindex; run ``manage.py
+rebuild_bounty_search`` after those (and once after the migration that creates the table).
+
+``BountySearch`` turns a filter request into a queryset of documents, which ``BountyListView`` paginates by
+``(created_at, bounty)`` cursors, and counts every status, skill and expertise value in a single query. Each facet
+is counted with the other facets' filters applied but not its own, so picking a status still shows how many
+bounties the other statuses have.
+"""
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection, transaction
+
+from apps.talent.models import Expertise, Skill
+
+from .models import Bounty, BountySearchDocument, BountySkill, Challenge, Product
+
+SEARCH_CONFIG = "english"
+REBUILD_BATCH_SIZE = 5000
+
+INDEX_SQL = """
+INSERT INTO {document} (
+    bounty_id, product_id, is_listed, status, reward_type, reward_in_usd_cents, reward_in_points,
+    skill_ids, expertise_ids, created_at, search_vector
+)
+SELECT
+    bounty.id,
+    bounty.product_id,
+    challenge.status IS DISTINCT FROM %s,
+    bounty.status,
+    bounty.reward_type,
+    bounty.reward_in_usd_cents,
+    bounty.reward_in_points,
+    coalesce(array_agg(DISTINCT bounty_skill.skill_id) FILTER (WHERE bounty_skill.skill_id IS NOT NULL), '{{}}'),
+    coalesce(array_agg(DISTINCT expertise.id) FILTER (WHERE expertise.id IS NOT NULL), '{{}}'),
+    coalesce(bounty.created_at, to_timestamp(0)),
+    setweight(to_tsvector({config}, bounty.title), 'A')
+    || setweight(to_tsvector({config}, coalesce(string_agg(DISTINCT skill.name, ' '), '')), 'B')
+    || setweight(to_tsvector({config}, coalesce(string_agg(DISTINCT expertise.name, ' '), '')), 'B')
+    || setweight(to_tsvector({config}, product.name), 'C')
+    || setweight(to_tsvector({config}, bounty.description), 'D')
+FROM {bounty} bounty
+JOIN {product} product ON product.id = bounty.product_id
+LEFT JOIN {challenge} challenge ON challenge.id = bounty.challenge_id
+LEFT JOIN {bounty_skill} bounty_skill ON bounty_skill.bounty_id = bounty.id
+LEFT JOIN {skill} skill ON skill.id = bounty_skill.skill_id
+LEFT JOIN {bounty_skill_expertise} bounty_skill_expertise ON bounty_skill_expertise.bountyskill_id = bounty_skill.id
+LEFT JOIN {expertise} expertise ON expertise.id = bounty_skill_expertise.expertise_id
+WHERE bounty.id IN ({bounty_ids})
+GROUP BY bounty.id, product.id, challenge.id
+ON CONFLICT (bounty_id) DO UPDATE SET
+    product_id = EXCLUDED.product_id,
+    is_listed = EXCLUDED.is_listed,
+    status = EXCLUDED.status,
+    reward_type = EXCLUDED.reward_type,
+    reward_in_usd_cents = EXCLUDED.reward_in_usd_cents,
+    reward_in_points = EXCLUDED.reward_in_points,
+    skill_ids = EXCLUDED.skill_ids,
+    expertise_ids = EXCLUDED.expertise_ids,
+    created_at = EXCLUDED.created_at,
+    search_vector = EXCLUDED.search_vector
+"""
+
+FACETS_SQL = """
+SELECT facet.name, facet.value, count(*)
+FROM ({documents}) document
+CROSS JOIN LATERAL ({facets}) AS facet (name, value)
+GROUP BY facet.name, facet.value
+"""
+
+# How each facet is counted and filtered: the values of a FACETS_SQL ``document`` row, the SQL condition matching
+# a value and the ORM lookup doing the same
+FACETS = {
+    "status": ("document.status", "document.status = %s", "status"),
+    "skill": ("unnest(document.skill_ids)", "document.skill_ids @> ARRAY[%s]::varchar[]", "skill_ids__contains"),
+    "expertise": (
+        "unnest(document.expertise_ids)",
+        "document.expertise_ids @> ARRAY[%s]::varchar[]",
+        "expertise_ids__contains",
+    ),
+}
+
+
+def quoted_tables():
+    quote = connection.ops.quote_name
+    tables = {
+        "document": BountySearchDocument,
+        "bounty": Bounty,
+        "product": Product,
+        "challenge": Challenge,
+        "bounty_skill": BountySkill,
+        "bounty_skill_expertise": BountySkill.expertise.through,
+        "skill": Skill,
+        "expertise": Expertise,
+    }
+    return {name: quote(model._meta.db_table) for name, model in tables.items()}
+
+
+def index_bounties(bounties):
+    """Creates or refreshes the search documents of the ``bounties`` queryset in one statement."""
+    ids_sql, ids_params = bounties.values("pk").query.sql_with_params()
+    sql = INDEX_SQL.format(bounty_ids=ids_sql, config=f"'{SEARCH_CONFIG}'", **quoted_tables())
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [Challenge.ChallengeStatus.DRAFT, *ids_params])
+
+
+def index_on_commit(bounty_ids):
+    """Reindexes the given bounties once the current transaction commits (right away outside of one)."""
+    bounty_ids = list(bounty_ids)
+    if bounty_ids:
+        transaction.on_commit(lambda: index_bounties(Bounty.objects.filter(pk__in=bounty_ids)))
+
+
+def rebuild_search_documents(batch_size=REBUILD_BATCH_SIZE):
+    """Reindexes every bounty. Returns the number of bounties indexed."""
+    ids = list(Bounty.objects.order_by("pk").values_list("pk", flat=True))
+    for offset in range(0, len(ids), batch_size):
+        index_bounties(Bounty.objects.filter(pk__in=ids[offset:offset + batch_size]))
+    return len(ids)
+
+
+class BountySearch:
+    """A bounty list request: free text and facet filters."""
+
+    def __init__(self, text="", filters=None):
+        self.text = text.strip()
+        self.filters = {name: value for name, value in (filters or {}).items() if name in FACETS and value}
+
+    @classmethod
+    def from_query_dict(cls, data):
+        return cls(text=data.get("q", ""), filters={name: data.get(name) for name in FACETS})
+
+    def listed_documents(self):
+        """Documents matching the text, before any facet filter."""
+        documents = BountySearchDocument.objects.filter(is_listed=True)
+        if self.text:
+            query = SearchQuery(self.text, config=SEARCH_CONFIG, search_type="websearch")
+            documents = documents.filter(search_vector=query)
+        return documents
+
+    def documents(self):
+        """Documents matching the text and every facet filter."""
+        documents = self.listed_documents()
+        for name, value in self.filters.items():
+            lookup = FACETS[name][2]
+            documents = documents.filter(**{lookup: [value] if lookup.endswith("__contains") else value})
+        return documents
+
+    def facet_sql(self, name, values_sql, exclude=None):
+        """A SELECT of (name, value) over the document row, filtered by every facet but ``exclude``."""
+        conditions, params = ["TRUE"], []
+        for facet, value in self.filters.items():
+            if facet != exclude:
+                conditions.append(FACETS[facet][1])
+                params.append(value)
+        return f"SELECT '{name}', {values_sql} WHERE {' AND '.join(conditions)}", params
+
+    def facet_counts(self):
+        """{"total": matching bounties, facet: {value: bounties}} in one query."""
+        documents_sql, params = (
+            self.listed_documents().values("status", "skill_ids", "expertise_ids").query.sql_with_params()
+        )
+        selects = [self.facet_sql("total", "NULL::varchar")]
+        selects += [self.facet_sql(name, values_sql, exclude=name) for name, (values_sql, _, _) in FACETS.items()]
+        facets_sql = " UNION ALL ".join(sql for sql, _ in selects)
+        params = [*params, *(param for _, select_params in selects for param in select_params)]
+
+        counts = {"total": 0, **{name: {} for name in FACETS}}
+        with connection.cursor() as cursor:
+            cursor.execute(FACETS_SQL.format(documents=documents_sql, facets=facets_sql), params)
+            for name, value, count in cursor.fetchall():
+                if name == "total":
+                    counts["total"] = count
+                else:
+                    counts[name][value] = count
+        return counts
+
+    @staticmethod
+    def load_bounties(documents):
+        """The bounties of ``documents``, in the same order, with what the bounty cards show."""
+        bounties = (
+            Bounty.objects.filter(pk__in=[document.pk for document in documents])
+            .select_related("challenge__product", "challenge__initiative", "product")
+            .prefetch_related("skills__skill", "skills__expertise")
+            .in_bulk()
+        )
+        return [bounties[document.pk] for document in documents if document.pk in bounties]
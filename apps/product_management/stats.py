@@ -0,0 +1,215 @@
+"""
+Denormalised counters for products and challenges.
+
+``ProductStats`` and ``ChallengeStats`` hold the numbers product pages show (open bounties, reward totals,
+challenges per status, initiatives) so they don't have to aggregate over bounties and challenges on every request.
+The post_save and post_delete receivers in ``models`` call ``record_change`` and ``record_delete``, which work out
+what the saved object contributed to the counters before and after the change (from its ``FieldTracker``) and apply
+the difference with a single ``UPDATE ... SET counter = counter + delta`` per row, inside the same transaction as
+the change itself.
+
+Bulk ``update()`` and ``delete()`` calls don't send these signals; ``rebuild_stats`` (and the ``rebuild_stats``
+management command) recomputes every row from scratch. A missing row is computed on first use.
+"""
+from collections import defaultdict
+
+from django.db.models import Count, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import Bounty, Challenge, ChallengeStats, Initiative, Product, ProductStats
+
+REBUILD_BATCH_SIZE = 1000
+
+OPEN = Bounty.BountyStatus.OPEN
+CHALLENGE_STATUS_FIELDS = {
+    Challenge.ChallengeStatus.DRAFT: "draft_challenges",
+    Challenge.ChallengeStatus.BLOCKED: "blocked_challenges",
+    Challenge.ChallengeStatus.ACTIVE: "active_challenges",
+    Challenge.ChallengeStatus.COMPLETED: "completed_challenges",
+    Challenge.ChallengeStatus.CANCELLED: "cancelled_challenges",
+}
+PRODUCT_STATS_FIELDS = [
+    "open_bounties",
+    "open_reward_in_usd_cents",
+    "open_reward_in_points",
+    *CHALLENGE_STATUS_FIELDS.values(),
+    "initiatives",
+]
+CHALLENGE_STATS_FIELDS = [
+    "bounties",
+    "open_bounties",
+    "reward_in_usd_cents",
+    "reward_in_points",
+    "open_reward_in_usd_cents",
+    "open_reward_in_points",
+]
+
+
+def bounty_contribution(values):
+    usd_cents, points = values["reward_in_usd_cents"] or 0, values["reward_in_points"] or 0
+    open_counters = {}
+    if values["status"] == OPEN:
+        open_counters = {"open_bounties": 1, "open_reward_in_usd_cents": usd_cents, "open_reward_in_points": points}
+    challenge = {"bounties": 1, "reward_in_usd_cents": usd_cents, "reward_in_points": points, **open_counters}
+    return [
+        (ProductStats, values["product_id"], open_counters),
+        (ChallengeStats, values["challenge_id"], challenge),
+    ]
+
+
+def challenge_contribution(values):
+    field = CHALLENGE_STATUS_FIELDS.get(values["status"])
+    return [(ProductStats, values["product_id"], {field: 1} if field else {})]
+
+
+def initiative_contribution(values):
+    return [(ProductStats, values["product_id"], {"initiatives": 1})]
+
+
+CONTRIBUTIONS = {
+    Bounty: (["status", "product_id", "challenge_id", "reward_in_usd_cents", "reward_in_points"], bounty_contribution),
+    Challenge: (["status", "product_id"], challenge_contribution),
+    Initiative: (["product_id"], initiative_contribution),
+}
+
+
+def contributions(instance, previous=False):
+    fields, contribution = CONTRIBUTIONS[type(instance)]
+    if previous:
+        # Still the values before the save, the tracker is reset after post_save
+        return contribution({field: instance.tracker.previous(field) for field in fields})
+    return contribution({field: getattr(instance, field) for field in fields})
+
+
+def collect_deltas(old, new):
+    """Nets two lists of contributions into {(stats model, pk): {field: delta}}, leaving out zero deltas."""
+    deltas = defaultdict(lambda: defaultdict(int))
+    for sign, items in [(-1, old), (1, new)]:
+        for stats_model, pk, counters in items:
+            if pk is None:
+                continue
+            for field, value in counters.items():
+                deltas[stats_model, pk][field] += sign * value
+    return {
+        key: {field: delta for field, delta in counters.items() if delta}
+        for key, counters in deltas.items()
+        if any(counters.values())
+    }
+
+
+def apply_deltas(deltas, refresh_missing=True):
+    for (stats_model, pk), counters in deltas.items():
+        updated = stats_model.objects.filter(pk=pk).update(
+            **{field: F(field) + delta for field, delta in counters.items()}
+        )
+        # The row is computed from scratch, which already includes this change
+        if not updated and refresh_missing:
+            REFRESH[stats_model]([pk])
+
+
+def record_change(instance, created):
+    old = [] if created else contributions(instance, previous=True)
+    apply_deltas(collect_deltas(old, contributions(instance)))
+
+
+def record_delete(instance):
+    # Rows missing here were deleted along with their product or challenge, so they aren't recreated
+    apply_deltas(collect_deltas(contributions(instance), []), refresh_missing=False)
+
+
+def count(condition=None):
+    return Count("pk", filter=condition)
+
+
+def total(field, condition=None):
+    return Coalesce(Sum(field, filter=condition), Value(0))
+
+
+def grouped(queryset, group_by, **aggregates):
+    """{group_by value: {name: aggregate}}. Annotations can't share a name with a model field, hence the prefix."""
+    annotations = {f"total_{name}": value for name, value in aggregates.items()}
+    rows = queryset.values(group_by).order_by().annotate(**annotations)
+    return {row[group_by]: {name: row[f"total_{name}"] for name in aggregates} for row in rows}
+
+
+def refresh_product_stats(product_ids):
+    """Recomputes and saves the stats of the given products with one aggregate query per counted model."""
+    product_ids = list(product_ids)
+    bounties = grouped(
+        Bounty.objects.filter(product_id__in=product_ids, status=OPEN),
+        "product_id",
+        open_bounties=count(),
+        open_reward_in_usd_cents=total("reward_in_usd_cents"),
+        open_reward_in_points=total("reward_in_points"),
+    )
+    challenges = grouped(
+        Challenge.objects.filter(product_id__in=product_ids),
+        "product_id",
+        **{field: count(Q(status=status)) for status, field in CHALLENGE_STATUS_FIELDS.items()},
+    )
+    initiatives = grouped(Initiative.objects.filter(product_id__in=product_ids), "product_id", initiatives=count())
+
+    rows = [
+        ProductStats(
+            product_id=product_id,
+            **bounties.get(product_id, {}),
+            **challenges.get(product_id, {}),
+            **initiatives.get(product_id, {}),
+        )
+        for product_id in product_ids
+    ]
+    return ProductStats.objects.bulk_create(
+        rows, update_conflicts=True, unique_fields=["product"], update_fields=PRODUCT_STATS_FIELDS
+    )
+
+
+def refresh_challenge_stats(challenge_ids):
+    """Recomputes and saves the stats of the given challenges with one aggregate query."""
+    challenge_ids = list(challenge_ids)
+    is_open = Q(status=OPEN)
+    bounties = grouped(
+        Bounty.objects.filter(challenge_id__in=challenge_ids),
+        "challenge_id",
+        bounties=count(),
+        open_bounties=count(is_open),
+        reward_in_usd_cents=total("reward_in_usd_cents"),
+        reward_in_points=total("reward_in_points"),
+        open_reward_in_usd_cents=total("reward_in_usd_cents", is_open),
+        open_reward_in_points=total("reward_in_points", is_open),
+    )
+    rows = [
+        ChallengeStats(challenge_id=challenge_id, **bounties.get(challenge_id, {})) for challenge_id in challenge_ids
+    ]
+    return ChallengeStats.objects.bulk_create(
+        rows, update_conflicts=True, unique_fields=["challenge"], update_fields=CHALLENGE_STATS_FIELDS
+    )
+
+
+REFRESH = {ProductStats: refresh_product_stats, ChallengeStats: refresh_challenge_stats}
+
+
+def rebuild_stats(batch_size=REBUILD_BATCH_SIZE):
+    """Recomputes the stats of every product and challenge. Returns (products, challenges)."""
+    counts = []
+    for model, refresh in [(Product, refresh_product_stats), (Challenge, refresh_challenge_stats)]:
+        ids = list(model.objects.order_by("pk").values_list("pk", flat=True))
+        for offset in range(0, len(ids), batch_size):
+            refresh(ids[offset:offset + batch_size])
+        counts.append(len(ids))
+    return tuple(counts)
+
+
+def get_product_stats(product):
+    try:
+        return product.stats
+    except ProductStats.DoesNotExist:
+        product.stats = refresh_product_stats([product.pk])[0]
+        return product.stats
+
+
+def get_challenge_stats(challenge):
+    try:
+        return challenge.stats
+    except ChallengeStats.DoesNotExist:
+        challenge.stats = refresh_challenge_stats([challenge.pk])[0]
+        return challenge.stats
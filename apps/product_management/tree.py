@@ -0,0 +1,101 @@
+"""
+Product tree serialisation.
+
+``ProductArea`` is a treebeard materialised path node: every area's ``path`` starts with the path of each of its
+ancestors, ``steplen`` characters per level, and ordering by ``path`` lists a subtree depth first with siblings in
+order. A whole subtree is therefore one ``path__startswith`` query, and the nested dicts the tree templates render
+are built from the ordered rows in a single pass instead of a ``get_children()`` query per node.
+
+Only the root areas of a tree point at their ``ProductTree``, so a tree's areas are those whose first path step is
+the path of one of its roots. ``serialize_product_tree`` caches the serialised tree per ``ProductTree`` in the shared
+cache; the receivers in ``models`` and ``ProductArea.move`` call ``invalidate_product_trees`` when an area is added,
+changed, moved or deleted. Changes that send no signal show once the tree expires after ``PRODUCT_TREE_CACHE_TIMEOUT``.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.functions import Substr
+
+from .models import ProductArea
+
+CACHE_KEY_PREFIX = "product_management:product_tree"
+
+FIELDS = ("id", "path", "name", "description", "video_link", "video_name", "video_duration")
+
+
+def cache_key(product_tree_id):
+    return f"{CACHE_KEY_PREFIX}:{product_tree_id}"
+
+
+def root_path(path):
+    return path[:ProductArea.steplen]
+
+
+def serialize_row(row):
+    return {
+        "id": row["id"],
+        # Was a fresh uuid4 per node and render, which kept the result from being cached; nothing reads it
+        "node_id": row["id"],
+        "name": row["name"],
+        "description": row["description"],
+        "video_link": row["video_link"],
+        "video_name": row["video_name"],
+        "video_duration": row["video_duration"],
+        "has_saved": True,
+        "children": [],
+    }
+
+
+def build_trees(rows):
+    """The nested dicts of ``rows`` ordered by path. Rows whose parent isn't among them become roots."""
+    trees, nodes = [], {}
+    for row in rows:
+        node = serialize_row(row)
+        parent = nodes.get(row["path"][:-ProductArea.steplen])
+        (parent["children"] if parent else trees).append(node)
+        nodes[row["path"]] = node
+    return trees
+
+
+def serialize_tree(product_area):
+    """``product_area`` and all its descendants as nested dicts, in one query."""
+    rows = ProductArea.objects.filter(path__startswith=product_area.path).order_by("path").values(*FIELDS)
+    return build_trees(rows)[0]
+
+
+def load_product_tree(product_tree_id):
+    roots = ProductArea.objects.filter(product_tree_id=product_tree_id, depth=1).values("path")
+    rows = (
+        ProductArea.objects.annotate(root_path=Substr("path", 1, ProductArea.steplen))
+        .filter(root_path__in=roots)
+        .order_by("path")
+        .values(*FIELDS)
+    )
+    return build_trees(rows)
+
+
+def serialize_product_tree(product_tree):
+    """The root areas of ``product_tree`` (a ProductTree or its id) with their descendants, cached."""
+    product_tree_id = getattr(product_tree, "pk", product_tree)
+    trees = cache.get(cache_key(product_tree_id))
+    if trees is None:
+        trees = load_product_tree(product_tree_id)
+        cache.set(cache_key(product_tree_id), trees, getattr(settings, "PRODUCT_TREE_CACHE_TIMEOUT", 60 * 60))
+    return trees
+
+
+def get_product_tree_ids(product_areas):
+    """Ids of the trees the given areas belong to, found through their roots."""
+    tree_ids = {area.product_tree_id for area in product_areas if area.depth == 1}
+    paths = {root_path(area.path) for area in product_areas if area.depth != 1 and area.path}
+    if paths:
+        tree_ids.update(ProductArea.objects.filter(path__in=paths).values_list("product_tree_id", flat=True))
+    return tree_ids - {None}
+
+
+def invalidate_product_trees(product_tree_ids):
+    """Drops the cached trees now and again once the current transaction commits."""
+    keys = [cache_key(product_tree_id) for product_tree_id in product_tree_ids]
+    if keys:
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -5,7 +5,7 @@ from django.forms.models import model_to_dict
 from django.http import JsonResponse
 from django.shortcuts import HttpResponseRedirect, get_object_or_404
 
-from apps.security.models import ProductRoleAssignment
+from apps.security.permissions import get_user_role_assignments
 
 from .models import Product
 
@@ -20,17 +20,9 @@ def to_dict(instance):
 
 
 def has_product_modify_permission(user, product):
-    if user.is_authenticated:
-        try:
-            role_assignment = ProductRoleAssignment.objects.get(person__user=user, product=product)
-            return role_assignment.role in [
-                ProductRoleAssignment.ProductRoles.ADMIN,
-                ProductRoleAssignment.ProductRoles.MANAGER,
-            ]
-        except Exception as ex:
-            print(ex)
-            return False
-    return False
+    if product is None:
+        return False
+    return get_user_role_assignments(user).can_modify_product(product)
 
 
 def permission_error_message():
@@ -52,25 +44,16 @@ def modify_permission_required(view_func):
     return _wrapped_view
 
 
-def serialize_tree(node):
-    """Serializer for the tree."""
-    return {
-        "id": node.pk,
-        "node_id": uuid.uuid4(),
-        "name": node.name,
-        "description": node.description,
-        "video_link": node.video_link,
-        "video_name": node.video_name,
-        "video_duration": node.video_duration,
-        "has_saved": True,
-        "children": [serialize_tree(child) for child in node.get_children()],
-    }
-
-
 class BaseProductDetailView:
+    def get_product(self):
+        """The product of the URL's ``product_slug``, looked up once per view."""
+        if not hasattr(self, "_product"):
+            self._product = get_object_or_404(Product, slug=self.kwargs.get("product_slug", None))
+        return self._product
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        product = get_object_or_404(Product, slug=self.kwargs.get("product_slug", None))
+        product = self.get_product()
         context["product"] = product
         context["product_slug"] = product.slug
         return context
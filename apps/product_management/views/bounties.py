@@ -3,50 +3,58 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse, reverse_lazy
 from django.http import JsonResponse, HttpResponseRedirect
-from django.db import models
+from django.db import transaction
 from django.contrib import messages
+from django.utils import timezone
 
 from ..models import Bounty, Challenge, Product
 from ..forms import BountyForm
 from .. import utils
-from apps.talent.utils import serialize_skills
-from apps.talent.models import Skill, Expertise, BountyClaim
+from ..search import BountySearch
+from apps.common.mixins import AttachmentMixin, CursorPaginationMixin
+from apps.talent.matching import suggested_talent
+from apps.talent.taxonomy import get_taxonomy
+from apps.talent.models import Skill, Expertise, BountyBid, BountyClaim, Person
 from apps.talent.forms import PersonSkillFormSet
 
-class BountyListView(ListView):
+class BountyListView(CursorPaginationMixin, ListView):
     model = Bounty
     context_object_name = "bounties"
     template_name = "product_management/bounty/list.html"
+    items_template_name = "product_management/bounty/partials/list_items.html"
     paginate_by = 51
 
     def get_template_names(self):
-        if self.request.htmx:
+        if self.request.htmx and self.cursor_param not in self.request.GET:
             return ["product_management/bounty/partials/list_partials.html"]
-        return ["product_management/bounty/list.html"]
+        return super().get_template_names()
 
     def get_queryset(self):
-        filters = ~models.Q(challenge__status=Challenge.ChallengeStatus.DRAFT)
+        self.search = BountySearch.from_query_dict(self.request.GET)
+        return self.search.documents()
 
-        if expertise := self.request.GET.get("expertise"):
-            filters &= models.Q(expertise=expertise)
+    def get_page_objects(self, rows):
+        return self.search.load_bounties(rows)
 
-        if status := self.request.GET.get("status"):
-            filters &= models.Q(status=status)
-
-        if skill := self.request.GET.get("skill"):
-            filters &= models.Q(skill=skill)
-        return Bounty.objects.filter(filters).select_related("challenge", "skill").prefetch_related("expertise")
+    def get_page_query(self):
+        query = super().get_page_query()
+        # Later pages only append to the list, they aren't a skill change
+        query.pop("target", None)
+        return query
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["BountyStatus"] = Bounty.BountyStatus
 
-        expertises = []
-        if skill := self.request.GET.get("skill"):
-            expertises = Expertise.get_roots().filter(skill=skill)
+        # Only the full page and the skill filter show counts, the list partial doesn't
+        if not self.request.htmx or self.request.GET.get("target") == "skill":
+            context["facets"] = self.search.facet_counts()
 
-        context["skills"] = [serialize_skills(skill) for skill in Skill.get_roots()]
-        context["expertises"] = [utils.serialize_other_type_tree(expertise) for expertise in expertises]
+        taxonomy = get_taxonomy()
+        if not self.request.htmx:
+            context["skills"] = taxonomy.skill_tree()
+        skill = self.request.GET.get("skill")
+        context["expertises"] = taxonomy.expertise_tree(skill=skill) if skill else []
         return context
 
     def render_to_response(self, context, **response_kwargs):
@@ -66,7 +74,7 @@ class BountyListView(ListView):
                 {
                     "list_html": list_html,
                     "expertise_html": expertise_html,
-                    "item_found_count": context["object_list"].count(),
+                    "item_found_count": context["facets"]["total"],
                 }
             )
         return super().render_to_response(context, **response_kwargs)
@@ -77,12 +85,15 @@ class ProductBountyListView(utils.BaseProductDetailView, ListView):
     template_name = "product_management/product_bounties.html"
 
     def get_queryset(self):
-        product = self.get_context_data().get("product")
-        return Bounty.objects.filter(challenge__product=product).exclude(
-            challenge__status=Challenge.ChallengeStatus.DRAFT
+        product = self.get_product()
+        return (
+            Bounty.objects.filter(challenge__product=product)
+            .exclude(challenge__status=Challenge.ChallengeStatus.DRAFT)
+            .select_related("challenge__product", "challenge__initiative")
+            .prefetch_related("skills__skill", "skills__expertise")
         )
 
-class BountyDetailView(utils.BaseProductDetailView, DetailView):
+class BountyDetailView(utils.BaseProductDetailView, AttachmentMixin, DetailView):
     model = Bounty
     template_name = "product_management/bounty_detail.html"
 
@@ -90,38 +101,49 @@ class BountyDetailView(utils.BaseProductDetailView, DetailView):
         context = super().get_context_data(**kwargs)
         bounty = self.object
         user = self.request.user
-        
-        context.update({
+        # Bounty.claimed_by is gone, the person of its active or completed claim took it
+        claim = bounty.bountyclaim_set.filter(
+            status__in=[BountyClaim.Status.ACTIVE, BountyClaim.Status.COMPLETED]
+        ).select_related("person").first()
+        claimed_by = claim.person if claim else None
+
+        # The template and its partials read the bounty and what can be done with it from data
+        data = {
             "product": bounty.challenge.product,
             "challenge": bounty.challenge,
-            "claimed_by": bounty.claimed_by,
+            "bounty": bounty,
+            "claimed_by": claimed_by,
             "show_actions": False,
+            # Claims start from a bid now, and there is no route to bid from this page yet
             "can_be_claimed": False,
             "can_be_modified": False,
             "is_product_admin": False,
             "created_bounty_claim_request": False,
             "bounty_claim": None,
-        })
+        }
 
         if user.is_authenticated:
             person = user.person
             bounty_claim = bounty.bountyclaim_set.filter(person=person).first()
 
-            context["can_be_modified"] = utils.has_product_modify_permission(user, context["product"])
+            data["can_be_modified"] = utils.has_product_modify_permission(user, data["product"])
 
-            if bounty.status == Bounty.BountyStatus.AVAILABLE:
-                context["can_be_claimed"] = not bounty_claim
+            # Claims are requested with a bid now, a pending one is the request
+            if not claimed_by and bounty.bids.filter(person=person, status=BountyBid.Status.PENDING).exists():
+                data["created_bounty_claim_request"] = True
+                data["bounty_claim"] = bounty_claim
 
-            if bounty_claim and bounty_claim.status == BountyClaim.Status.REQUESTED and not bounty.claimed_by:
-                context["created_bounty_claim_request"] = True
-                context["bounty_claim"] = bounty_claim
+        ranked = [person_id for person_id, _ in suggested_talent(bounty)]
+        people = Person.objects.select_related("user").in_bulk(ranked)
+        data["suggested_talent"] = [people[person_id] for person_id in ranked if person_id in people]
 
-        context["show_actions"] = any([
-            context["can_be_claimed"],
-            context["can_be_modified"],
-            context["created_bounty_claim_request"]
+        data["show_actions"] = any([
+            data["can_be_claimed"],
+            data["can_be_modified"],
+            data["created_bounty_claim_request"]
         ])
 
+        context["data"] = data
         return context
 
 class CreateBountyView(LoginRequiredMixin, utils.BaseProductDetailView, CreateView):
@@ -135,10 +157,12 @@ class CreateBountyView(LoginRequiredMixin, utils.BaseProductDetailView, CreateVi
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["challenge"] = Challenge.objects.get(pk=self.kwargs.get("challenge_id"))
-        context["skills"] = [serialize_skills(skill) for skill in Skill.get_roots()]
+        context["skills"] = get_taxonomy().skill_tree()
         context["empty_form"] = PersonSkillFormSet().empty_form
         return context
 
+    # An open bounty is announced when this commits, with its skills
+    @transaction.atomic
     def form_valid(self, form):
         form.instance.challenge = Challenge.objects.get(pk=self.kwargs.get("challenge_id"))
         form.instance.skill = Skill.objects.get(id=form.cleaned_data.get("skill"))
@@ -160,7 +184,7 @@ class UpdateBountyView(LoginRequiredMixin, utils.BaseProductDetailView, UpdateVi
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["challenge"] = self.object.challenge
-        context["skills"] = [serialize_skills(skill) for skill in Skill.get_roots()]
+        context["skills"] = get_taxonomy().skill_tree()
         context["empty_form"] = PersonSkillFormSet().empty_form
         return context
 
@@ -212,15 +236,18 @@ def bounty_claim_actions(request, pk):
     action_type = request.GET.get("action")
     
     if action_type == "accept":
-        instance.status = BountyClaim.Status.GRANTED
-        BountyClaim.objects.filter(bounty__challenge=instance.bounty.challenge).exclude(pk=pk).update(status=BountyClaim.Status.REJECTED)
+        instance.status = BountyClaim.Status.ACTIVE
+        # updated_at moves too, so the next incremental points run sees the failed claims
+        BountyClaim.objects.filter(bounty__challenge=instance.bounty.challenge).exclude(pk=pk).update(
+            status=BountyClaim.Status.FAILED, updated_at=timezone.now()
+        )
     elif action_type == "reject":
-        instance.status = BountyClaim.Status.REJECTED
+        instance.status = BountyClaim.Status.FAILED
     else:
         return JsonResponse({"error": "Invalid action"}, status=400)
 
     instance.save()
-    return redirect(reverse("dashboard-product-bounties", args=(instance.bounty.challenge.product.slug,)))
+    return redirect(reverse("portal-product-bounties", args=(instance.bounty.challenge.product.slug,)))
 
 class DeleteBountyClaimView(LoginRequiredMixin, DeleteView):
     model = BountyClaim
@@ -9,14 +9,16 @@ from django.db.models import Sum, Case, When, Value, IntegerField
 from ..models import Challenge, Product, Initiative, Bounty
 from ..forms import ChallengeForm
 from .. import utils
+from apps.common.mixins import CursorPaginationMixin
 from apps.talent.forms import PersonSkillFormSet
 from apps.talent.models import BountyClaim
 from apps.security.models import ProductRoleAssignment
 
-class ChallengeListView(ListView):
+class ChallengeListView(CursorPaginationMixin, ListView):
     model = Challenge
     context_object_name = "challenges"
     template_name = "product_management/challenges.html"
+    items_template_name = "product_management/partials/challenge_list_items.html"
     paginate_by = 10
 
     def get_queryset(self):
@@ -33,7 +35,7 @@ class ProductChallengesView(utils.BaseProductDetailView, ListView):
     context_object_name = "challenges"
 
     def get_queryset(self):
-        product = self.get_context_data()["product"]
+        product = self.get_product()
         return Challenge.objects.filter(product=product).annotate(
             custom_order=Case(
                 When(status=Challenge.ChallengeStatus.ACTIVE, then=Value(0)),
@@ -61,7 +63,7 @@ class ChallengeDetailView(utils.BaseProductDetailView, DetailView):
         user = self.request.user
 
         context["BountyStatus"] = Bounty.BountyStatus
-        context["bounties"] = challenge.bounty_set.all()
+        context["bounties"] = challenge.bounties.all()
         context["total_reward"] = challenge.get_total_reward()
         context["does_have_permission"] = utils.has_product_modify_permission(user, context.get("product"))
 
@@ -4,13 +4,21 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import redirect, get_object_or_404
 from django.urls import reverse
 from django.http import HttpResponse
-from django.db.models import Count
+from django.db import transaction
 
 
 from ..models import Idea, Bug, Product, IdeaVote
 from ..forms import IdeaForm, BugForm
 from .. import utils
 
+def get_ideas_with_votes(product, user):
+    person = user.person if user.is_authenticated else None
+    return [
+        {"idea_obj": idea, "num_votes": idea.vote_count, "user_has_voted": idea.user_has_voted}
+        for idea in Idea.get_ranked_ideas(product, person)
+    ]
+
+
 class ProductIdeasAndBugsView(utils.BaseProductDetailView, TemplateView):
     template_name = "product_management/product_ideas_and_bugs.html"
 
@@ -18,31 +26,9 @@ class ProductIdeasAndBugsView(utils.BaseProductDetailView, TemplateView):
         context = super().get_context_data(**kwargs)
         product = context["product"]
 
-        ideas_with_votes = []
-        user = self.request.user
-
-        if user.is_authenticated:
-            for idea in Idea.objects.filter(product=product):
-                num_votes = IdeaVote.objects.filter(idea=idea).count()
-                user_has_voted = IdeaVote.objects.filter(voter=user, idea=idea).exists()
-                ideas_with_votes.append(
-                    {
-                        "idea_obj": idea,
-                        "num_votes": num_votes,
-                        "user_has_voted": user_has_voted,
-                    }
-                )
-        else:
-            for idea in Idea.objects.filter(product=product):
-                ideas_with_votes.append(
-                    {
-                        "idea_obj": idea,
-                    }
-                )
-
         context.update(
             {
-                "ideas": ideas_with_votes,
+                "ideas": get_ideas_with_votes(product, self.request.user),
                 "bugs": Bug.objects.filter(product=product),
             }
         )
@@ -55,8 +41,8 @@ class ProductIdeaListView(utils.BaseProductDetailView, ListView):
     context_object_name = "ideas"
 
     def get_queryset(self):
-        product = self.get_context_data().get("product")
-        return self.model.objects.filter(product=product).annotate(vote_count=Count('ideavote'))
+        product = self.get_product()
+        return get_ideas_with_votes(product, self.request.user)
 
 class ProductBugListView(utils.BaseProductDetailView, ListView):
     model = Bug
@@ -64,8 +50,8 @@ class ProductBugListView(utils.BaseProductDetailView, ListView):
     context_object_name = "bugs"
 
     def get_queryset(self):
-        product = self.get_context_data().get("product")
-        return self.model.objects.filter(product=product)
+        product = self.get_product()
+        return self.model.objects.filter(product=product).select_related("person")
 
 class CreateProductIdea(LoginRequiredMixin, utils.BaseProductDetailView, CreateView):
     template_name = "product_management/add_product_idea.html"
@@ -100,9 +86,11 @@ class ProductIdeaDetail(utils.BaseProductDetailView, DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["vote_count"] = IdeaVote.objects.filter(idea=self.object).count()
+        context["vote_count"] = self.object.vote_count
         if self.request.user.is_authenticated:
-            context["user_has_voted"] = IdeaVote.objects.filter(voter=self.request.user, idea=self.object).exists()
+            context["user_has_voted"] = IdeaVote.objects.filter(
+                voter=self.request.user.person, idea=self.object
+            ).exists()
         return context
 
 class CreateProductBug(LoginRequiredMixin, utils.BaseProductDetailView, CreateView):
@@ -144,12 +132,13 @@ class UpdateProductBug(LoginRequiredMixin, utils.BaseProductDetailView, UpdateVi
 def cast_vote_for_idea(request, pk):
     if not request.user.is_authenticated:
         return HttpResponse("You must be logged in to vote.", status=403)
-    
+
     idea = get_object_or_404(Idea, pk=pk)
-    vote, created = IdeaVote.objects.get_or_create(idea=idea, voter=request.user)
-    
-    if not created:
-        vote.delete()
-    
-    vote_count = IdeaVote.objects.filter(idea=idea).count()
-    return HttpResponse(vote_count)
\ No newline at end of file
+    # The receivers on IdeaVote move Idea.vote_count with F() in the same transaction
+    with transaction.atomic():
+        vote, created = IdeaVote.objects.get_or_create(idea=idea, voter=request.user.person)
+        if not created:
+            vote.delete()
+
+    idea.refresh_from_db(fields=["vote_count"])
+    return HttpResponse(idea.vote_count)
@@ -1,7 +1,7 @@
 from django.views.generic import ListView, DetailView, CreateView, UpdateView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse
-from django.db.models import Sum, Q
+from django.db.models import Sum
 
 from ..models import Initiative, Product, Challenge, Bounty
 from ..forms import InitiativeForm
@@ -21,13 +21,9 @@ class ProductInitiativesView(utils.BaseProductDetailView, ListView):
     context_object_name = "initiatives"
 
     def get_queryset(self):
-        product = self.get_context_data()['product']
+        product = self.get_product()
         return Initiative.objects.filter(product=product).annotate(
-            total_points=Sum(
-                'challenge__bounty__reward_amount',
-                filter=Q(challenge__bounty__status=Bounty.BountyStatus.AVAILABLE) &
-                      Q(challenge__bounty__reward_type=Bounty.RewardType.POINTS)
-            )
+            total_points=Sum('challenge__stats__open_reward_in_points')
         )
 
 class InitiativeDetailView(utils.BaseProductDetailView, DetailView):
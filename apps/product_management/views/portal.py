@@ -1,26 +1,36 @@
 from django.views.generic import TemplateView, ListView, DetailView, CreateView, UpdateView
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import BadRequest
 from django.shortcuts import HttpResponse, HttpResponseRedirect, get_object_or_404, redirect, render
 from django.urls import reverse, reverse_lazy
 from django.db.models import Q
+from django.utils import timezone
 
 from ..models import Product, Challenge, Bounty, ProductContributorAgreementTemplate
 from ..forms import ProductRoleAssignmentForm, ContributorAgreementTemplateForm
 from .. import utils
+from ..portal import PortalData
 from apps.talent.models import Person, BountyDeliveryAttempt, BountyClaim
 from apps.common.mixins import PersonSearchMixin
 from apps.security.models import ProductRoleAssignment
 from apps.common import mixins as common_mixins
 
-class PortalBaseView(LoginRequiredMixin):
+class PortalDataMixin:
+    @property
+    def portal(self):
+        return PortalData.for_request(self.request)
+
+    def get_product(self):
+        return self.portal.get_product(self.kwargs.get("product_slug"))
+
+class PortalBaseView(LoginRequiredMixin, PortalDataMixin):
     login_url = "sign_in"
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        person = self.request.user.person
+        person = self.portal.person
         photo_url = person.get_photo_url()
-        product_queryset = Product.objects.filter(person = person)
-        context.update({"person": person, "photo_url": photo_url, "products": product_queryset})
+        context.update({"person": person, "photo_url": photo_url, "products": self.portal.owned_products()})
         return context
 
 class PortalDashboardView(PortalBaseView, TemplateView):
@@ -31,18 +41,14 @@ class PortalDashboardView(PortalBaseView, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        person = context.get("person")
-        active_bounty_claims = BountyClaim.objects.filter(person=person, status=BountyClaim.Status.GRANTED)
-        product_roles_queryset = ProductRoleAssignment.objects.filter(person=person).exclude(
-            role=ProductRoleAssignment.ProductRoles.CONTRIBUTOR
-        )
-        product_ids = product_roles_queryset.values_list("product_id", flat=True)
-        products = Product.objects.filter(id__in=product_ids)
-        context.update({"active_bounty_claims": active_bounty_claims, "products": products})
+        context.update({
+            "active_bounty_claims": self.portal.active_bounty_claims(),
+            "products": self.portal.managed_products(),
+            "recommended_bounties": self.portal.recommended_bounties(),
+        })
 
-        slug = self.kwargs.get("product_slug", "")
-        if Product.objects.filter(slug=slug).exists():
-            context["product"] = Product.objects.get(slug=slug)
+        if product := self.portal.find_product(self.kwargs.get("product_slug")):
+            context["product"] = product
 
         context["default_tab"] = self.kwargs.get("default_tab", 0)
         return context
@@ -52,12 +58,7 @@ class ManageBountiesView(PortalBaseView, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        person = self.request.user.person
-        queryset = BountyClaim.objects.filter(
-            person=person,
-            status__in=[BountyClaim.Status.GRANTED, BountyClaim.Status.REQUESTED],
-        )
-        context.update({"bounty_claims": queryset})
+        context.update({"bounty_claims": self.portal.active_bounty_claims()})
         return context
 
 class ManageUsersView(PortalBaseView, TemplateView):
@@ -65,11 +66,9 @@ class ManageUsersView(PortalBaseView, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        slug = self.kwargs.get("product_slug")
-        product = Product.objects.get(slug=slug)
-        product_users = ProductRoleAssignment.objects.filter(product=product).order_by("-role")
+        product = self.get_product()
         context["product"] = product
-        context["product_users"] = product_users
+        context["product_users"] = self.portal.product_users(product)
         return context
 
 class AddProductUserView(PortalBaseView, PersonSearchMixin, CreateView):
@@ -79,24 +78,21 @@ class AddProductUserView(PortalBaseView, PersonSearchMixin, CreateView):
 
     def get_form_kwargs(self, *args, **kwargs):
         kwargs = super().get_form_kwargs(*args, **kwargs)
-        if product_slug := self.kwargs.get("product_slug", None):
-            kwargs.update(initial={"product": Product.objects.get(slug=product_slug)})
+        if self.kwargs.get("product_slug", None):
+            kwargs.update(initial={"product": self.get_product()})
         return kwargs
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         if context["search_result"]:
             return context
-        slug = self.kwargs.get("product_slug")
-        product = Product.objects.get(slug=slug)
-        product_users = ProductRoleAssignment.objects.filter(product=product).order_by("-role")
+        product = self.get_product()
         context["product"] = product
-        context["product_users"] = product_users
+        context["product_users"] = self.portal.product_users(product)
         return context
 
     def form_valid(self, form):
-        product = Product.objects.get(slug=self.kwargs.get("product_slug"))
-        form.instance.product = product
+        form.instance.product = self.get_product()
         return super().form_valid(form)
 
     def get_success_url(self):
@@ -112,11 +108,9 @@ class UpdateProductUserView(PortalBaseView, PersonSearchMixin, UpdateView):
         context = super().get_context_data(**kwargs)
         if context["search_result"]:
             return context
-        slug = self.kwargs.get("product_slug")
-        product = Product.objects.get(slug=slug)
-        product_users = ProductRoleAssignment.objects.filter(product=product).order_by("-role")
+        product = self.get_product()
         context["product"] = product
-        context["product_users"] = product_users
+        context["product_users"] = self.portal.product_users(product)
         return context
 
     def get_success_url(self):
@@ -138,17 +132,13 @@ class PortalProductDetailView(PortalBaseView, DetailView):
         })
         return context
 
-class BountyClaimRequestsView(LoginRequiredMixin, ListView):
+class BountyClaimRequestsView(LoginRequiredMixin, PortalDataMixin, ListView):
     model = BountyClaim
     context_object_name = "bounty_claims"
     template_name = "product_management/portal/bounty_claim_requests.html"
 
     def get_queryset(self):
-        person = self.request.user.person
-        return BountyClaim.objects.filter(
-            person=person,
-            status__in=[BountyClaim.Status.GRANTED, BountyClaim.Status.REQUESTED],
-        )
+        return self.portal.active_bounty_claims()
 
 class ReviewWorkView(LoginRequiredMixin, ListView):
     model = BountyDeliveryAttempt
@@ -156,7 +146,7 @@ class ReviewWorkView(LoginRequiredMixin, ListView):
     queryset = BountyDeliveryAttempt.objects.filter(status=BountyDeliveryAttempt.BountyDeliveryStatus.NEW)
     template_name = "product_management/portal/review_work.html"
 
-class ContributorAgreementTemplateListView(LoginRequiredMixin, ListView):
+class ContributorAgreementTemplateListView(LoginRequiredMixin, PortalDataMixin, ListView):
     model = ProductContributorAgreementTemplate
     context_object_name = "contributor_agreement_templates"
     template_name = "product_management/portal/contributor_agreement_templates.html"
@@ -167,19 +157,18 @@ class ContributorAgreementTemplateListView(LoginRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        slug = self.kwargs.get("product_slug")
-        context.update({"product": Product.objects.get(slug=slug)})
+        context.update({"product": self.get_product()})
         return context
 
-class CreateContributorAgreementTemplateView(LoginRequiredMixin, CreateView):
+class CreateContributorAgreementTemplateView(LoginRequiredMixin, PortalDataMixin, CreateView):
     model = ProductContributorAgreementTemplate
     form_class = ContributorAgreementTemplateForm
     template_name = "product_management/portal/create_contributor_agreement_template.html"
 
     def get_form_kwargs(self, *args, **kwargs):
         kwargs = super().get_form_kwargs(*args, **kwargs)
-        if product_slug := self.kwargs.get("product_slug", None):
-            kwargs.update(initial={"product": Product.objects.get(slug=product_slug)})
+        if self.kwargs.get("product_slug", None):
+            kwargs.update(initial={"product": self.get_product()})
         return kwargs
 
     def form_valid(self, form):
@@ -192,22 +181,21 @@ class CreateContributorAgreementTemplateView(LoginRequiredMixin, CreateView):
             args=(self.object.product.slug, self.object.id),
         )
 
-class ContributorAgreementTemplateView(DetailView):
+class ContributorAgreementTemplateView(PortalDataMixin, DetailView):
     model = ProductContributorAgreementTemplate
     template_name = "product_management/portal/contributor_agreement_template_detail.html"
     context_object_name = "contributor_agreement_template"
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        slug = self.kwargs.get("product_slug")
         context.update({
-            "product": Product.objects.get(slug=slug),
+            "product": self.get_product(),
             "pk": self.object.pk,
         })
         return context
 
 # Views moved from challenges.py
-class DashboardProductChallengesView(LoginRequiredMixin, ListView):
+class DashboardProductChallengesView(LoginRequiredMixin, PortalDataMixin, ListView):
     model = Challenge
     context_object_name = "challenges"
     template_name = "product_management/dashboard/manage_challenges.html"
@@ -218,16 +206,15 @@ class DashboardProductChallengesView(LoginRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["product"] = get_object_or_404(Product, slug=self.kwargs.get("product_slug"))
+        context["product"] = self.get_product()
         return context
 
-class DashboardProductChallengeFilterView(LoginRequiredMixin, ListView):
+class DashboardProductChallengeFilterView(LoginRequiredMixin, PortalDataMixin, ListView):
     template_name = "product_management/dashboard/challenge_table.html"
     context_object_name = "challenges"
 
     def get_queryset(self):
-        product = get_object_or_404(Product, slug=self.kwargs.get("product_slug"))
-        queryset = Challenge.objects.filter(product=product)
+        queryset = Challenge.objects.filter(product=self.get_product())
 
         sort_param = self.request.GET.get("q", "")
         if "sort:created-asc" in sort_param:
@@ -243,10 +230,10 @@ class DashboardProductChallengeFilterView(LoginRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["product"] = get_object_or_404(Product, slug=self.kwargs.get("product_slug"))
+        context["product"] = self.get_product()
         return context
     
-class ProductChallengesManagementView(LoginRequiredMixin, ListView):
+class ProductChallengesManagementView(LoginRequiredMixin, PortalDataMixin, ListView):
     model = Challenge
     context_object_name = "challenges"
     template_name = "product_management/portal/manage_challenges.html"
@@ -257,16 +244,15 @@ class ProductChallengesManagementView(LoginRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["product"] = get_object_or_404(Product, slug=self.kwargs.get("product_slug"))
+        context["product"] = self.get_product()
         return context
 
-class ProductChallengeFilterView(LoginRequiredMixin, ListView):
+class ProductChallengeFilterView(LoginRequiredMixin, PortalDataMixin, ListView):
     template_name = "product_management/portal/challenge_table.html"
     context_object_name = "challenges"
 
     def get_queryset(self):
-        product = get_object_or_404(Product, slug=self.kwargs.get("product_slug"))
-        queryset = Challenge.objects.filter(product=product)
+        queryset = Challenge.objects.filter(product=self.get_product())
 
         sort_param = self.request.GET.get("q", "")
         if "sort:created-asc" in sort_param:
@@ -282,11 +268,11 @@ class ProductChallengeFilterView(LoginRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["product"] = get_object_or_404(Product, slug=self.kwargs.get("product_slug"))
+        context["product"] = self.get_product()
         return context
 
 
-class DashboardProductBountiesView(LoginRequiredMixin, ListView):
+class DashboardProductBountiesView(LoginRequiredMixin, PortalDataMixin, ListView):
     model = Bounty
     context_object_name = "bounty_claims"
     template_name = "product_management/dashboard/manage_bounties.html"
@@ -294,46 +280,45 @@ class DashboardProductBountiesView(LoginRequiredMixin, ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data()
 
-        slug = self.kwargs.get("product_slug")
-        context.update({"product": Product.objects.get(slug=slug)})
+        context.update({"product": self.get_product()})
         return context
 
     def get_queryset(self):
-        product_slug = self.kwargs.get("product_slug")
-        product = Product.objects.get(slug=product_slug)
         return BountyClaim.objects.filter(
-            bounty__challenge__product=product,
+            bounty__challenge__product=self.get_product(),
             status=BountyClaim.Status.REQUESTED,
         )
 
 def bounty_claim_actions(request, pk):
-    instance = BountyClaim.objects.get(pk=pk)
+    instance = get_object_or_404(BountyClaim, pk=pk)
     action_type = request.GET.get("action")
     if action_type == "accept":
-        instance.status = BountyClaim.Status.GRANTED
+        instance.status = BountyClaim.Status.ACTIVE
 
         # If one claim is accepted for a particular challenge, the other claims automatically fails.
         challenge = instance.bounty.challenge
-        _ = BountyClaim.objects.filter(bounty__challenge=challenge).update(status=BountyClaim.Status.REJECTED)
+        # updated_at moves too, so the next incremental points run sees the failed claims
+        _ = BountyClaim.objects.filter(bounty__challenge=challenge).exclude(pk=pk).update(
+            status=BountyClaim.Status.FAILED, updated_at=timezone.now()
+        )
     elif action_type == "reject":
-        instance.status = BountyClaim.Status.REJECTED
+        instance.status = BountyClaim.Status.FAILED
     else:
         raise BadRequest()
 
     instance.save()
 
-    return redirect(reverse("dashboard-product-bounties", args=(instance.bounty.challenge.product.slug,)))
+    return redirect(reverse("portal-product-bounties", args=(instance.bounty.challenge.product.slug,)))
 
 
-class DashboardProductBountyFilterView(LoginRequiredMixin, TemplateView):
+class DashboardProductBountyFilterView(LoginRequiredMixin, PortalDataMixin, TemplateView):
     template_name = "product_management/dashboard/bounty_table.html"
     login_url = "sign_in"
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data()
 
-        slug = self.kwargs.get("product_slug")
-        context.update({"product": Product.objects.get(slug=slug)})
+        context.update({"product": self.get_product()})
         return context
 
     def get(self, request, *args, **kwargs):
@@ -8,6 +8,7 @@ from django.http import JsonResponse
 from ..models import ProductArea, Product, Challenge
 from ..forms import ProductAreaForm
 from .. import utils
+from ..tree import serialize_product_tree, serialize_tree
 
 class ProductTreeInteractiveView(utils.BaseProductDetailView):
     template_name = "product_management/product_tree.html"
@@ -19,11 +20,7 @@ class ProductTreeInteractiveView(utils.BaseProductDetailView):
         context["can_modify_product"] = utils.has_product_modify_permission(self.request.user, product)
         
         product_tree = product.product_trees.first()
-        if product_tree:
-            product_areas = ProductArea.get_root_nodes().filter(product_tree=product_tree)
-            context["tree_data"] = [utils.serialize_tree(node) for node in product_areas]
-        else:
-            context["tree_data"] = []
+        context["tree_data"] = serialize_product_tree(product_tree) if product_tree else []
         
         return context
 
@@ -59,7 +56,7 @@ class ProductAreaCreateView(utils.BaseProductDetailView, CreateView):
             new_node = ProductArea.add_root(**form.cleaned_data)
 
         context["product_area"] = new_node
-        context["node"] = [utils.serialize_tree(new_node)]
+        context["node"] = [serialize_tree(new_node)]
         context["depth"] = int(self.request.POST.get("depth", 0))
         return render(self.request, self.get_template_names(), context)
 
@@ -114,7 +111,7 @@ class ProductAreaDetailView(utils.BaseProductDetailView, DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["children"] = utils.serialize_tree(self.get_object())["children"]
+        context["children"] = serialize_tree(self.get_object())["children"]
         context["challenges"] = Challenge.objects.filter(product_area=self.object)
         return context
 
@@ -5,19 +5,23 @@ from django.urls import reverse, reverse_lazy
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
 
-from ..models import Product, Challenge, ProductArea, Initiative, Idea, Bug, Bounty
+from ..models import Product, Challenge, Initiative, Bug
 from ..forms import ProductForm, OrganisationForm
 from .. import utils
+from ..tree import serialize_product_tree
+from .ideas_bugs import get_ideas_with_votes
 from apps.commerce.models import Organisation
 from apps.security.models import ProductRoleAssignment
 from apps.common import mixins as common_mixins
 
-class ProductListView(ListView):
+class ProductListView(common_mixins.CursorPaginationMixin, ListView):
     model = Product
     context_object_name = "products"
-    queryset = Product.objects.filter(is_private=False).order_by("created_at")
+    queryset = Product.objects.filter(is_private=False).select_related("stats")
     template_name = "product_management/products.html"
+    items_template_name = "product_management/partials/product_list_items.html"
     paginate_by = 8
+    cursor_descending = False
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -41,11 +45,7 @@ class ProductSummaryView(utils.BaseProductDetailView, TemplateView):
         context["point_balance"] = product.point_balance
 
         product_tree = product.product_trees.first()
-        if product_tree:
-            product_areas = ProductArea.get_root_nodes().filter(product_tree=product_tree)
-            context["tree_data"] = [utils.serialize_tree(node) for node in product_areas]
-        else:
-            context["tree_data"] = []
+        context["tree_data"] = serialize_product_tree(product_tree) if product_tree else []
 
         return context
 
@@ -123,23 +123,9 @@ class ProductIdeasAndBugsView(utils.BaseProductDetailView, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         product = context["product"]
-        user = self.request.user
-
-        ideas = Idea.objects.filter(product=product)
-        if user.is_authenticated:
-            ideas_with_votes = [
-                {
-                    "idea_obj": idea,
-                    "num_votes": idea.ideavote_set.count(),
-                    "user_has_voted": idea.ideavote_set.filter(voter=user).exists(),
-                }
-                for idea in ideas
-            ]
-        else:
-            ideas_with_votes = [{"idea_obj": idea} for idea in ideas]
 
         context.update({
-            "ideas": ideas_with_votes,
+            "ideas": get_ideas_with_votes(product, self.request.user),
             "bugs": Bug.objects.filter(product=product),
         })
 
@@ -155,11 +141,7 @@ class ProductTreeInteractiveView(utils.BaseProductDetailView, TemplateView):
         context["can_modify_product"] = utils.has_product_modify_permission(self.request.user, product)
         
         product_tree = product.product_trees.first()
-        if product_tree:
-            product_areas = ProductArea.get_root_nodes().filter(product_tree=product_tree)
-            context["tree_data"] = [utils.serialize_tree(node) for node in product_areas]
-        else:
-            context["tree_data"] = []
+        context["tree_data"] = serialize_product_tree(product_tree) if product_tree else []
         
         return context
 
@@ -169,11 +151,7 @@ class ProductInitiativesView(utils.BaseProductDetailView, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         initiatives = Initiative.objects.filter(product=context["product"]).annotate(
-            total_points=models.Sum(
-                "challenge__bounty__reward_amount",
-                filter=models.Q(challenge__bounty__status=Bounty.BountyStatus.AVAILABLE)
-                & models.Q(challenge__bounty__reward_type=Bounty.RewardType.POINTS),
-            )
+            total_points=models.Sum("challenge__stats__open_reward_in_points")
         )
         context["initiatives"] = initiatives
         return context
@@ -215,7 +193,7 @@ class ProductRoleAssignmentView(utils.BaseProductDetailView, TemplateView):
 
         context.update(
             {
-                "product_people": ProductRoleAssignment.objects.filter(product=product),
+                "product_people": ProductRoleAssignment.objects.filter(product=product).select_related("person"),
             }
         )
 
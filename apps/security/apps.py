@@ -1,26 +1,20 @@
-from django.apps import AppConfig
-from django.db.models.signals import post_migrate
+from django.apps import AppConfig, apps
+from django.db.models.signals import post_delete, post_init, post_save
+
 
 class SecurityConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.security'
 
     def ready(self):
-        post_migrate.connect(self.post_migrate_handler, sender=self)
+        from . import signals  # noqa: F401
+        from .audit import post_delete_receiver, post_init_receiver, post_save_receiver, should_audit_model
+
+        # A single receiver for all senders; the AUDIT_MODELS allow list is checked per event.
+        post_save.connect(post_save_receiver, dispatch_uid="security_audit_post_save")
+        post_delete.connect(post_delete_receiver, dispatch_uid="security_audit_post_delete")
 
-    def post_migrate_handler(self, sender, **kwargs):
-        from django.db.models.signals import post_save, post_delete
-        from .signals import log_change, should_audit_model
-        
-        for model in self.apps.get_models():
+        # Field snapshots for diffs are only taken for audited models since post_init runs for every loaded row.
+        for model in apps.get_models():
             if should_audit_model(model):
-                post_save.connect(
-                    lambda sender, instance, created, **kwargs: log_change(sender, instance, created),
-                    sender=model
-                )
-                post_delete.connect(
-                    lambda sender, instance, **kwargs: log_change(sender, instance, deleted=True),
-                    sender=model
-                )
-        
-        print("AuditEvent signals connected successfully.")
\ No newline at end of file
+                post_init.connect(post_init_receiver, sender=model, dispatch_uid=f"security_audit_{model._meta.label}")
@@ -0,0 +1,236 @@
+"""
+Buffered audit trail.
+
+Audited instances keep a snapshot of their field values from when they were loaded (the same pattern as
+``model_utils.FieldTracker``), so an event only records the fields that changed as ``{field: [old, new]}``.
+Saves that change nothing are not recorded.
+
+Model saves and deletes are turned into unsaved ``AuditEvent`` objects at signal time. Nothing is written inside
+the caller's transaction: each event is handed over with ``transaction.on_commit`` (so rolled back work is never
+audited) and collected in the active ``AuditBatch``. A batch is opened per request by ``AuditMiddleware`` or
+explicitly with ``audit_batch()`` and is flushed with a single ``bulk_create``, or handed to Celery when
+``AUDIT_ASYNC`` is enabled. Events recorded outside of a batch are written individually once their transaction
+commits.
+"""
+import copy
+import json
+import logging
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import router, transaction
+from django.utils import timezone
+
+from apps.common.fields import generate_ids
+
+logger = logging.getLogger(__name__)
+
+EXCLUDED_APP_LABELS = ("contenttypes", "auth", "sessions", "admin")
+
+_current_batch = ContextVar("audit_batch", default=None)
+_content_type_ids = {}
+
+
+def get_content_type_id(model):
+    """Content type ids never change for a running process, so they are looked up once per model."""
+    label = model._meta.label
+    if label not in _content_type_ids:
+        _content_type_ids[label] = ContentType.objects.get_for_model(model).id
+    return _content_type_ids[label]
+
+
+def should_audit_model(model):
+    """
+    A model is audited when it belongs to an app listed in ``AUDIT_MODELS`` or is listed there by its
+    ``app_label.ModelName`` label. The audit table itself and Django's bookkeeping apps are never audited.
+    """
+    opts = model._meta
+    if opts.app_label in EXCLUDED_APP_LABELS or opts.label == "security.AuditEvent":
+        return False
+    allowed = getattr(settings, "AUDIT_MODELS", ())
+    return opts.app_label in allowed or opts.label in allowed
+
+
+class AuditJSONEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        try:
+            return super().default(o)
+        except TypeError:
+            return str(o)
+
+
+def get_field_values(instance):
+    # attname is used so foreign keys are recorded by id without fetching the related object,
+    # and deferred fields are left out so reading them doesn't trigger a query
+    loaded = instance.__dict__
+    return {
+        field.attname: loaded[field.attname]
+        for field in instance._meta.concrete_fields
+        if field.attname in loaded
+    }
+
+
+def take_snapshot(instance):
+    instance._audit_snapshot = {
+        name: copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+        for name, value in get_field_values(instance).items()
+    }
+
+
+def get_changes(instance, action, update_fields=None):
+    if action == "DELETE":
+        return None
+
+    current = get_field_values(instance)
+    if update_fields is not None:
+        attnames = {instance._meta.get_field(name).attname for name in update_fields}
+        current = {name: value for name, value in current.items() if name in attnames}
+
+    if action == "CREATE":
+        changes = {name: [None, value] for name, value in current.items() if value not in (None, "")}
+    else:
+        previous = getattr(instance, "_audit_snapshot", {})
+        changes = {
+            name: [previous.get(name), value]
+            for name, value in current.items()
+            if name not in previous or previous[name] != value
+        }
+    # Normalise to plain JSON now so later mutations of the instance don't leak into the event
+    return json.loads(json.dumps(changes, cls=AuditJSONEncoder))
+
+
+class AuditBatch:
+    def __init__(self, user=None):
+        self.user = user
+        self.events = []
+        self.closed = False
+
+    def add(self, event):
+        if self.closed:
+            write_events([event])
+            return
+        if event.user_id is None and self.user is not None and self.user.is_authenticated:
+            event.user_id = self.user.pk
+        self.events.append(event)
+
+    def flush(self):
+        events, self.events = self.events, []
+        if events:
+            write_events(events)
+
+
+class audit_batch(ContextDecorator):
+    """
+    Collects the audit events of every transaction committed inside the block and writes them in one go when
+    the block exits. Nested blocks share the outermost batch.
+    """
+
+    def __init__(self, user=None):
+        self.user = user
+
+    def __enter__(self):
+        self.batch = _current_batch.get()
+        self.token = None
+        if self.batch is None:
+            self.batch = AuditBatch(self.user)
+            self.token = _current_batch.set(self.batch)
+        return self.batch
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.token is None:
+            return
+        _current_batch.reset(self.token)
+        self.batch.closed = True
+        self.batch.flush()
+
+
+def build_event(model, instance, action, changes):
+    from .models import AuditEvent
+
+    return AuditEvent(
+        action=action,
+        content_type_id=get_content_type_id(model),
+        object_id=str(instance.pk),
+        changes=changes,
+        timestamp=timezone.now(),
+    )
+
+
+def record_event(sender, instance, action, update_fields=None):
+    if not should_audit_model(sender):
+        return
+
+    try:
+        changes = get_changes(instance, action, update_fields)
+        if action == "UPDATE" and not changes:
+            return
+        event = build_event(sender, instance, action, changes)
+    except Exception as e:
+        logger.error(f"Error building AuditEvent for {sender._meta.label}: {e}")
+        return
+
+    batch = _current_batch.get()
+    if batch is None:
+        callback = lambda: write_events([event])  # noqa: E731
+    else:
+        callback = lambda: batch.add(event)  # noqa: E731
+    transaction.on_commit(callback, using=router.db_for_write(sender))
+
+
+def write_events(events):
+    if getattr(settings, "AUDIT_ASYNC", False):
+        from .tasks import write_audit_events
+
+        write_audit_events.delay([serialize_event(event) for event in events])
+        return
+
+    from .models import AuditEvent
+
+    # One call for the whole batch instead of one per event in pre_save
+    missing_ids = [event for event in events if not event.id]
+    for event, event_id in zip(missing_ids, generate_ids(len(missing_ids))):
+        event.id = event_id
+    try:
+        AuditEvent.objects.bulk_create(events, batch_size=getattr(settings, "AUDIT_BATCH_SIZE", 500))
+    except Exception as e:
+        logger.error(f"Error writing {len(events)} AuditEvent entries: {e}")
+
+
+def serialize_event(event):
+    return {
+        "user_id": event.user_id,
+        "action": event.action,
+        "content_type_id": event.content_type_id,
+        "object_id": event.object_id,
+        "changes": event.changes,
+        "timestamp": event.timestamp.isoformat(),
+    }
+
+
+def post_init_receiver(sender, instance, **kwargs):
+    take_snapshot(instance)
+
+
+def post_save_receiver(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if not raw:
+        record_event(sender, instance, "CREATE" if created else "UPDATE", update_fields)
+    if hasattr(instance, "_audit_snapshot"):
+        take_snapshot(instance)
+
+
+def post_delete_receiver(sender, instance, **kwargs):
+    record_event(sender, instance, "DELETE")
+
+
+class AuditMiddleware:
+    """Opens an audit batch for the duration of the request. Must come after ``AuthenticationMiddleware``."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with audit_batch(getattr(request, "user", None)):
+            return self.get_response(request)
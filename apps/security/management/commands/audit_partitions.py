@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from apps.security.partitions import add_months, drop_partitions_before, ensure_partitions
+
+
+class Command(BaseCommand):
+    help = "Create upcoming monthly audit partitions and drop the ones past the retention period"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months-ahead", type=int, default=3, help="Number of future months to create")
+        parser.add_argument(
+            "--retention-months",
+            type=int,
+            default=getattr(settings, "AUDIT_RETENTION_MONTHS", None),
+            help="Drop partitions older than this many months (default: AUDIT_RETENTION_MONTHS, keep everything)",
+        )
+
+    def handle(self, *args, **options):
+        for name in ensure_partitions(connection, options["months_ahead"]):
+            self.stdout.write(f"Created {name}")
+
+        if options["retention_months"] is not None:
+            current = timezone.now().date().replace(day=1)
+            for name in drop_partitions_before(connection, add_months(current, -options["retention_months"])):
+                self.stdout.write(f"Dropped {name}")
+
+        self.stdout.write(self.style.SUCCESS("Audit partitions are up to date."))
@@ -0,0 +1,139 @@
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.product_management.models import Bounty, Challenge, Product
+from apps.security.audit import audit_batch
+from apps.security.models import AuditEvent
+from apps.talent.models import BountyBid, BountyClaim, Person
+
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE")
+
+
+def count_writes(queries):
+    writes = [q["sql"] for q in queries if q["sql"].lstrip().upper().startswith(WRITE_STATEMENTS)]
+    audit_writes = [sql for sql in writes if AuditEvent._meta.db_table in sql]
+    return len(writes), len(audit_writes)
+
+
+class BountyWorkflow:
+    """The requests a contributor and a product manager make to take a bounty from draft to completed."""
+
+    def steps(self):
+        return [
+            ("sign up", self.sign_up),
+            ("create product", self.create_product),
+            ("create challenge and bounty", self.create_bounty),
+            ("open bounty", self.open_bounty),
+            ("bid", self.bid),
+            ("accept bid", self.accept_bid),
+            ("claim", self.claim),
+            ("complete claim", self.complete_claim),
+        ]
+
+    def sign_up(self):
+        user = get_user_model().objects.create_user(username=f"bench-{uuid.uuid4().hex[:12]}", password="bench")
+        self.person = Person.objects.create(user=user, full_name="Benchmark Person")
+
+    def create_product(self):
+        slug = f"benchmark-{uuid.uuid4().hex[:12]}"
+        self.product = Product.objects.create(name=slug, slug=slug)
+
+    def create_bounty(self):
+        self.challenge = Challenge.objects.create(product=self.product, title="Benchmark challenge")
+        self.bounty = Bounty.objects.create(
+            product=self.product,
+            challenge=self.challenge,
+            title="Benchmark bounty",
+            reward_type="Points",
+            reward_in_points=100,
+        )
+
+    def open_bounty(self):
+        self.bounty.status = Bounty.BountyStatus.OPEN
+        self.bounty.save()
+
+    def bid(self):
+        self.bounty_bid = BountyBid.objects.create(
+            bounty=self.bounty,
+            person=self.person,
+            amount_in_points=100,
+            expected_finish_date=timezone.now().date(),
+        )
+
+    def accept_bid(self):
+        self.bounty_bid.status = BountyBid.Status.ACCEPTED
+        self.bounty_bid.save()
+        self.bounty.status = Bounty.BountyStatus.IN_PROGRESS
+        self.bounty.save()
+
+    def claim(self):
+        self.bounty_claim = BountyClaim.objects.create(
+            bounty=self.bounty, person=self.person, accepted_bid=self.bounty_bid
+        )
+
+    def complete_claim(self):
+        self.bounty_claim.status = BountyClaim.Status.COMPLETED
+        self.bounty_claim.save()
+
+
+class Command(BaseCommand):
+    help = "Count database writes per bounty workflow request with per-event and batched audit logging"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=5, help="Number of workflow runs per mode")
+
+    def run_step(self, step, batched):
+        # Each step stands for one request that commits at the end. The benchmark itself runs inside a
+        # transaction that is rolled back, so commit hooks are executed by hand to flush the audit events.
+        with CaptureQueriesContext(connection) as ctx:
+            if batched:
+                with audit_batch():
+                    with TestCase.captureOnCommitCallbacks(execute=True):
+                        step()
+            else:
+                with TestCase.captureOnCommitCallbacks(execute=True):
+                    step()
+        return count_writes(ctx.captured_queries)
+
+    def run(self, batched, iterations):
+        results = {}
+        for _ in range(iterations):
+            with transaction.atomic():
+                for name, step in BountyWorkflow().steps():
+                    start = time.perf_counter()
+                    writes, audit_writes = self.run_step(step, batched)
+                    totals = results.setdefault(name, [0, 0, 0.0])
+                    totals[0] += writes
+                    totals[1] += audit_writes
+                    totals[2] += time.perf_counter() - start
+                transaction.set_rollback(True)
+        return {name: [value / iterations for value in totals] for name, totals in results.items()}
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        before = self.run(batched=False, iterations=iterations)
+        after = self.run(batched=True, iterations=iterations)
+
+        self.stdout.write(
+            f"{'request':<30}{'writes before':>15}{'writes after':>15}{'audit before':>15}"
+            f"{'audit after':>15}{'ms before':>12}{'ms after':>12}"
+        )
+        total_before = total_after = 0
+        for name, (writes, audit_writes, elapsed) in before.items():
+            batched_writes, batched_audit_writes, batched_elapsed = after[name]
+            total_before += writes
+            total_after += batched_writes
+            self.stdout.write(
+                f"{name:<30}{writes:>15.1f}{batched_writes:>15.1f}{audit_writes:>15.1f}"
+                f"{batched_audit_writes:>15.1f}{elapsed * 1000:>12.2f}{batched_elapsed * 1000:>12.2f}"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Writes per workflow: {total_before:.1f} before, {total_after:.1f} after.")
+        )
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.1 on 2026-10-17 06:24
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("security", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="auditevent",
+            name="object_id",
+            field=models.CharField(max_length=64),
+        ),
+        migrations.AlterField(
+            model_name="auditevent",
+            name="timestamp",
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 5.1.1 on 2026-10-17 06:27
+
+from django.db import migrations, models
+
+from apps.security.partitions import ensure_partitions
+
+# Partitioned tables need the partition key in their primary key, so the table is recreated with
+# PRIMARY KEY (id, timestamp). Django only ever looks rows up by id, which stays unique. The content type
+# index is covered by auditevent_object_history and the varchar_pattern_ops indexes are not recreated.
+PARTITION_AUDIT_TABLE = """
+ALTER TABLE security_auditevent RENAME TO security_auditevent_old;
+ALTER TABLE security_auditevent_old RENAME CONSTRAINT security_auditevent_pkey TO security_auditevent_old_pkey;
+ALTER INDEX security_auditevent_user_id_33d11812 RENAME TO security_auditevent_old_user_id;
+ALTER TABLE security_auditevent_old
+    DROP CONSTRAINT security_auditevent_content_type_id_159eda73_fk_django_co,
+    DROP CONSTRAINT security_auditevent_user_id_33d11812_fk_security_user_id;
+
+CREATE TABLE security_auditevent (
+    id varchar(22) NOT NULL,
+    action varchar(6) NOT NULL,
+    "timestamp" timestamp with time zone NOT NULL,
+    object_id varchar(64) NOT NULL,
+    changes jsonb NULL,
+    content_type_id integer NOT NULL
+        CONSTRAINT security_auditevent_content_type_id_159eda73_fk_django_co
+        REFERENCES django_content_type (id) DEFERRABLE INITIALLY DEFERRED,
+    user_id varchar(22) NULL
+        CONSTRAINT security_auditevent_user_id_33d11812_fk_security_user_id
+        REFERENCES security_user (id) DEFERRABLE INITIALLY DEFERRED,
+    CONSTRAINT security_auditevent_pkey PRIMARY KEY (id, "timestamp")
+) PARTITION BY RANGE ("timestamp");
+CREATE TABLE security_auditevent_default PARTITION OF security_auditevent DEFAULT;
+CREATE INDEX auditevent_object_history ON security_auditevent (content_type_id, object_id, "timestamp");
+CREATE INDEX security_auditevent_user_id_33d11812 ON security_auditevent (user_id);
+
+INSERT INTO security_auditevent (id, action, "timestamp", object_id, changes, content_type_id, user_id)
+SELECT id, action, "timestamp", object_id, changes::jsonb, content_type_id, user_id FROM security_auditevent_old;
+DROP TABLE security_auditevent_old;
+"""
+
+UNPARTITION_AUDIT_TABLE = """
+ALTER TABLE security_auditevent RENAME TO security_auditevent_partitioned;
+ALTER TABLE security_auditevent_partitioned
+    RENAME CONSTRAINT security_auditevent_pkey TO security_auditevent_partitioned_pkey;
+ALTER INDEX security_auditevent_user_id_33d11812 RENAME TO security_auditevent_partitioned_user_id;
+ALTER TABLE security_auditevent_partitioned
+    DROP CONSTRAINT security_auditevent_content_type_id_159eda73_fk_django_co,
+    DROP CONSTRAINT security_auditevent_user_id_33d11812_fk_security_user_id;
+CREATE TABLE security_auditevent (
+    id varchar(22) NOT NULL CONSTRAINT security_auditevent_pkey PRIMARY KEY,
+    action varchar(6) NOT NULL,
+    "timestamp" timestamp with time zone NOT NULL,
+    object_id varchar(64) NOT NULL,
+    changes text NULL,
+    content_type_id integer NOT NULL,
+    user_id varchar(22) NULL
+);
+INSERT INTO security_auditevent (id, action, "timestamp", object_id, changes, content_type_id, user_id)
+SELECT id, action, "timestamp", object_id, changes::text, content_type_id, user_id FROM security_auditevent_partitioned;
+DROP TABLE security_auditevent_partitioned;
+ALTER TABLE security_auditevent
+    ADD CONSTRAINT security_auditevent_content_type_id_159eda73_fk_django_co
+        FOREIGN KEY (content_type_id) REFERENCES django_content_type (id) DEFERRABLE INITIALLY DEFERRED,
+    ADD CONSTRAINT security_auditevent_user_id_33d11812_fk_security_user_id
+        FOREIGN KEY (user_id) REFERENCES security_user (id) DEFERRABLE INITIALLY DEFERRED;
+CREATE INDEX security_auditevent_content_type_id_159eda73 ON security_auditevent (content_type_id);
+CREATE INDEX security_auditevent_user_id_33d11812 ON security_auditevent (user_id);
+CREATE INDEX security_auditevent_id_cd832e33_like ON security_auditevent (id varchar_pattern_ops);
+CREATE INDEX security_auditevent_user_id_33d11812_like ON security_auditevent (user_id varchar_pattern_ops);
+"""
+
+
+def create_partitions(apps, schema_editor):
+    ensure_partitions(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("security", "0003_auditevent_buffered"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(PARTITION_AUDIT_TABLE, reverse_sql=UNPARTITION_AUDIT_TABLE),
+                migrations.RunPython(create_partitions, migrations.RunPython.noop),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="auditevent",
+                    name="changes",
+                    field=models.JSONField(null=True),
+                ),
+                migrations.AddIndex(
+                    model_name="auditevent",
+                    index=models.Index(
+                        fields=["content_type", "object_id", "timestamp"], name="auditevent_object_history"
+                    ),
+                ),
+            ],
+        ),
+    ]
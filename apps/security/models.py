@@ -4,6 +4,7 @@ from django.contrib.auth.signals import user_logged_in, user_login_failed
 from django.db import models
 
 from django.dispatch import receiver
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from apps.common.mixins import TimeStampMixin
@@ -15,7 +16,7 @@ from .managers import UserManager
 from random import randrange
 from .utils import extract_device_info
 from django.contrib.auth import get_user_model
-from apps.common.fields import Base58UUIDv5Field
+from apps.common.fields import Base58UUIDv5Field, Base58UUIDv7Field
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
@@ -28,16 +29,22 @@ class AuditEvent(models.Model):
         ('DELETE', 'Delete'),
     )
 
-    id = Base58UUIDv5Field(primary_key=True)
+    id = Base58UUIDv7Field(primary_key=True)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
     action = models.CharField(max_length=6, choices=ACTION_CHOICES)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the change happens rather than when the buffered event is written
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
     
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
-    object_id = models.PositiveIntegerField()
+    object_id = models.CharField(max_length=64)  # Base58 primary keys are strings
     content_object = GenericForeignKey('content_type', 'object_id')
     
-    changes = models.TextField(null=True)  # Changed from JSONField to TextField
+    # Only the fields that changed, as {field: [old, new]}; empty for deletions
+    changes = models.JSONField(null=True)
+
+    class Meta:
+        # The table is partitioned by month on timestamp, see apps.security.partitions
+        indexes = [models.Index(fields=["content_type", "object_id", "timestamp"], name="auditevent_object_history")]
 
     def __str__(self):
         return f"{self.action} on {self.content_object} by {self.user or 'system'} at {self.timestamp}"
@@ -91,7 +98,7 @@ class SignUpRequest(TimeStampMixin):
 
 
 class SignInAttempt(TimeStampMixin):
-    id = Base58UUIDv5Field(primary_key=True)
+    id = Base58UUIDv7Field(primary_key=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     device_identifier = models.CharField(max_length=64, null=True, blank=True)
     successful = models.BooleanField(default=True)
@@ -0,0 +1,91 @@
+"""
+Monthly range partitions of the audit table.
+
+Rows land in ``security_auditevent_<yyyy>_<mm>``; anything outside the created months falls into the default
+partition and is moved out when its month's partition is created. Old months are removed by dropping their
+partition instead of deleting rows.
+"""
+from datetime import date
+
+from django.db import transaction
+from django.utils import timezone
+
+AUDIT_TABLE = "security_auditevent"
+DEFAULT_PARTITION = f"{AUDIT_TABLE}_default"
+
+
+def add_months(month, months):
+    years, month_index = divmod(month.month - 1 + months, 12)
+    return date(month.year + years, month_index + 1, 1)
+
+
+def partition_name(month):
+    return f"{AUDIT_TABLE}_{month:%Y_%m}"
+
+
+def get_partitions(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [AUDIT_TABLE],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def create_partition(connection, month):
+    """Creates the partition for ``month`` and moves its rows out of the default partition."""
+    name = partition_name(month)
+    if name in get_partitions(connection):
+        return False
+
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE "{name}" (LIKE "{AUDIT_TABLE}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM "{DEFAULT_PARTITION}" WHERE "timestamp" >= %s AND "timestamp" < %s RETURNING *
+            )
+            INSERT INTO "{name}" SELECT * FROM moved
+            """,
+            [start, end],
+        )
+        cursor.execute(
+            f"ALTER TABLE \"{AUDIT_TABLE}\" ATTACH PARTITION \"{name}\" FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+    return True
+
+
+def ensure_partitions(connection, months_ahead=3):
+    """
+    Creates partitions from the oldest month still in the default partition up to ``months_ahead`` months
+    after the current one. Returns the names of the partitions created.
+    """
+    current = timezone.now().date().replace(day=1)
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT MIN("timestamp") FROM "{DEFAULT_PARTITION}"')
+        oldest = cursor.fetchone()[0]
+
+    month = min(current, oldest.date().replace(day=1)) if oldest else current
+    created = []
+    while month <= add_months(current, months_ahead):
+        if create_partition(connection, month):
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+
+def drop_partitions_before(connection, month):
+    """Drops the monthly partitions that end on or before ``month``. Returns the names of the dropped partitions."""
+    cutoff = partition_name(month)
+    dropped = sorted(name for name in get_partitions(connection) if name != DEFAULT_PARTITION and name < cutoff)
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for name in dropped:
+            cursor.execute(f'DROP TABLE "{name}"')
+    return dropped
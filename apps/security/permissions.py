@@ -0,0 +1,154 @@
+"""
+Product and organisation role checks.
+
+A person's role assignments are loaded together (one query for product roles, one for organisation roles) and kept
+in the shared cache under a per-person key, which is deleted whenever one of their assignments changes. Within a
+request the loaded assignments are memoised by ``RoleAssignmentsMiddleware``, so a view, its templates and the model
+methods they call can check roles any number of times without further queries or cache lookups.
+"""
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.utils.functional import SimpleLazyObject
+
+from .models import OrganisationPersonRoleAssignment, ProductRoleAssignment
+
+CACHE_KEY_PREFIX = "security:role_assignments"
+
+_request_memo = ContextVar("role_assignments", default=None)
+
+
+class RoleAssignments:
+    """The roles of one person, keyed by product id and by organisation id."""
+
+    ProductRoles = ProductRoleAssignment.ProductRoles
+
+    # If a person has several assignments for a product, the most privileged one counts
+    PRODUCT_ROLE_RANKS = {ProductRoles.CONTRIBUTOR: 0, ProductRoles.MANAGER: 1, ProductRoles.ADMIN: 2}
+    PRODUCT_MODIFY_ROLES = (ProductRoles.ADMIN, ProductRoles.MANAGER)
+
+    def __init__(self, product_roles=None, organisation_roles=None):
+        self.product_roles = product_roles or {}
+        self.organisation_roles = organisation_roles or {}
+
+    @staticmethod
+    def get_id(obj):
+        return getattr(obj, "pk", obj)
+
+    def product_role(self, product):
+        return self.product_roles.get(self.get_id(product))
+
+    def has_product_role(self, product, roles):
+        return self.product_role(product) in roles
+
+    def can_modify_product(self, product):
+        return self.has_product_role(product, self.PRODUCT_MODIFY_ROLES)
+
+    def product_ids(self, roles=None):
+        return [product_id for product_id, role in self.product_roles.items() if roles is None or role in roles]
+
+    def organisation_role(self, organisation):
+        return self.organisation_roles.get(self.get_id(organisation))
+
+    def has_organisation_role(self, organisation, roles):
+        return self.organisation_role(organisation) in roles
+
+
+NO_ROLES = RoleAssignments()
+
+
+def cache_key(person_id):
+    return f"{CACHE_KEY_PREFIX}:{person_id}"
+
+
+def load_role_assignments(person_id):
+    ranks = RoleAssignments.PRODUCT_ROLE_RANKS
+    product_roles = {}
+    assignments = ProductRoleAssignment.objects.filter(person_id=person_id).values_list("product_id", "role")
+    for product_id, role in assignments:
+        current = product_roles.get(product_id)
+        if current is None or ranks.get(role, -1) > ranks.get(current, -1):
+            product_roles[product_id] = role
+    organisation_roles = dict(
+        OrganisationPersonRoleAssignment.objects.filter(person_id=person_id).values_list("organisation_id", "role")
+    )
+    return RoleAssignments(product_roles, organisation_roles)
+
+
+def get_role_assignments(person):
+    """The role assignments of ``person`` (a Person or its id), memoised for the current request."""
+    person_id = RoleAssignments.get_id(person)
+    if person_id is None:
+        return NO_ROLES
+
+    memo = _request_memo.get()
+    if memo is not None and person_id in memo:
+        return memo[person_id]
+
+    # Plain dicts are cached so entries don't depend on the class staying picklable across deploys
+    cached = cache.get(cache_key(person_id))
+    if cached is None:
+        roles = load_role_assignments(person_id)
+        cache.set(
+            cache_key(person_id),
+            (roles.product_roles, roles.organisation_roles),
+            getattr(settings, "ROLE_ASSIGNMENTS_CACHE_TIMEOUT", 300),
+        )
+    else:
+        roles = RoleAssignments(*cached)
+
+    if memo is not None:
+        memo[person_id] = roles
+    return roles
+
+
+def get_user_role_assignments(user):
+    if user is None or not user.is_authenticated:
+        return NO_ROLES
+    try:
+        person = user.person
+    except ObjectDoesNotExist:
+        return NO_ROLES
+    return get_role_assignments(person)
+
+
+def invalidate_role_assignments(*person_ids):
+    person_ids = {person_id for person_id in person_ids if person_id is not None}
+    memo = _request_memo.get() or {}
+    for person_id in person_ids:
+        memo.pop(person_id, None)
+    cache.delete_many([cache_key(person_id) for person_id in person_ids])
+
+
+class role_assignments_scope(ContextDecorator):
+    """Memoises role assignments inside the block. Nested blocks share the outermost memo."""
+
+    def __enter__(self):
+        self.token = None
+        if _request_memo.get() is None:
+            self.token = _request_memo.set({})
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.token is not None:
+            _request_memo.reset(self.token)
+
+
+class RoleAssignmentsMiddleware:
+    """
+    Memoises role assignments for the duration of the request and exposes the current user's as
+    ``request.role_assignments``. Must come after ``AuthenticationMiddleware``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with role_assignments_scope():
+            request.role_assignments = SimpleLazyObject(
+                lambda: get_user_role_assignments(getattr(request, "user", None))
+            )
+            return self.get_response(request)
@@ -1,11 +1,8 @@
-from django.db.models.signals import post_save, post_delete, pre_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from django.contrib.contenttypes.models import ContentType
-from django.apps import apps
-from .models import AuditEvent
-import json
-
-from .models import User
+from .models import OrganisationPersonRoleAssignment, ProductRoleAssignment, User
+from .permissions import invalidate_role_assignments
 
 
 @receiver(pre_save, sender=User)
@@ -29,51 +26,24 @@ def pre_save_receiver(sender, instance, **kwargs):
         instance.remaining_budget_for_failed_logins = 3
         instance.password_reset_required = False
 
-def get_current_user():
-    from django.contrib.auth.models import AnonymousUser
-    from django.contrib.auth.middleware import get_user
-    from django.contrib.auth import get_user_model
-
-    User = get_user_model()
-    try:
-        return get_user(None)
-    except:
-        return None
-
-def should_audit_model(model):
-    return (
-        model._meta.app_label not in ['contenttypes', 'auth', 'sessions', 'admin'] and
-        model is not AuditEvent
-    )
-
-def get_serializable_fields(instance):
-    data = {}
-    for field in instance._meta.fields:
-        value = getattr(instance, field.name)
-        if isinstance(value, (str, int, float, bool, type(None))):
-            data[field.name] = value
-    return data
-
-def log_change(sender, instance, created=False, deleted=False):
-    if not should_audit_model(sender):
-        return
-
-    try:
-        content_type = ContentType.objects.get_for_model(sender)
-    except Exception:
-        return
 
-    action = 'CREATE' if created else 'DELETE' if deleted else 'UPDATE'
-
-    try:
-        AuditEvent.objects.create(
-            user=get_current_user(),
-            action=action,
-            content_type=content_type,
-            object_id=instance.pk,
-            changes=json.dumps(get_serializable_fields(instance))
+@receiver(pre_save, sender=ProductRoleAssignment)
+@receiver(pre_save, sender=OrganisationPersonRoleAssignment)
+def remember_role_assignment_person(sender, instance, **kwargs):
+    # An assignment can be moved to another person, whose cached roles must be dropped as well
+    instance._previous_person_id = None
+    if not instance._state.adding:
+        instance._previous_person_id = (
+            sender._base_manager.filter(pk=instance.pk).values_list("person_id", flat=True).first()
         )
-    except Exception as e:
-        print(f"Error creating AuditEvent entry: {e}")
 
-# Signal handlers will be connected in apps.py after migrations
\ No newline at end of file
+
+@receiver(post_save, sender=ProductRoleAssignment)
+@receiver(post_delete, sender=ProductRoleAssignment)
+@receiver(post_save, sender=OrganisationPersonRoleAssignment)
+@receiver(post_delete, sender=OrganisationPersonRoleAssignment)
+def role_assignment_changed(sender, instance, **kwargs):
+    person_ids = (instance.person_id, getattr(instance, "_previous_person_id", None))
+    # Dropped now for the current request, and again after commit in case another request cached the old roles
+    invalidate_role_assignments(*person_ids)
+    transaction.on_commit(lambda: invalidate_role_assignments(*person_ids))
@@ -0,0 +1,16 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.utils.dateparse import parse_datetime
+
+from apps.security.models import AuditEvent
+
+
+@shared_task(queue="audit", ignore_result=True)
+def write_audit_events(events):
+    logger = get_task_logger(__name__)
+
+    audit_events = [
+        AuditEvent(**{**event, "timestamp": parse_datetime(event["timestamp"])}) for event in events
+    ]
+    AuditEvent.objects.bulk_create(audit_events)
+    logger.info(f"Wrote {len(audit_events)} audit events")
@@ -64,6 +64,10 @@ class BountyDeliveryAttemptAdmin(admin.ModelAdmin):
     list_display = ["pk", "status", "bounty_claim", "delivery_message"]
     list_filter = ["status"]
 
+@admin.register(models.PersonPointsRun)
+class PersonPointsRunAdmin(admin.ModelAdmin):
+    list_display = ["as_of", "incremental", "updated"]
+
 # Update the Meta classes in your models to fix pluralization
 models.BountyClaim._meta.verbose_name_plural = "Bounty Claims"
 models.BountyBid._meta.verbose_name_plural = "Bounty Bids"
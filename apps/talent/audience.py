@@ -0,0 +1,141 @@
+"""
+Who hears about a new bounty.
+
+A bounty is announced to the people with ``send_me_bounties`` who have one of the expertise its ``BountySkill`` rows
+ask for, or the skill itself where a row asks for no particular expertise. Rather than joining ``PersonSkill`` and
+its expertise for every new bounty, ``SkillAudience`` keeps the answer per skill and per expertise: an array of
+person ids, GIN indexed. Announcing a bounty is then one probe of the rows for its terms, and one outbox event for
+all of them (``emit``), which the email dispatch sends in batches. Bounties are announced when they open, created
+open or moved out of draft, once the transaction commits, by when the ``BountySkill`` rows saved with them exist.
+
+The rows of a person are refreshed after the transaction that changed their skills, expertise or
+``send_me_bounties`` commits: they are taken out of the rows they no longer belong in (found through the GIN index)
+and added to the ones they are missing from, both in SQL so concurrent changes to the same row don't overwrite each
+other, and rows they stay in aren't rewritten. Bulk ``update()`` calls and fixture loads don't refresh; run
+``manage.py rebuild_skill_audience`` after those.
+"""
+from django.db import connection, transaction
+
+from apps.engagement.models import Notification
+from apps.engagement.outbox import emit
+from apps.product_management.models import BountySkill
+
+from .models import Person, PersonSkill, SkillAudience
+
+# The terms of each opted in person: their skills and expertise
+WANTED_SQL = """
+SELECT DISTINCT person_skill.person_id, term.id AS term_id
+FROM {person_skill} person_skill
+JOIN {person} person ON person.id = person_skill.person_id AND person.send_me_bounties
+CROSS JOIN LATERAL (
+    SELECT person_skill.skill_id
+    UNION ALL
+    SELECT expertise.expertise_id
+    FROM {person_skill_expertise} expertise
+    WHERE expertise.personskill_id = person_skill.id
+) AS term (id)
+WHERE {people}
+"""
+
+STRIP_SQL = """
+WITH wanted AS ({wanted})
+UPDATE {audience} audience
+SET person_ids = ARRAY(
+    SELECT person_id
+    FROM unnest(audience.person_ids) person_id
+    WHERE person_id <> ALL(%s::varchar[]) OR (audience.term_id, person_id) IN (SELECT term_id, person_id FROM wanted)
+    ORDER BY person_id
+)
+WHERE audience.person_ids && %s::varchar[]
+AND EXISTS (
+    SELECT 1
+    FROM unnest(audience.person_ids) person_id
+    WHERE person_id = ANY(%s::varchar[])
+    AND (audience.term_id, person_id) NOT IN (SELECT term_id, person_id FROM wanted)
+)
+"""
+
+ADD_SQL = """
+INSERT INTO {audience} AS audience (term_id, person_ids)
+SELECT term_id, array_agg(person_id ORDER BY person_id)
+FROM ({wanted}) wanted
+GROUP BY term_id
+ON CONFLICT (term_id) DO UPDATE SET person_ids = ARRAY(
+    SELECT DISTINCT person_id FROM unnest(audience.person_ids || EXCLUDED.person_ids) person_id ORDER BY person_id
+)
+WHERE NOT audience.person_ids @> EXCLUDED.person_ids
+"""
+
+AUDIENCE_OF_BOUNTY_SQL = """
+SELECT DISTINCT person_id
+FROM {audience} audience, unnest(audience.person_ids) person_id
+WHERE audience.term_id IN (
+    SELECT coalesce(expertise.expertise_id, bounty_skill.skill_id)
+    FROM {bounty_skill} bounty_skill
+    LEFT JOIN {bounty_skill_expertise} expertise ON expertise.bountyskill_id = bounty_skill.id
+    WHERE bounty_skill.bounty_id = %s
+)
+"""
+
+
+def quoted_tables():
+    quote = connection.ops.quote_name
+    tables = {
+        "audience": SkillAudience,
+        "person": Person,
+        "person_skill": PersonSkill,
+        "person_skill_expertise": PersonSkill.expertise.through,
+        "bounty_skill": BountySkill,
+        "bounty_skill_expertise": BountySkill.expertise.through,
+    }
+    return {name: quote(model._meta.db_table) for name, model in tables.items()}
+
+
+@transaction.atomic
+def refresh_people(person_ids):
+    """Moves the given people into the audiences of their current skills and expertise, and out of the others."""
+    person_ids = sorted(set(person_ids))
+    tables = quoted_tables()
+    wanted = WANTED_SQL.format(people="person_skill.person_id = ANY(%s::varchar[])", **tables)
+    with connection.cursor() as cursor:
+        # The wanted rows' parameter comes first
+        cursor.execute(STRIP_SQL.format(wanted=wanted, **tables), [person_ids] * 4)
+        cursor.execute(ADD_SQL.format(wanted=wanted, **tables), [person_ids])
+
+
+def refresh_on_commit(person_ids):
+    """Refreshes the given people once the current transaction commits (right away outside of one)."""
+    person_ids = list(person_ids)
+    if person_ids:
+        transaction.on_commit(lambda: refresh_people(person_ids))
+
+
+@transaction.atomic
+def rebuild_audiences():
+    """Rebuilds every audience. Returns the number of rows."""
+    tables = quoted_tables()
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {tables['audience']}")
+        cursor.execute(ADD_SQL.format(wanted=WANTED_SQL.format(people="TRUE", **tables), **tables))
+        return cursor.rowcount
+
+
+def audience_of(bounty):
+    """The ids of the people to announce ``bounty`` to."""
+    sql = AUDIENCE_OF_BOUNTY_SQL.format(**quoted_tables())
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [bounty._meta.pk.get_db_prep_value(bounty.pk, connection)])
+        return [person_id for (person_id,) in cursor.fetchall()]
+
+
+def announce_bounty(bounty):
+    """Queues the ``BOUNTY_CREATED`` notification of ``bounty`` to its audience. Returns how many people."""
+    person_ids = audience_of(bounty)
+    if person_ids:
+        emit(Notification.EventType.BOUNTY_CREATED, person_ids, bounty_title=bounty.title)
+    return len(person_ids)
+
+
+def announce_on_commit(bounty):
+    """Announces ``bounty`` once the current transaction commits."""
+    transaction.on_commit(lambda: announce_bounty(bounty))
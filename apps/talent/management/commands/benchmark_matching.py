@@ -0,0 +1,144 @@
+import random
+import statistics
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from apps.common.fields import generate_ids
+from apps.product_management.models import Bounty, BountySkill, Challenge, Product
+from apps.security.models import User
+from apps.talent import matching
+from apps.talent.models import Expertise, Person, PersonSkill, Skill
+from apps.talent.taxonomy import invalidate_taxonomy
+
+
+class Command(BaseCommand):
+    help = "Compare ranking talent for a bounty with a query per lookup against the in-memory matcher"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--people", type=int, default=20_000, help="People created for the test")
+        parser.add_argument("--bounties", type=int, default=2_000, help="Open bounties created for the test")
+        parser.add_argument("--skills", type=int, default=50, help="Skills, each with three expertise")
+        parser.add_argument("--repeat", type=int, default=20, help="Lookups timed, the median is shown")
+
+    def create_terms(self, count):
+        skills = Skill.objects.bulk_create(
+            Skill(id=id, name=f"Matching benchmark {number}", active=True, display_boost_factor=number % 3 + 1)
+            for number, id in enumerate(generate_ids(count))
+        )
+        expertise = Expertise.objects.bulk_create(
+            Expertise(id=id, name=f"Matching benchmark {number}", skill=skills[number // 3], fa_icon="")
+            for number, id in enumerate(generate_ids(count * 3))
+        )
+        return [(skill, expertise[index * 3:index * 3 + 3]) for index, skill in enumerate(skills)]
+
+    def add_skills(self, model, owner_field, owners, terms):
+        rows, expertise_rows = [], []
+        through = model.expertise.through
+        for owner in owners:
+            for skill, expertise in random.sample(terms, 2):
+                row = model(id=model._meta.pk.generate_id(), skill=skill, **{owner_field: owner})
+                rows.append(row)
+                expertise_rows.extend(
+                    through(**{f"{model._meta.model_name}_id": row.id, "expertise_id": chosen.id})
+                    for chosen in random.sample(expertise, random.randint(0, 2))
+                )
+        model.objects.bulk_create(rows, batch_size=5000)
+        through.objects.bulk_create(expertise_rows, batch_size=5000)
+
+    def create_people(self, count):
+        users = User.objects.bulk_create(
+            (
+                User(id=User._meta.pk.generate_id(), username=f"matching-benchmark-{number}")
+                for number in range(count)
+            ),
+            batch_size=5000,
+        )
+        return Person.objects.bulk_create(
+            (
+                Person(id=Person._meta.pk.generate_id(), user=user, full_name=user.username, headline="")
+                for user in users
+            ),
+            batch_size=5000,
+        )
+
+    def create_bounties(self, count):
+        product = Product.objects.create(
+            id=Product._meta.pk.generate_id(), name="Matching benchmark", slug="matching-benchmark"
+        )
+        challenge = Challenge.objects.create(product=product, title="Matching benchmark")
+        return Bounty.objects.bulk_create(
+            (
+                Bounty(
+                    id=id,
+                    product=product,
+                    challenge=challenge,
+                    title=f"Bounty {number}",
+                    status=Bounty.BountyStatus.OPEN,
+                    reward_type="Points",
+                )
+                for number, id in enumerate(generate_ids(count))
+            ),
+            batch_size=5000,
+        )
+
+    def query_suggested_talent(self, matcher, bounty_id, limit=5):
+        """What ranking without the matcher takes: the bounty's terms, then every person sharing one."""
+        terms = set()
+        bounty_skills = BountySkill.objects.filter(bounty_id=bounty_id)
+        for skill_id, expertise_id in bounty_skills.values_list("skill_id", "expertise"):
+            terms.update(term for term in (skill_id, expertise_id) if term is not None)
+        shared = defaultdict(int)
+        people = PersonSkill.objects.filter(Q(skill_id__in=terms) | Q(expertise__in=terms))
+        for person_id, skill_id, expertise_id in people.values_list("person_id", "skill_id", "expertise").distinct():
+            for term in (skill_id, expertise_id):
+                if term in terms:
+                    shared[person_id, term] = matcher.weight(term)
+        scores = defaultdict(int)
+        for (person_id, _), weight in shared.items():
+            scores[person_id] += weight
+        total = matcher.total_weight(terms)
+        return sorted(((weight / total, person_id) for person_id, weight in scores.items()), reverse=True)[:limit]
+
+    def median_ms(self, lookup, bounty_ids):
+        timings = []
+        for bounty_id in bounty_ids:
+            start = time.perf_counter()
+            lookup(bounty_id)
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings) * 1000
+
+    def handle(self, *args, **options):
+        random.seed(0)
+        with transaction.atomic():
+            terms = self.create_terms(options["skills"])
+            self.add_skills(PersonSkill, "person", self.create_people(options["people"]), terms)
+            bounties = self.create_bounties(options["bounties"])
+            self.add_skills(BountySkill, "bounty", bounties, terms)
+            invalidate_taxonomy()
+
+            start = time.perf_counter()
+            matching.rebuild_matching()
+            matcher = matching.get_matcher()
+            build_ms = (time.perf_counter() - start) * 1000
+
+            bounty_ids = [bounty.pk for bounty in random.sample(bounties, min(options["repeat"], len(bounties)))]
+            for bounty_id in bounty_ids:
+                expected = [score for score, _ in self.query_suggested_talent(matcher, bounty_id)]
+                assert expected == [score for _, score in matcher.suggested_talent(bounty_id)]
+
+            query_ms = self.median_ms(lambda bounty_id: self.query_suggested_talent(matcher, bounty_id), bounty_ids)
+            memory_ms = self.median_ms(matching.suggested_talent, bounty_ids)
+            self.stdout.write(f"{'suggested talent':<20}{'ms':>10}")
+            self.stdout.write(f"{'query per lookup':<20}{query_ms:>10.2f}")
+            self.stdout.write(f"{'matcher':<20}{memory_ms:>10.2f}")
+            self.stdout.write(f"{'matcher build':<20}{build_ms:>10.2f}")
+
+            # The test rows are never committed
+            transaction.set_rollback(True)
+        # Nor are the taxonomy and matching changes the processes may have loaded
+        invalidate_taxonomy()
+        matching.rebuild_matching()
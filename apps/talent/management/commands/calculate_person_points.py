@@ -1,22 +1,19 @@
 from django.core.management.base import BaseCommand
 
-from apps.talent.models import Person, BountyClaim
+from apps.talent.points import calculate_person_points
 
 
 class Command(BaseCommand):
     help = "Calculate Person points based on completed bounty claims"
 
-    def handle(self, *args, **options):
-        updated_count = 0
-
-        for person in Person.objects.all():
-            points = 0
-            bounty_claims = BountyClaim.objects.filter(person=person)
-            for bounty_claim in bounty_claims:
-                if bounty_claim.status == bounty_claim.Status.COMPLETED:
-                    points += bounty_claim.bounty.points
-            person.points = points
-            person.save()
-            updated_count += 1
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Only recalculate the people with claims changed since the last run",
+        )
 
-        self.stdout.write(self.style.SUCCESS(f"Updated points of {updated_count} person objects."))
+    def handle(self, *args, **options):
+        run = calculate_person_points(incremental=options["incremental"])
+        kind = "people with changed claims" if run.incremental else "everyone"
+        self.stdout.write(self.style.SUCCESS(f"Recalculated {kind}, updated points of {run.updated} person objects."))
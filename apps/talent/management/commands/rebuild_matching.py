@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.talent.matching import rebuild_matching
+
+
+class Command(BaseCommand):
+    help = "Make every process reload the skills it matches talent and bounties by"
+
+    def handle(self, *args, **options):
+        rebuild_matching()
+        self.stdout.write(self.style.SUCCESS("Every process reloads the matching on its next lookup."))
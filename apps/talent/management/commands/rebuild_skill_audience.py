@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.talent.audience import rebuild_audiences
+
+
+class Command(BaseCommand):
+    help = "Rebuild who hears about new bounties of each skill and expertise"
+
+    def handle(self, *args, **options):
+        count = rebuild_audiences()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} skill and expertise audiences."))
@@ -0,0 +1,242 @@
+"""
+Matching talent and open bounties by skill.
+
+Each person and each open bounty is a sparse vector over skills and expertise (the terms) from ``PersonSkill`` and
+``BountySkill``. A skill weighs its ``display_boost_factor``, an expertise that of its skill times one more than its
+depth in the expertise tree, so the more specific a term the more it counts. A person scores for a bounty the weight
+of the terms they share over the weight of all the bounty's terms: how much of what the bounty asks for they have.
+
+``Matcher`` keeps both sides in memory, each as the rows of a sparse matrix plus its transpose (an inverted index
+from each term to the people or bounties having it), so ranking the bounties for a person, or the people for a
+bounty, only touches the rows sharing one of its terms. It is built per process from two bulk queries, one per side,
+and the weights come from the cached taxonomy, so a lookup normally runs no query at all.
+
+Changes are kept in the shared cache as a numbered chain: each records the people and bounties whose terms changed,
+added with ``cache.add`` so concurrent changes take the next free number rather than overwrite each other. A process
+walks the chain from the first change it hasn't seen and reloads only those people and bounties; when a change has
+expired, or the cache lost the chain, it reloads everything. The chain only reaches other processes through a shared
+cache. Bulk ``update()`` calls and fixture loads aren't recorded; run ``manage.py rebuild_matching`` after those, or
+wait for ``MATCHING_MAX_AGE``, after which a process reloads everything anyway.
+"""
+import heapq
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.product_management.models import Bounty, BountySkill
+
+from .models import PersonSkill
+from .taxonomy import get_taxonomy
+
+CACHE_KEY_PREFIX = "talent:matching"
+HEAD_KEY = f"{CACHE_KEY_PREFIX}:head"
+
+MATCHABLE_STATUSES = (Bounty.BountyStatus.OPEN,)
+
+_lock = threading.Lock()
+_matcher = None
+
+
+class Vectors:
+    """The term sets of one side, by id, and the ids having each term."""
+
+    def __init__(self):
+        self.rows = {}
+        self.postings = defaultdict(set)
+
+    def set(self, row_id, terms):
+        self.discard(row_id)
+        if terms:
+            self.rows[row_id] = frozenset(terms)
+            for term in terms:
+                self.postings[term].add(row_id)
+
+    def discard(self, row_id):
+        for term in self.rows.pop(row_id, ()):
+            self.postings[term].discard(row_id)
+            if not self.postings[term]:
+                del self.postings[term]
+
+
+def load_terms(queryset, owner_field, ids=None):
+    """The terms of each owner (person or bounty) in ``queryset``, of the given owner ids only if any, in one query."""
+    if ids is not None:
+        queryset = queryset.filter(**{f"{owner_field}__in": ids})
+    terms = defaultdict(set)
+    for owner_id, skill_id, expertise_id in queryset.values_list(owner_field, "skill_id", "expertise"):
+        terms[owner_id].add(skill_id)
+        if expertise_id is not None:
+            terms[owner_id].add(expertise_id)
+    return terms
+
+
+def person_terms(ids=None):
+    return load_terms(PersonSkill.objects.all(), "person_id", ids)
+
+
+def bounty_terms(ids=None):
+    return load_terms(BountySkill.objects.filter(bounty__status__in=MATCHABLE_STATUSES), "bounty_id", ids)
+
+
+class Matcher:
+    def __init__(self, version):
+        # The (epoch, number) of the next change to apply
+        self.version = version
+        self.built_at = time.monotonic()
+        self.people = Vectors()
+        self.bounties = Vectors()
+        self.taxonomy = None
+        self.weights = {}
+
+    def reload(self, person_ids=None, bounty_ids=None):
+        """Reloads the terms of the given people and bounties, or of everyone where ``None``."""
+        for side, ids, load in ((self.people, person_ids, person_terms), (self.bounties, bounty_ids, bounty_terms)):
+            if ids is not None and not ids:
+                continue
+            terms = load(ids)
+            for row_id in set(side.rows) if ids is None else ids:
+                if row_id not in terms:
+                    side.discard(row_id)
+            for row_id, row_terms in terms.items():
+                side.set(row_id, row_terms)
+
+    def weight(self, term):
+        if self.taxonomy is not get_taxonomy():
+            # A skill or expertise changed, their weights may have too
+            self.taxonomy = get_taxonomy()
+            self.weights = {}
+        if term not in self.weights:
+            self.weights[term] = self.compute_weight(term)
+        return self.weights[term]
+
+    def compute_weight(self, term):
+        skills, expertise = self.taxonomy.skills, self.taxonomy.expertise
+        if term in expertise:
+            skill_id = expertise.nodes[term]["skill_id"]
+            depth = len(expertise.get_ancestors(term)) + 1
+        else:
+            skill_id, depth = term, 0
+        boost = skills.nodes[skill_id]["display_boost_factor"] if skill_id in skills else 1
+        return max(boost, 1) * (depth + 1)
+
+    def total_weight(self, terms):
+        return sum(self.weight(term) for term in terms)
+
+    def rank(self, terms, others, limit, total_weight_of):
+        """The ``limit`` best (id, score) of ``others`` sharing one of ``terms``, the weight shared over theirs."""
+        shared = defaultdict(int)
+        for term in terms:
+            weight = self.weight(term)
+            for other_id in others.postings.get(term, ()):
+                shared[other_id] += weight
+        scores = ((weight / total_weight_of(other_id), other_id) for other_id, weight in shared.items())
+        return [(other_id, score) for score, other_id in heapq.nlargest(limit, scores)]
+
+    def recommended_bounties(self, person_id, limit=5):
+        """The (bounty id, score) of the open bounties best matching the person's skills, best first."""
+        bounties = self.bounties
+        terms = self.people.rows.get(person_id, ())
+        return self.rank(terms, bounties, limit, lambda bounty_id: self.total_weight(bounties.rows[bounty_id]))
+
+    def suggested_talent(self, bounty_id, limit=5):
+        """The (person id, score) of the people whose skills best match the bounty, best first."""
+        terms = self.bounties.rows.get(bounty_id, ())
+        total = self.total_weight(terms)
+        return self.rank(terms, self.people, limit, lambda person_id: total)
+
+
+def change_key(epoch, number):
+    return f"{CACHE_KEY_PREFIX}:change:{epoch}:{number}"
+
+
+def get_head():
+    """
+    The (epoch, number of changes) of the chain as far as any process recorded. The epoch starts a new chain when the
+    cache lost the head.
+    """
+    head = cache.get(HEAD_KEY)
+    if head is None:
+        cache.add(HEAD_KEY, (uuid.uuid4().hex, 0), None)
+        head = cache.get(HEAD_KEY)
+    return head
+
+
+def record_change(person_ids=(), bounty_ids=(), everything=False):
+    """Appends a change to the chain, after the latest one."""
+    change = (sorted(person_ids), sorted(bounty_ids), everything)
+    timeout = getattr(settings, "MATCHING_CHANGE_TIMEOUT", 60 * 60 * 24)
+    epoch, number = get_head()
+    # Another change may have taken the number since the head was read
+    while not cache.add(change_key(epoch, number), change, timeout):
+        number += 1
+    cache.set(HEAD_KEY, (epoch, number + 1), None)
+
+
+def changed_on_commit(person_ids=(), bounty_ids=()):
+    """Records that the terms of these people and bounties changed, once the current transaction commits."""
+    person_ids, bounty_ids = list(person_ids), list(bounty_ids)
+    if person_ids or bounty_ids:
+        transaction.on_commit(lambda: record_change(person_ids, bounty_ids))
+
+
+def follow_changes(epoch, number):
+    """
+    The (epoch, number) at the end of the chain from change ``number`` and the person ids and bounty ids changed on
+    the way, each ``None`` for everyone where a change says so or the chain is broken.
+    """
+    head_epoch, head_number = get_head()
+    if head_epoch != epoch:
+        return (head_epoch, head_number), None, None
+
+    person_ids, bounty_ids = set(), set()
+    while (change := cache.get(change_key(epoch, number))) is not None:
+        people, bounties, everything = change
+        if everything:
+            person_ids = bounty_ids = None
+        if person_ids is not None:
+            person_ids.update(people)
+            bounty_ids.update(bounties)
+        number += 1
+
+    if head_number > number:
+        # A change on the way has expired
+        return (epoch, head_number), None, None
+    return (epoch, number), person_ids, bounty_ids
+
+
+def get_matcher():
+    """
+    This process' ``Matcher``, brought up to date with the changes recorded since it was built, or rebuilt once it is
+    older than ``MATCHING_MAX_AGE`` seconds.
+    """
+    global _matcher
+    max_age = getattr(settings, "MATCHING_MAX_AGE", 60 * 60)
+    with _lock:
+        if _matcher is None or time.monotonic() - _matcher.built_at > max_age:
+            _matcher = Matcher(get_head())
+            _matcher.reload()
+            return _matcher
+
+        head, person_ids, bounty_ids = follow_changes(*_matcher.version)
+        if head != _matcher.version:
+            _matcher.reload(person_ids, bounty_ids)
+            _matcher.version = head
+        return _matcher
+
+
+def rebuild_matching():
+    """Makes every process reload everything on its next lookup."""
+    record_change(everything=True)
+
+
+def recommended_bounties(person, limit=5):
+    return get_matcher().recommended_bounties(getattr(person, "pk", person), limit)
+
+
+def suggested_talent(bounty, limit=5):
+    return get_matcher().suggested_talent(getattr(bounty, "pk", bounty), limit)
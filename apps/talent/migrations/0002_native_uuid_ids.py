@@ -0,0 +1,22 @@
+# Generated by Django 5.1.1 on 2026-10-17 06:39
+
+import apps.common.fields
+from django.db import migrations
+
+from apps.common.operations import ConvertBase58IdToUUID
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("talent", "0001_initial"),
+        ("product_management", "0003_native_uuid_ids"),
+    ]
+
+    operations = [
+        ConvertBase58IdToUUID(
+            model_name="bountyclaim",
+            name="id",
+            field=apps.common.fields.Base58NativeUUIDField(primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.1 on 2026-10-17 07:48
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("talent", "0002_native_uuid_ids"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SkillAudience",
+            fields=[
+                ("term_id", models.CharField(max_length=22, primary_key=True, serialize=False)),
+                (
+                    "person_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=22), default=list, size=None
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(fields=["person_ids"], name="skill_audience_people_idx")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.1 on 2026-10-17 08:00
+
+import apps.common.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product_management", "0009_bounty_updated_idx"),
+        ("talent", "0003_skill_audience"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PersonPointsRun",
+            fields=[
+                ("id", apps.common.fields.Base58UUIDv7Field(primary_key=True, serialize=False)),
+                ("as_of", models.DateTimeField(db_index=True)),
+                ("incremental", models.BooleanField(default=False)),
+                ("updated", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="bountyclaim",
+            index=models.Index(fields=["updated_at"], name="bounty_claim_updated_idx"),
+        ),
+    ]
@@ -3,6 +3,8 @@ from datetime import date
 
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
@@ -11,9 +13,10 @@ from django.dispatch import receiver
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
+from model_utils import FieldTracker
 from treebeard.mp_tree import MP_Node
 
-from apps.common.fields import Base58UUIDv5Field
+from apps.common.fields import Base58NativeUUIDField, Base58UUIDv5Field, Base58UUIDv7Field
 from apps.common.models import AttachmentAbstract
 from django.apps import apps
 from apps.common.mixins import AncestryMixin, TimeStampMixin
@@ -63,6 +66,8 @@ class Person(TimeStampMixin):
     completed_profile = models.BooleanField(default=False)
     points = models.PositiveIntegerField(default=0)
 
+    tracker = FieldTracker(fields=["send_me_bounties"])
+
     class Meta:
         db_table = "talent_person"
         verbose_name_plural = "People"
@@ -154,6 +159,24 @@ class PersonSkill(models.Model):
         return f"{self.person} - {self.skill} - {self.expertise}"
 
 
+class SkillAudience(models.Model):
+    """
+    The people with ``send_me_bounties`` who have a skill or expertise, the inverted index of ``PersonSkill`` that
+    new bounties are announced from. One row per skill and per expertise (their ids don't collide), kept up to date
+    by ``apps.talent.audience``.
+    """
+
+    term_id = models.CharField(max_length=22, primary_key=True)
+    person_ids = ArrayField(models.CharField(max_length=22), default=list)
+
+    class Meta:
+        # Finds the rows of a person whose skills changed
+        indexes = [GinIndex(fields=["person_ids"], name="skill_audience_people_idx")]
+
+    def __str__(self):
+        return f"{len(self.person_ids)} people with {self.term_id}"
+
+
 class Skill(AncestryMixin):
     id = Base58UUIDv5Field(primary_key=True)
     parent = models.ForeignKey(
@@ -180,6 +203,12 @@ class Skill(AncestryMixin):
     def get_roots(cls):
         return cls.objects.filter(parent=None, active=True)
 
+    def ancestry(self):
+        from .taxonomy import get_taxonomy
+
+        skills = get_taxonomy().skills
+        return skills.ancestry(self.pk) if self.pk in skills else super().ancestry()
+
     @staticmethod
     def get_active_skills(active=True, parent=None):
         return Skill.objects.filter(active=active, parent=parent).all()
@@ -218,6 +247,12 @@ class Expertise(AncestryMixin):
     def get_roots(cls):
         return cls.objects.filter(parent=None)
 
+    def ancestry(self):
+        from .taxonomy import get_taxonomy
+
+        expertise = get_taxonomy().expertise
+        return expertise.ancestry(self.pk) if self.pk in expertise else super().ancestry()
+
     @property
     def get_children(self):
         return self.expertise_children.filter()
@@ -270,6 +305,9 @@ class BountyBid(TimeStampMixin):
 
     @transaction.atomic
     def accept_bid(self):
+        from apps.engagement.models import Notification
+        from apps.engagement.outbox import emit
+
         if self.status != self.Status.PENDING:
             raise ValidationError("Only pending bids can be accepted.")
         
@@ -294,20 +332,26 @@ class BountyBid(TimeStampMixin):
         # Process the reward adjustment
         self._process_reward_adjustment()
 
+        emit(
+            Notification.EventType.BOUNTY_CLAIMED,
+            [self.person],
+            user_name=self.person.full_name,
+            bounty_title=self.bounty.title,
+        )
+
     def _process_reward_adjustment(self):
         from apps.commerce.models import SalesOrder
+        if self.bounty.reward_type != 'USD':
+            # Points rewards are never paid for, there is no order to adjust
+            return
         try:
             original_order = SalesOrder.objects.get(cart__items__bounty=self.bounty, adjustment_type="INITIAL")
-            if self.bounty.reward_type == 'USD':
-                difference = self.amount_in_usd_cents - self.bounty.reward_in_usd_cents
-            else:
-                difference = self.amount_in_points - self.bounty.reward_in_points
+            difference = self.amount_in_usd_cents - self.bounty.reward_in_usd_cents
             if difference > 0:
                 self._create_increase_adjustment(original_order, difference)
             elif difference < 0:
                 self._create_decrease_adjustment(original_order, abs(difference))
         except SalesOrder.DoesNotExist:
-            # Handle the case where there's no original order (e.g., for point-based bounties)
             pass
     
     @transaction.atomic
@@ -384,7 +428,7 @@ class BountyClaim(TimeStampMixin):
         COMPLETED = "Completed"
         FAILED = "Failed"
 
-    id = Base58UUIDv5Field(primary_key=True)
+    id = Base58NativeUUIDField(primary_key=True)
     bounty = models.ForeignKey("product_management.Bounty", on_delete=models.CASCADE)
     person = models.ForeignKey(Person, on_delete=models.CASCADE)
     accepted_bid = models.ForeignKey('BountyBid', on_delete=models.SET_NULL, null=True, blank=True)
@@ -394,6 +438,8 @@ class BountyClaim(TimeStampMixin):
     class Meta:
         unique_together = ("bounty", "person")
         ordering = ("-created_at",)
+        # Finds the claims changed since the last points calculation
+        indexes = [models.Index(fields=["updated_at"], name="bounty_claim_updated_idx")]
 
     def __str__(self):
         return f"Claim on {self.bounty.title} by {self.person.get_full_name()}"
@@ -406,6 +452,22 @@ class BountyClaim(TimeStampMixin):
         super().save(*args, **kwargs)
         self.bounty.update_status_from_claim()
 
+class PersonPointsRun(models.Model):
+    """
+    A run of ``calculate_person_points``. The ``as_of`` of the latest is the watermark the next incremental run
+    recalculates the people with claims changed since.
+    """
+
+    id = Base58UUIDv7Field(primary_key=True)
+    as_of = models.DateTimeField(db_index=True)
+    incremental = models.BooleanField(default=False)
+    updated = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        kind = "Incremental" if self.incremental else "Full"
+        return f"{kind} points run as of {self.as_of}, {self.updated} people updated"
+
+
 class BountyDeliveryAttempt(TimeStampMixin, AttachmentAbstract):
     class BountyDeliveryStatus(models.TextChoices):
         NEW = "New"
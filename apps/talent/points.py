@@ -0,0 +1,84 @@
+"""
+Reputation points from completed bounty claims.
+
+A person's ``points`` are the points rewards of the bounties they completed a claim on: the final reward where one
+was set, the offered one otherwise; USD bounties count for nothing. ``calculate_person_points`` used to load every
+person, then each of their claims and each claim's bounty, and save the people one by one. ``recalculate_points``
+instead sums the claims per person and writes the totals in one ``UPDATE ... FROM (SELECT ... GROUP BY)``, only to
+the rows whose points differ.
+
+Each run is recorded as a ``PersonPointsRun``. An incremental run only recalculates the people with a claim, or a
+claim on a bounty, updated since the latest run's ``as_of``, found through the ``updated_at`` indexes. ``as_of``
+stays ``WATERMARK_DELAY`` in the past, as transactions still open during a run commit rows stamped with the time
+they started. Bulk ``update()`` calls don't move ``updated_at``, and deleted claims leave nothing to find; a full run
+recalculates everyone.
+"""
+import datetime
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.product_management.models import Bounty
+
+from .models import BountyClaim, Person, PersonPointsRun
+
+WATERMARK_DELAY = datetime.timedelta(minutes=5)
+
+RECALCULATE_SQL = """
+UPDATE {person} person
+SET points = totals.points
+FROM (
+    SELECT person.id AS person_id, coalesce(sum(coalesce(bounty.final_reward_in_points, bounty.reward_in_points)), 0)
+        AS points
+    FROM {person} person
+    LEFT JOIN {claim} claim ON claim.person_id = person.id AND claim.status = %s
+    LEFT JOIN {bounty} bounty ON bounty.id = claim.bounty_id AND bounty.reward_type = 'Points'
+    WHERE {people}
+    GROUP BY person.id
+) totals
+WHERE person.id = totals.person_id AND person.points <> totals.points
+"""
+
+# The people with claims changed since the watermark
+CHANGED_SQL = """
+person.id IN (
+    SELECT claim.person_id FROM {claim} claim WHERE claim.updated_at > %s
+    UNION
+    SELECT claim.person_id
+    FROM {claim} claim
+    JOIN {bounty} bounty ON bounty.id = claim.bounty_id
+    WHERE bounty.updated_at > %s
+)
+"""
+
+
+def quoted_tables():
+    quote = connection.ops.quote_name
+    tables = {"person": Person, "claim": BountyClaim, "bounty": Bounty}
+    return {name: quote(model._meta.db_table) for name, model in tables.items()}
+
+
+def recalculate_points(changed_since=None):
+    """
+    Recalculates the points of everyone, or of the people with claims changed since ``changed_since``. Returns how
+    many people's points changed.
+    """
+    tables = quoted_tables()
+    people, params = "TRUE", []
+    if changed_since is not None:
+        people, params = CHANGED_SQL.format(**tables), [changed_since, changed_since]
+    with connection.cursor() as cursor:
+        cursor.execute(RECALCULATE_SQL.format(people=people, **tables), [BountyClaim.Status.COMPLETED, *params])
+        return cursor.rowcount
+
+
+@transaction.atomic
+def calculate_person_points(incremental=False, as_of=None):
+    """
+    Recalculates the points of everyone, or incrementally from the latest run when there is one, and records the
+    run as of ``WATERMARK_DELAY`` ago by default. Returns the ``PersonPointsRun``.
+    """
+    as_of = as_of or timezone.now() - WATERMARK_DELAY
+    latest = PersonPointsRun.objects.order_by("-as_of").first() if incremental else None
+    updated = recalculate_points(changed_since=latest.as_of if latest else None)
+    return PersonPointsRun.objects.create(as_of=as_of, incremental=latest is not None, updated=updated)
@@ -1,35 +1,107 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
-from apps.product_management.models import Bounty, Challenge
+from apps.product_management.models import Bounty, BountySkill
 
-from .models import BountyClaim, BountyDeliveryAttempt, Person
+from .models import BountyClaim, BountyDeliveryAttempt, Expertise, Person, PersonSkill, Skill
+from .taxonomy import invalidate_taxonomy
 
 
 @receiver(post_save, sender=BountyDeliveryAttempt)
 def update_bounty_delivery_status(sender, instance, created, **kwargs):
     if not created:
-        action_mapping = {
-            BountyDeliveryAttempt.SubmissionType.APPROVED: {
-                "bounty_claim_status": BountyClaim.Status.COMPLETED,
-                "bounty_status": Bounty.BountyStatus.COMPLETED,
-                "challenge_status": Challenge.ChallengeStatus.choices,
-            },
-            BountyDeliveryAttempt.SubmissionType.REJECTED: {
-                "bounty_claim_status": BountyClaim.Status.FAILED,
-                "bounty_status": Bounty.BountyStatus.AVAILABLE,
-                "challenge_status": Challenge.ChallengeStatus.ACTIVE,
-            },
-        }
-
-        actions = action_mapping.get(instance.kind, {})
-
-        if actions:
-            instance.bounty_claim.status = actions["bounty_claim_status"]
-            instance.bounty_claim.save()
-
-            instance.bounty_claim.bounty.status = actions["bounty_status"]
-            instance.bounty_claim.bounty.save()
-
-            instance.bounty_claim.bounty.challenge.status = actions["challenge_status"]
-            instance.bounty_claim.bounty.challenge.save()
+        claim_status = {
+            BountyDeliveryAttempt.BountyDeliveryStatus.APPROVED: BountyClaim.Status.COMPLETED,
+            BountyDeliveryAttempt.BountyDeliveryStatus.REJECTED: BountyClaim.Status.FAILED,
+        }.get(instance.status)
+
+        if claim_status:
+            bounty_claim = instance.bounty_claim
+            bounty_claim.status = claim_status
+            # Saving the claim completes the bounty, or opens it again
+            bounty_claim.save()
+            bounty_claim.bounty.challenge.update_status()
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=Expertise)
+@receiver(post_delete, sender=Expertise)
+def invalidate_taxonomy_on_change(sender, **kwargs):
+    invalidate_taxonomy()
+
+
+def person_skills_changed(person_ids):
+    from .audience import refresh_on_commit
+    from .matching import changed_on_commit
+
+    person_ids = list(person_ids)
+    refresh_on_commit(person_ids)
+    changed_on_commit(person_ids=person_ids)
+
+
+def bounty_skills_changed(bounty_ids):
+    from .matching import changed_on_commit
+
+    changed_on_commit(bounty_ids=bounty_ids)
+
+
+@receiver(post_save, sender=PersonSkill)
+@receiver(post_delete, sender=PersonSkill)
+def refresh_people_of_skill(sender, instance, raw=False, **kwargs):
+    if not raw:
+        person_skills_changed([instance.person_id])
+
+
+@receiver(m2m_changed, sender=PersonSkill.expertise.through)
+def refresh_people_of_expertise(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse and action in ("post_add", "post_remove", "post_clear"):
+        person_skills_changed([instance.person_id])
+    elif reverse and action in ("post_add", "post_remove"):
+        person_skills_changed(PersonSkill.objects.filter(pk__in=pk_set).values_list("person_id", flat=True))
+    elif reverse and action == "pre_clear":
+        # Afterwards there is no telling who had this expertise
+        person_skills_changed(PersonSkill.objects.filter(expertise=instance).values_list("person_id", flat=True))
+
+
+@receiver(post_save, sender=Person)
+def refresh_audience_of_person(sender, instance, created, raw=False, **kwargs):
+    from .audience import refresh_on_commit
+
+    if not (created or raw) and instance.tracker.has_changed("send_me_bounties"):
+        refresh_on_commit([instance.pk])
+
+
+@receiver(post_save, sender=BountySkill)
+@receiver(post_delete, sender=BountySkill)
+def refresh_bounty_of_skill(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bounty_skills_changed([instance.bounty_id])
+
+
+@receiver(m2m_changed, sender=BountySkill.expertise.through)
+def refresh_bounty_of_expertise(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse and action in ("post_add", "post_remove", "post_clear"):
+        bounty_skills_changed([instance.bounty_id])
+    elif reverse and action in ("post_add", "post_remove"):
+        bounty_skills_changed(BountySkill.objects.filter(pk__in=pk_set).values_list("bounty_id", flat=True))
+    elif reverse and action == "pre_clear":
+        bounty_skills_changed(BountySkill.objects.filter(expertise=instance).values_list("bounty_id", flat=True))
+
+
+@receiver(post_save, sender=Bounty)
+def refresh_bounty_of_status(sender, instance, created, raw=False, **kwargs):
+    # Only open bounties are matched
+    if not (created or raw) and instance.tracker.has_changed("status"):
+        bounty_skills_changed([instance.pk])
+
+
+@receiver(post_save, sender=Bounty)
+def announce_opened_bounty(sender, instance, created, raw=False, **kwargs):
+    from .audience import announce_on_commit
+
+    # Drafts aren't announced, nor are bounties reopened after a failed claim
+    if raw or instance.status != Bounty.BountyStatus.OPEN:
+        return
+    if created or instance.tracker.previous("status") == Bounty.BountyStatus.DRAFT:
+        announce_on_commit(instance)
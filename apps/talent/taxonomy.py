@@ -0,0 +1,167 @@
+"""
+The skill and expertise taxonomy, loaded whole.
+
+Walking ``Skill.get_children``/``Expertise.get_children`` issues a query per node, and ``AncestryMixin.ancestry`` one
+per level. ``get_taxonomy`` instead loads every active skill and every expertise in two queries, builds the nested
+trees the filters and forms render, and precomputes each node's ancestors and descendants so looking them up is a
+dict access.
+
+The loaded rows are kept in the shared cache under a versioned key; saving or deleting a skill or an expertise moves
+the version on (``invalidate_taxonomy``, wired up in ``signals``), so every process reloads on its next lookup. Each
+process keeps the built taxonomy of the current version, so a lookup normally costs one cache read. Changes that
+send no signal, like bulk ``update()`` calls, show once the version expires after ``TAXONOMY_CACHE_TIMEOUT``.
+"""
+import json
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Expertise, Skill
+
+CACHE_KEY_PREFIX = "talent:taxonomy"
+VERSION_KEY = f"{CACHE_KEY_PREFIX}:version"
+
+SKILL_FIELDS = ("id", "name", "parent_id", "selectable", "display_boost_factor")
+EXPERTISE_FIELDS = ("id", "name", "parent_id", "skill_id", "selectable", "fa_icon")
+
+_built = {}
+
+
+class Forest:
+    """
+    The nodes of one self-referencing model reachable from its roots. ``serialize`` turns a row into the dict a
+    tree node is rendered from, without its children.
+    """
+
+    def __init__(self, rows, serialize):
+        children = defaultdict(list)
+        for row in rows:
+            children[row["parent_id"]].append(row)
+
+        self.nodes = {}
+        self.children = {}
+        self.ancestors = {}
+        self.descendants = {}
+        self.trees = {}
+        self.roots = [row["id"] for row in children[None]]
+
+        # Parents are visited before their children, so ancestors can be extended on the way down
+        order, stack = [], [(row, ()) for row in reversed(children[None])]
+        while stack:
+            row, ancestors = stack.pop()
+            node_id = row["id"]
+            self.nodes[node_id] = row
+            self.children[node_id] = [child["id"] for child in children[node_id]]
+            self.ancestors[node_id] = ancestors
+            order.append(node_id)
+            stack.extend((child, (*ancestors, node_id)) for child in reversed(children[node_id]))
+
+        # ... and children before their parents on the way back up
+        for node_id in reversed(order):
+            child_ids = self.children[node_id]
+            self.descendants[node_id] = frozenset(child_ids).union(*(self.descendants[child] for child in child_ids))
+            self.trees[node_id] = {
+                **serialize(self.nodes[node_id]),
+                "children": [self.trees[child] for child in child_ids],
+            }
+
+    def __contains__(self, node_id):
+        return node_id in self.nodes
+
+    def get_ancestors(self, node_id):
+        """Ids from the root down to the parent of ``node_id``."""
+        return self.ancestors.get(node_id, ())
+
+    def get_descendants(self, node_id):
+        return self.descendants.get(node_id, frozenset())
+
+    def is_descendant(self, node_id, ancestor_id):
+        return ancestor_id in self.get_ancestors(node_id)
+
+    def ancestry(self, node_id):
+        """Like ``AncestryMixin.ancestry``: the JSON list of names from the root down to ``node_id``."""
+        lineage = [*self.get_ancestors(node_id), node_id]
+        return json.dumps([self.nodes[ancestor]["name"] for ancestor in lineage])
+
+    def get_trees(self, root_ids=None):
+        return [self.trees[root] for root in (self.roots if root_ids is None else root_ids)]
+
+
+def serialize_skill(row):
+    return {"id": row["id"], "name": row["name"]}
+
+
+def serialize_expertise(row):
+    return {"id": row["id"], "name": row["name"], "skill": row["skill_id"]}
+
+
+class Taxonomy:
+    def __init__(self, skill_rows, expertise_rows):
+        self.skills = Forest(skill_rows, serialize_skill)
+        self.expertise = Forest(expertise_rows, serialize_expertise)
+
+    def skill_tree(self):
+        """Every active root skill as nested ``{"id", "name", "children"}`` dicts."""
+        return self.skills.get_trees()
+
+    def expertise_tree(self, skill=None):
+        """Every root expertise, or those of ``skill`` (a Skill or id), as nested dicts that also hold the skill id."""
+        if skill is None:
+            return self.expertise.get_trees()
+        skill_id = getattr(skill, "pk", skill)
+        roots = [root for root in self.expertise.roots if self.expertise.nodes[root]["skill_id"] == skill_id]
+        return self.expertise.get_trees(roots)
+
+
+def load_rows():
+    skills = list(Skill.objects.filter(active=True).order_by("name").values(*SKILL_FIELDS))
+    expertise = list(Expertise.objects.order_by("name").values(*EXPERTISE_FIELDS))
+    return skills, expertise
+
+
+def get_timeout():
+    return getattr(settings, "TAXONOMY_CACHE_TIMEOUT", 60 * 60)
+
+
+def get_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, get_timeout())
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def get_taxonomy():
+    version = get_version()
+    taxonomy = _built.get(version)
+    if taxonomy is not None:
+        return taxonomy
+
+    key = f"{CACHE_KEY_PREFIX}:{version}"
+    # Plain rows are cached so entries don't depend on these classes staying picklable across deploys
+    rows = cache.get(key)
+    if rows is None:
+        rows = load_rows()
+        cache.set(key, rows, get_timeout())
+
+    taxonomy = Taxonomy(*rows)
+    _built.clear()
+    _built[version] = taxonomy
+    return taxonomy
+
+
+def bump_version():
+    cache.set(VERSION_KEY, uuid.uuid4().hex, get_timeout())
+    _built.clear()
+
+
+def invalidate_taxonomy():
+    """
+    Moves the version on now, so this transaction sees its own change, and again once it commits, so a process
+    that reloaded the old rows in the meantime doesn't keep them.
+    """
+    bump_version()
+    transaction.on_commit(bump_version)
@@ -18,7 +18,7 @@ from .views import (
 
 urlpatterns = [
     path("portfolio/<str:username>", TalentPortfolio.as_view(), name="portfolio"),
-    path("profile/<int:pk>/", UpdateProfileView.as_view(), name="profile"),
+    path("profile/<str:pk>/", UpdateProfileView.as_view(), name="profile"),
     path("get-skills/", get_skills, name="get_skills"),
     path("get-current-skills/", get_current_skills, name="get_current_skills"),
     path("get-expertise/", GetExpertiseView.as_view(), name="get_expertise"),
@@ -39,22 +39,22 @@ urlpatterns = [
         name="create-feedback",
     ),
     path(
-        "feedback/update/<int:pk>/",
+        "feedback/update/<str:pk>/",
         UpdateFeedbackView.as_view(),
         name="update-feedback",
     ),
     path(
-        "feedback/delete/<int:pk>",
+        "feedback/delete/<str:pk>",
         DeleteFeedbackView.as_view(),
         name="delete-feedback",
     ),
     path(
-        "<str:product_slug>/challenges/<int:challenge_id>/bounties/<int:bounty_id>/submissions/create",
+        "<str:product_slug>/challenges/<str:challenge_id>/bounties/<str:bounty_id>/submissions/create",
         CreateBountyDeliveryAttemptView.as_view(),
         name="create-bounty-delivery-attempt",
     ),
     path(
-        "<str:product_slug>/challenges/<int:challenge_id>/bounties/<int:bounty_id>/submissions/<int:pk>/",
+        "<str:product_slug>/challenges/<str:challenge_id>/bounties/<str:bounty_id>/submissions/<str:pk>/",
         BountyDeliveryAttemptDetail.as_view(),
         name="bounty-delivery-attempt-detail",
     ),
@@ -15,8 +15,8 @@ from django.views.generic.edit import CreateView, DeleteView, UpdateView
 
 from apps.common import mixins
 from apps.product_management.models import Bounty
-from apps.security.models import ProductRoleAssignment
-from apps.talent import utils
+from apps.security.permissions import get_user_role_assignments
+from apps.talent.taxonomy import get_taxonomy
 from apps.utility import utils as global_utils
 
 from .forms import BountyDeliveryAttemptForm, FeedbackForm, PersonProfileForm, PersonSkillFormSet
@@ -47,19 +47,18 @@ class UpdateProfileView(LoginRequiredMixin, UpdateView):
     def get_context_data(self, **kwargs):
         context = {}
         person = self.get_object()
+        taxonomy = get_taxonomy()
 
         expertises = []
         context = {
             "pk": person.pk,
         }
-        skills = [utils.serialize_skills(skill) for skill in Skill.get_roots()]
+        skills = taxonomy.skill_tree()
 
         if self.request.htmx:
             index = self.request.GET.get("index")
             if skill := self.request.GET.get(f"skills-{index}-skill"):
-                expertises = [
-                    utils.serialize_expertise(expertise) for expertise in Expertise.get_roots().filter(skill=skill)
-                ]
+                expertises = taxonomy.expertise_tree(skill=skill)
             else:
                 context["empty_form"] = PersonSkillFormSet().empty_form
                 context["skills"] = skills
@@ -67,7 +66,7 @@ class UpdateProfileView(LoginRequiredMixin, UpdateView):
             context["index"] = index
             context["expertises"] = expertises
         else:
-            self.extract_context_data(person, context, skills)
+            self.extract_context_data(person, context, skills, taxonomy)
 
         context["person_skill_formset"] = PersonSkillFormSet(
             self.request.POST or None,
@@ -76,13 +75,13 @@ class UpdateProfileView(LoginRequiredMixin, UpdateView):
         )
         return context
 
-    def extract_context_data(self, person, context, skills):
+    def extract_context_data(self, person, context, skills, taxonomy):
         context["form"] = self.form_class(instance=person)
         context["pk"] = person.pk
         context["photo_url"] = person.get_photo_url()
         context["skills"] = skills
         context["selected_skills"] = skills
-        context["expertises"] = [utils.serialize_expertise(expertise) for expertise in Expertise.get_roots()]
+        context["expertises"] = taxonomy.expertise_tree()
 
     def form_valid(self, form):
         person = self.request.user.person
@@ -131,7 +130,7 @@ class GetExpertiseView(LoginRequiredMixin, TemplateView):
         context = {}
         expertises = []
         skill = self.request.GET.get("skill")
-        expertises = [utils.serialize_expertise(expertise) for expertise in Expertise.get_roots().filter(skill=skill)]
+        expertises = get_taxonomy().expertise_tree(skill=skill) if skill else []
         context["expertises"] = expertises
 
         return context
@@ -197,8 +196,9 @@ class TalentPortfolio(TemplateView):
     User = get_user_model()
     template_name = "talent/portfolio.html"
 
-    def get(self, request, username, *args, **kwargs):
-        user = get_object_or_404(self.User, username=username)
+    def get_context_data(self, **kwargs):
+        request = self.request
+        user = get_object_or_404(self.User, username=self.kwargs["username"])
         person = user.person
 
         # todo: check the statuses
@@ -207,8 +207,9 @@ class TalentPortfolio(TemplateView):
             person=person,
         ).select_related("bounty__challenge", "bounty__challenge__product")
 
+        # A claimed bounty is in progress
         bounty_claims_claimed = BountyClaim.objects.filter(
-            bounty__status=Bounty.BountyStatus.CLAIMED,
+            bounty__status=Bounty.BountyStatus.IN_PROGRESS,
             person=person,
         ).select_related("bounty__challenge", "bounty__challenge__product")
 
@@ -223,7 +224,7 @@ class TalentPortfolio(TemplateView):
         else:
             can_leave_feedback = True
 
-        context = {
+        return {
             "user": user,
             "person": person,
             "person_linkedin_link": global_utils.get_path_from_url(person.linkedin_link, True),
@@ -236,7 +237,6 @@ class TalentPortfolio(TemplateView):
             "form": FeedbackForm(),
             "can_leave_feedback": can_leave_feedback,
         }
-        return self.render_to_response(context)
 
 
 def status_and_points(request):
@@ -347,7 +347,6 @@ class DeleteFeedbackView(LoginRequiredMixin, DeleteView):
 class CreateBountyDeliveryAttemptView(LoginRequiredMixin, mixins.AttachmentMixin, CreateView):
     model = BountyDeliveryAttempt
     form_class = BountyDeliveryAttemptForm
-    success_url = reverse_lazy("dashboard")
     template_name = "talent/bounty_claim_attempt.html"
     login_url = "sign_in"
 
@@ -356,15 +355,15 @@ class CreateBountyDeliveryAttemptView(LoginRequiredMixin, mixins.AttachmentMixin
         kwargs["request"] = self.request
         return kwargs
 
-    def form_valid(self, form):
-        form.instance.person = self.request.user.person
-        form.instance.kind = BountyDeliveryAttempt.SubmissionType.NEW
-        response = super().form_save(form)
+    def get_success_url(self):
+        return reverse(
+            "bounty-detail",
+            args=(self.kwargs["product_slug"], self.kwargs["challenge_id"], self.kwargs["bounty_id"]),
+        )
 
-        bounty_claim = form.instance.bounty_claim
-        bounty_claim.status = BountyClaim.Status.CONTRIBUTED
-        bounty_claim.save()
-        return response
+    def form_valid(self, form):
+        # The attempt is new until it is reviewed, the claim stays active meanwhile
+        return super().form_save(form)
 
 
 class BountyDeliveryAttemptDetail(LoginRequiredMixin, mixins.AttachmentMixin, DetailView):
@@ -376,12 +375,7 @@ class BountyDeliveryAttemptDetail(LoginRequiredMixin, mixins.AttachmentMixin, De
     def get_context_data(self, *args, **kwargs):
         product = self.object.bounty_claim.bounty.challenge.product
         data = super().get_context_data(**kwargs)
-        is_product_admin = ProductRoleAssignment.objects.filter(
-            product=product,
-            person=self.request.user.person,
-            role__in=[ProductRoleAssignment.ProductRoles.ADMIN, ProductRoleAssignment.ProductRoles.MANAGER],
-        ).exists()
-        data["is_product_admin"] = is_product_admin
+        data["is_product_admin"] = get_user_role_assignments(self.request.user).can_modify_product(product)
         return data
 
     def post(self, request, *args, **kwargs):
@@ -393,10 +387,12 @@ class BountyDeliveryAttemptDetail(LoginRequiredMixin, mixins.AttachmentMixin, De
         self.object = self.get_object()
 
         if value == APPROVE_TRIGGER_NAME:
-            self.object.kind = BountyDeliveryAttempt.SubmissionType.APPROVED
+            self.object.status = BountyDeliveryAttempt.BountyDeliveryStatus.APPROVED
+            self.object.reviewed_by = request.user.person
             self.object.save()
         elif value == REJECT_TRIGGER_NAME:
-            self.object.kind = BountyDeliveryAttempt.SubmissionType.REJECTED
+            self.object.status = BountyDeliveryAttempt.BountyDeliveryStatus.REJECTED
+            self.object.reviewed_by = request.user.person
             self.object.save()
 
-        return HttpResponseRedirect(reverse("dashboard"))
+        return HttpResponseRedirect(self.object.get_absolute_url())
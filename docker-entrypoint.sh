@@ -14,6 +14,7 @@
 echo "Apply database migrations"
 echo "----------------------------------------------------------"
 nohup python manage.py migrate --run-syncdb
+nohup python manage.py createcachetable
 
 # Prepare static files
 echo "Preparing static files"
@@ -0,0 +1,53 @@
+import pytest
+from django.db import transaction
+
+from apps.product_management.models import Product
+from apps.security.audit import audit_batch
+from apps.security.models import AuditEvent
+
+
+@pytest.mark.django_db
+class TestAuditBatching:
+    def test_batch_writes_events_in_one_insert(self, django_capture_on_commit_callbacks, django_assert_num_queries):
+        with audit_batch() as batch:
+            with django_capture_on_commit_callbacks(execute=True):
+                product = Product.objects.create(name="Audited", slug="audited")
+                product.name = "Audited product"
+                product.save()
+            assert AuditEvent.objects.count() == 0
+            assert len(batch.events) == 3  # product and its point account created, product updated
+
+            with django_assert_num_queries(1):
+                batch.flush()
+
+        events = AuditEvent.objects.filter(object_id=product.pk).order_by("timestamp")
+        assert [event.action for event in events] == ["CREATE", "UPDATE"]
+        assert events[0].changes["slug"] == [None, "audited"]
+        assert set(events[1].changes) == {"name", "updated_at"}
+        assert events[1].changes["name"] == ["Audited", "Audited product"]
+
+    def test_only_changed_fields_are_recorded(self, django_capture_on_commit_callbacks):
+        product = Product.objects.create(name="Tracked", slug="tracked")
+        product = Product.objects.get(pk=product.pk)
+
+        with audit_batch() as batch:
+            with django_capture_on_commit_callbacks(execute=True):
+                product.is_private = True
+                product.save(update_fields=["is_private"])
+                product.save(update_fields=["is_private"])
+            assert [event.changes for event in batch.events] == [{"is_private": [False, True]}]
+
+    def test_rolled_back_changes_are_not_audited(self, django_capture_on_commit_callbacks):
+        with audit_batch() as batch:
+            with django_capture_on_commit_callbacks(execute=True):
+                with transaction.atomic():
+                    Product.objects.create(name="Rolled back", slug="rolled-back")
+                    transaction.set_rollback(True)
+            assert batch.events == []
+
+    def test_models_outside_allow_list_are_skipped(self, settings, django_capture_on_commit_callbacks):
+        settings.AUDIT_MODELS = ["talent"]
+        with audit_batch() as batch:
+            with django_capture_on_commit_callbacks(execute=True):
+                Product.objects.create(name="Not audited", slug="not-audited")
+            assert batch.events == []
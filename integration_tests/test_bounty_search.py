@@ -0,0 +1,88 @@
+import pytest
+
+from apps.product_management.models import Bounty, BountySearchDocument, BountySkill, Challenge
+from apps.common.pagination import decode_cursor, paginate_by_cursor
+from apps.product_management.search import BountySearch, rebuild_search_documents
+from apps.talent.models import Expertise, Skill
+
+
+@pytest.fixture
+def skills():
+    return [Skill.objects.create(name=name, active=True) for name in ("Python", "Design")]
+
+
+@pytest.fixture
+def expertise(skills):
+    return Expertise.objects.create(name="Django", skill=skills[0], fa_icon="")
+
+
+@pytest.fixture
+def bounties(product, challenge, skills, expertise, django_capture_on_commit_callbacks):
+    challenge.status = Challenge.ChallengeStatus.ACTIVE
+    challenge.save()
+    with django_capture_on_commit_callbacks(execute=True):
+        created = []
+        for index in range(6):
+            bounty = Bounty.objects.create(
+                product=product,
+                challenge=challenge,
+                title=f"Bounty {index}",
+                description="Write the migration" if index % 2 else "Draw the icons",
+                status=Bounty.BountyStatus.OPEN if index < 4 else Bounty.BountyStatus.COMPLETED,
+                reward_type="Points",
+                reward_in_points=10,
+            )
+            bounty_skill = BountySkill.objects.create(bounty=bounty, skill=skills[index % 2])
+            if index % 2 == 0:
+                bounty_skill.expertise.add(expertise)
+            created.append(bounty)
+    return created
+
+
+@pytest.mark.django_db
+class TestBountySearch:
+    def test_documents_follow_changes(
+        self, bounties, challenge, skills, expertise, django_capture_on_commit_callbacks
+    ):
+        document = BountySearchDocument.objects.get(pk=bounties[0].pk)
+        assert (document.skill_ids, document.expertise_ids) == ([skills[0].pk], [expertise.pk])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            BountySkill.objects.get(bounty=bounties[0]).expertise.clear()
+            challenge.status = Challenge.ChallengeStatus.DRAFT
+            challenge.save()
+
+        document.refresh_from_db()
+        assert (document.expertise_ids, document.is_listed) == ([], False)
+
+    def test_facet_counts_ignore_their_own_filter(self, bounties, skills, expertise, django_assert_num_queries):
+        search = BountySearch(filters={"status": Bounty.BountyStatus.OPEN, "skill": skills[0].pk})
+
+        with django_assert_num_queries(1):
+            counts = search.facet_counts()
+
+        assert counts["total"] == 2
+        assert counts["status"] == {Bounty.BountyStatus.OPEN: 2, Bounty.BountyStatus.COMPLETED: 1}
+        assert counts["skill"] == {skills[0].pk: 2, skills[1].pk: 2}
+        assert counts["expertise"] == {expertise.pk: 2}
+
+    def test_text_search(self, bounties):
+        search = BountySearch(text="migrations")
+        bounties_found = search.load_bounties(search.documents())
+
+        assert {bounty.title for bounty in bounties_found} == {"Bounty 1", "Bounty 3", "Bounty 5"}
+
+    def test_pages_are_newest_first(self, bounties):
+        search = BountySearch()
+        page = paginate_by_cursor(search.documents(), None, 4)
+        next_page = paginate_by_cursor(search.documents(), decode_cursor(page.next_cursor), 4)
+
+        expected = sorted(bounties, key=lambda bounty: (bounty.created_at, bounty.pk), reverse=True)
+        assert search.load_bounties(page.object_list + next_page.object_list) == expected
+        assert not next_page.has_next()
+
+    def test_rebuild(self, bounties):
+        BountySearchDocument.objects.all().delete()
+
+        assert rebuild_search_documents(batch_size=4) == len(bounties)
+        assert BountySearchDocument.objects.count() == len(bounties)
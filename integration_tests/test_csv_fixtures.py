@@ -0,0 +1,87 @@
+import gzip
+from datetime import timedelta
+
+import pytest
+from django.apps import apps
+from django.utils import timezone
+
+from apps.common.csv_fixtures import BulkCSVLoader, dependency_levels, export_fixture, find_fixtures
+from apps.engagement.models import EmailNotification
+from apps.security.models import SignInAttempt
+from apps.talent.models import Expertise, PersonSkill, Skill
+
+
+@pytest.fixture
+def skill_csv(tmp_path):
+    path = tmp_path / "skill-fixture.csv"
+    rows = ["id,parent_id,active,selectable,display_boost_factor,name"]
+    # Children come before their parent; the self reference is only checked when the transaction commits
+    rows += [f"child{i},root,true,true,1,Skill {i}" for i in range(50)]
+    rows.append("root,,true,false,2,Root")
+    path.write_text("\n".join(rows) + "\n")
+    return path
+
+
+@pytest.mark.django_db
+class TestBulkCSVLoader:
+    def test_upserts_in_chunks(self, skill_csv, django_assert_max_num_queries):
+        with django_assert_max_num_queries(12):
+            result = BulkCSVLoader(Skill, chunk_size=20, log=lambda message: None).load(skill_csv)
+
+        assert (result.rows, result.loaded, result.errors) == (51, 51, [])
+        assert Skill.objects.filter(parent_id="root").count() == 50
+
+        skill_csv.write_text(skill_csv.read_text().replace(",Skill 0\n", ",Renamed skill\n"))
+        BulkCSVLoader(Skill, log=lambda message: None).load(skill_csv)
+        assert Skill.objects.get(pk="child0").name == "Renamed skill"
+
+    def test_missing_relations_are_skipped(self, tmp_path):
+        skill = Skill.objects.create(name="Design")
+        expertise = Expertise.objects.create(name="Figma", skill=skill)
+        path = tmp_path / "person-skill-fixture.csv"
+        path.write_text(f"id,person_id,skill_id,expertise_ids\nps1,missing,{skill.pk},\"{expertise.pk},9\"\n")
+
+        result = BulkCSVLoader(PersonSkill, log=lambda message: None).load(path)
+
+        assert (result.loaded, result.skipped) == (0, 1)
+        assert not PersonSkill.objects.exists()
+
+    def test_rows_with_more_values_than_columns_are_errors(self, tmp_path):
+        path = tmp_path / "email-notification-fixture.csv"
+        path.write_text(
+            "id,event_type,permitted_params,title,template\n"
+            "n1,BOUNTY_CLAIMED,user_name,Claimed,{user_name}, your bounty was claimed\n"
+            'n2,BOUNTY_CREATED,user_name,Created,"Check it out, {user_name}!"\n'
+        )
+
+        result = BulkCSVLoader(EmailNotification, log=lambda message: None).load(path)
+
+        assert (result.loaded, result.skipped) == (1, 1)
+        assert result.errors[0].startswith("Line 2: 1 more values than columns")
+        assert EmailNotification.objects.get().template == "Check it out, {user_name}!"
+
+    def test_export_since_round_trips(self, tmp_path):
+        old = SignInAttempt.objects.create(device_identifier="old")
+        SignInAttempt.objects.filter(pk=old.pk).update(updated_at=timezone.now() - timedelta(days=2))
+        new = SignInAttempt.objects.create(device_identifier="new", successful=False)
+        path = tmp_path / "signinattempt.csv.gz"
+
+        assert export_fixture(SignInAttempt, path, since=timezone.now() - timedelta(days=1)) == 1
+        SignInAttempt.objects.all().delete()
+        result = BulkCSVLoader(SignInAttempt, log=lambda message: None).load(str(path))
+
+        assert result.loaded == 1
+        assert SignInAttempt.objects.get().pk == new.pk
+        assert SignInAttempt.objects.get().successful is False
+        with gzip.open(path, "rt") as file:
+            assert file.readline().startswith("created_at,updated_at,id,user_id")
+
+
+def test_fixtures_are_ordered_by_foreign_keys():
+    fixtures = find_fixtures(apps.get_app_configs())
+    levels = {model._meta.label: i for i, level in enumerate(dependency_levels(fixtures)) for model in level}
+
+    assert len(levels) == len(fixtures)
+    assert levels["security.User"] < levels["talent.Person"] < levels["talent.PersonSkill"]
+    assert levels["talent.Skill"] < levels["talent.Expertise"] < levels["talent.PersonSkill"]
+    assert levels["product_management.Challenge"] < levels["product_management.Bounty"] < levels["talent.BountyBid"]
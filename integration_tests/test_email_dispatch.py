@@ -0,0 +1,93 @@
+import time
+
+import pytest
+from sendgrid import SendGridAPIClient
+
+from apps.engagement.dispatch import Dispatcher, dispatch, get_dispatcher
+from apps.engagement.fake_sendgrid import FakeSendGrid
+from apps.engagement.models import EmailNotification, Notification
+from apps.engagement.tasks import send_emails
+from apps.security.models import User
+from apps.talent.models import Person
+
+PARAMS = {"user_name": "Ada", "bounty_title": "Fix the build"}
+
+
+@pytest.fixture(autouse=True)
+def clear_dispatcher():
+    get_dispatcher.cache_clear()
+    yield
+    get_dispatcher.cache_clear()
+
+
+@pytest.fixture
+def fake_sendgrid(settings):
+    with FakeSendGrid() as fake:
+        settings.SENDGRID_API_HOST = fake.url
+        settings.SENDGRID_BATCH_SIZE = 2
+        settings.SENDGRID_MAX_REQUESTS_PER_SECOND = None
+        yield fake
+
+
+@pytest.fixture
+def notification():
+    return EmailNotification.objects.create(
+        event_type=Notification.EventType.BOUNTY_CREATED,
+        permitted_params="user_name,bounty_title",
+        title="New Bounty Created",
+        template='A new bounty "{bounty_title}" has been created. Check it out, {user_name}!',
+    )
+
+
+@pytest.fixture
+def receivers():
+    people = []
+    for number in range(3):
+        user = User.objects.create_user(username=f"receiver-{number}", email=f"receiver-{number}@example.com")
+        people.append(Person.objects.create(user=user, full_name=f"Receiver {number}"))
+    return [person.pk for person in people]
+
+
+@pytest.mark.django_db
+class TestEmailDispatch:
+    def test_receivers_are_sent_in_batches(self, fake_sendgrid, notification, receivers, django_assert_num_queries):
+        # The addresses in one query, the template in another, whatever the number of receivers
+        with django_assert_num_queries(2):
+            send_emails(Notification.EventType.BOUNTY_CREATED, receivers, **PARAMS)
+        with django_assert_num_queries(2):
+            send_emails(Notification.EventType.BOUNTY_CREATED, receivers[:1], **PARAMS)
+
+        assert [len(message["personalizations"]) for message in fake_sendgrid.messages] == [2, 1, 1]
+        assert sorted(fake_sendgrid.recipients[:3]) == [f"receiver-{number}@example.com" for number in range(3)]
+        message = fake_sendgrid.messages[0]
+        assert message["subject"] == "New Bounty Created"
+        assert message["content"][0]["value"] == 'A new bounty "Fix the build" has been created. Check it out, Ada!'
+
+    def test_template_changes_apply_straight_away(self, fake_sendgrid, notification, receivers):
+        send_emails(Notification.EventType.BOUNTY_CREATED, receivers[:1], **PARAMS)
+        notification.title = "Bounty for {user_name}"
+        notification.save()
+        send_emails(Notification.EventType.BOUNTY_CREATED, receivers[:1], **PARAMS)
+
+        assert [message["subject"] for message in fake_sendgrid.messages] == ["New Bounty Created", "Bounty for Ada"]
+
+    def test_events_without_a_template_are_skipped(self, fake_sendgrid, receivers, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            assert dispatch(Notification.EventType.ORDER_PLACED, receivers, {"order_id": "1"}) == 0
+        assert fake_sendgrid.requests == 0
+
+    def test_failed_batches_dont_stop_the_others(self):
+        with FakeSendGrid(status=500) as fake:
+            dispatcher = Dispatcher(SendGridAPIClient("test", host=fake.url), batch_size=1)
+            assert dispatcher.send(["a@example.com", "b@example.com"], "Subject", "Content") == 0
+        assert (fake.requests, fake.messages) == (2, [])
+
+
+def test_requests_are_rate_limited():
+    with FakeSendGrid() as fake:
+        dispatcher = Dispatcher(SendGridAPIClient("test", host=fake.url), batch_size=1, max_requests_per_second=20)
+        start = time.monotonic()
+        assert dispatcher.send([f"{number}@example.com" for number in range(5)], "Subject", "Content") == 5
+        # The first request goes straight away, the other four wait for their turn
+        assert time.monotonic() - start >= 4 / 20
+    assert len(fake.messages) == 5
@@ -0,0 +1,59 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from apps.product_management.models import Idea, IdeaVote
+from apps.product_management.views.ideas_bugs import cast_vote_for_idea, get_ideas_with_votes
+from apps.talent.models import Person
+
+
+@pytest.fixture
+def other_person():
+    user = get_user_model().objects.create_user(username="voter", email="voter@example.com", password="testpass123")
+    return Person.objects.create(user=user, full_name="Voter")
+
+
+def create_idea(product, person, title):
+    return Idea.objects.create(product=product, person=person, title=title, description="")
+
+
+def vote(idea, user):
+    request = RequestFactory().post("/")
+    request.user = user
+    return int(cast_vote_for_idea(request, idea.pk).content)
+
+
+@pytest.mark.django_db
+class TestIdeaVotes:
+    def test_casting_toggles_the_vote_and_count(self, product, person, other_person):
+        idea = create_idea(product, person, "Dark mode")
+
+        assert vote(idea, person.user) == 1
+        assert vote(idea, other_person.user) == 2
+        assert vote(idea, person.user) == 1
+        assert list(IdeaVote.objects.filter(idea=idea).values_list("voter", flat=True)) == [other_person.pk]
+
+        IdeaVote.objects.get(idea=idea, voter=other_person).delete()
+        idea.refresh_from_db()
+        assert idea.vote_count == 0
+
+    def test_ranked_in_one_query(self, product, person, other_person):
+        quiet = create_idea(product, person, "Quiet")
+        popular = create_idea(product, person, "Popular")
+        IdeaVote.objects.create(idea=popular, voter=person)
+        IdeaVote.objects.create(idea=popular, voter=other_person)
+        IdeaVote.objects.create(idea=quiet, voter=other_person)
+
+        with CaptureQueriesContext(connection) as queries:
+            ideas = get_ideas_with_votes(product, person.user)
+            [idea["idea_obj"].person.get_photo_url() for idea in ideas]
+        assert len(queries) == 1
+
+        assert [(idea["idea_obj"], idea["num_votes"], idea["user_has_voted"]) for idea in ideas] == [
+            (popular, 2, True),
+            (quiet, 1, False),
+        ]
+        assert [idea["user_has_voted"] for idea in get_ideas_with_votes(product, AnonymousUser())] == [False, False]
@@ -0,0 +1,85 @@
+import os
+import uuid
+
+import base58
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.urls import reverse
+
+from apps.common.fields import Base58NativeUUIDField, decode_uuid, encode_uuid, generate_ids
+from apps.product_management.models import Challenge, Product
+from apps.security.models import SignInAttempt
+
+
+class TestBase58Encoding:
+    @pytest.mark.parametrize("leading_zero_bytes", [0, 1, 2, 16])
+    def test_matches_base58_package(self, leading_zero_bytes):
+        for _ in range(1000):
+            data = bytes(leading_zero_bytes) + os.urandom(16 - leading_zero_bytes)
+            encoded = encode_uuid(uuid.UUID(bytes=data))
+
+            assert encoded == base58.b58encode(data).decode("ascii")
+            assert decode_uuid(encoded).bytes == data
+
+    def test_rejects_invalid_ids(self):
+        with pytest.raises(ValueError):
+            decode_uuid("not-base58")
+
+
+class TestTimeOrderedIds:
+    def test_generate_ids_are_increasing(self):
+        ids = generate_ids(5000) + generate_ids(5000)
+
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+        assert {decode_uuid(id).version for id in ids} == {7}
+
+    @pytest.mark.django_db
+    def test_new_rows_sort_by_creation(self):
+        attempts = [SignInAttempt.objects.create(device_identifier=str(i)) for i in range(20)]
+
+        ordered = SignInAttempt.objects.filter(pk__in=[a.pk for a in attempts]).order_by("pk")
+        assert [a.device_identifier for a in ordered] == [str(i) for i in range(20)]
+
+
+@pytest.mark.django_db
+class TestNativeUUIDIds:
+    def test_ids_are_base58_in_python(self, challenge):
+        loaded = Challenge.objects.select_related("product").get(pk=challenge.pk)
+
+        assert loaded.pk == challenge.pk
+        assert decode_uuid(loaded.pk).version == 7
+        assert loaded.product.pk == loaded.product_id == challenge.product.pk
+        assert Challenge.objects.filter(product__slug=challenge.product.slug, pk__in=[challenge.pk]).count() == 1
+
+    def test_column_is_uuid(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT data_type FROM information_schema.columns WHERE table_name = %s AND column_name = 'id'",
+                [Challenge._meta.db_table],
+            )
+            assert cursor.fetchone()[0] == "uuid"
+
+    def test_to_python_accepts_hex_uuids(self):
+        value = uuid.uuid4()
+        field = Base58NativeUUIDField()
+
+        assert field.to_python(str(value)) == encode_uuid(value)
+        with pytest.raises(ValidationError):
+            field.to_python("0OIl")
+
+    def test_sql_conversion_matches_python(self):
+        values = [uuid.UUID(bytes=bytes(i) + os.urandom(16 - i)) for i in (0, 1, 2, 16)]
+        with connection.cursor() as cursor:
+            for value in values:
+                cursor.execute("SELECT uuid_to_base58(%s), base58_to_uuid(%s)", [value, encode_uuid(value)])
+                assert cursor.fetchone() == (encode_uuid(value), value)
+
+    @pytest.mark.parametrize("malformed_id", ["0OIl", "z" * 22])
+    def test_malformed_ids_in_urls_are_not_found(self, client, challenge, malformed_id):
+        Product.objects.filter(pk=challenge.product_id).update(slug="product")
+        url = reverse("challenge_detail", args=("product", challenge.pk))
+
+        assert client.get(url.replace(challenge.pk, malformed_id)).status_code == 404
+        assert client.get(url.replace(challenge.pk, encode_uuid(uuid.uuid4()))).status_code == 404
@@ -0,0 +1,120 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.utils import timezone
+
+from apps.commerce.ledger import snapshot_point_balances
+from apps.commerce.models import (
+    Organisation,
+    OrganisationPointAccount,
+    OrganisationWallet,
+    OrganisationWalletTransaction,
+    PointBalanceSnapshot,
+    PointTransaction,
+    ProductPointAccount,
+)
+
+
+@pytest.fixture
+def organisation():
+    return Organisation.objects.create(id=Organisation._meta.pk.generate_id(), name="Ledger Org", country="US")
+
+
+@pytest.fixture
+def point_account(organisation):
+    account = OrganisationPointAccount.objects.create(organisation=organisation)
+    account.add_points(100)
+    return account
+
+
+@pytest.mark.django_db
+class TestLedger:
+    def test_wallet_changes_write_their_transactions(self, organisation):
+        wallet = OrganisationWallet.objects.create(organisation=organisation)
+
+        wallet.add_funds(500, "Top up")
+        assert wallet.deduct_funds(200, "Checkout")
+        assert not wallet.deduct_funds(301, "Too much")
+
+        assert wallet.balance_usd_cents == 300
+        wallet.refresh_from_db()
+        assert wallet.balance_usd_cents == 300
+        assert list(
+            OrganisationWalletTransaction.objects.filter(wallet=wallet)
+            .order_by("amount_cents")
+            .values_list("transaction_type", "amount_cents", "description")
+        ) == [("Debit", 200, "Checkout"), ("Credit", 500, "Top up")]
+
+    def test_points_never_overdraw(self, point_account):
+        assert point_account.use_points(60)
+        assert not point_account.use_points(41)
+        assert point_account.balance == 40
+        with pytest.raises(ValueError):
+            point_account.add_points(-1)
+
+        point_account.refresh_from_db()
+        assert point_account.balance == 40
+        assert list(
+            PointTransaction.objects.order_by("created_at", "id").values_list("transaction_type", "amount")
+        ) == [("GRANT", 100), ("USE", 60)]
+
+    def test_transfer_is_one_entry(self, point_account, product):
+        assert point_account.transfer_points_to_product(product, 30)
+        assert not point_account.transfer_points_to_product(product, 71)
+
+        product_account = ProductPointAccount.objects.get(product=product)
+        assert (point_account.balance, product_account.balance) == (70, 30)
+        transfer = PointTransaction.objects.get(transaction_type="TRANSFER")
+        assert (transfer.account, transfer.product_account, transfer.amount, transfer.transaction_type) == (
+            point_account,
+            product_account,
+            30,
+            "TRANSFER",
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_debits_lose_no_updates(point_account):
+    def debit(_):
+        try:
+            return sum(
+                OrganisationPointAccount(pk=point_account.pk).use_points(1, entry={"transaction_type": "USE"})
+                for _ in range(20)
+            )
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        succeeded = sum(executor.map(debit, range(8)))
+
+    point_account.refresh_from_db()
+    assert succeeded == PointTransaction.objects.filter(account=point_account, transaction_type="USE").count() == 100
+    assert point_account.balance == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_balances_replay_from_the_latest_snapshot(point_account, product):
+    point_account.use_points(30)
+    assert point_account.transfer_points_to_product(product, 20)
+    snapshotted = timezone.now()
+    assert snapshot_point_balances(snapshotted) == 2
+    point_account.use_points(10)
+
+    assert PointBalanceSnapshot.objects.get(account=point_account).balance == 50
+    # Replaying starts at the snapshot, the entries before it aren't read
+    PointTransaction.objects.filter(created_at__lte=snapshotted).delete()
+    assert point_account.balance_at() == point_account.balance == 40
+    assert point_account.balance_at(snapshotted) == 50
+    assert ProductPointAccount.objects.get(product=product).balance_at() == 20
+
+
+@pytest.mark.django_db
+def test_reconciliation_finds_drifted_counters(point_account, product):
+    assert point_account.transfer_points_to_product(product, 30)
+    call_command("reconcile_points")
+
+    ProductPointAccount.objects.filter(product=product).update(balance=31)
+    with pytest.raises(CommandError, match="1 point account balances differ"):
+        call_command("reconcile_points")
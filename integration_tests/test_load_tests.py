@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+import pytest
+
+from apps.talent.models import BountyClaim, BountyDeliveryAttempt
+from load_tests import report, runner
+from load_tests.journeys import BountyJourney, World, login
+
+
+class FakeJourney:
+    def steps(self, bounty):
+        return [
+            ("page", lambda: SimpleNamespace(status_code=200)),
+            ("broken page", lambda: SimpleNamespace(status_code=500)),
+            ("orm", lambda: None),
+            ("raises", lambda: 1 / 0),
+        ]
+
+
+class TestLoadTests:
+    def test_percentiles_are_nearest_rank(self):
+        values = list(range(1, 101))
+        assert [report.percentile(values, percent) for percent in report.PERCENTILES] == [50, 95, 99]
+        assert report.percentile([7], 99) == 7
+
+    def test_failed_steps_are_counted_without_stopping_the_journey(self):
+        recorder = runner.run([(FakeJourney(), range(3)), (FakeJourney(), range(2))])
+        result = report.summarise(recorder, users=2)
+
+        assert {name: (row["requests"], row["failures"]) for name, row in result["steps"].items()} == {
+            "page": (5, 0),
+            "broken page": (5, 5),
+            "orm": (5, 0),
+            "raises": (5, 5),
+        }
+        assert (result["total"]["requests"], result["total"]["failures"]) == (20, 10)
+        assert result["steps"]["broken page"]["failure_reasons"] == {"HTTP 500": 5}
+        assert result["steps"]["raises"]["failure_reasons"] == {"ZeroDivisionError": 5}
+        assert result["total"]["failure_reasons"] == {"HTTP 500": 5, "ZeroDivisionError": 5}
+        assert result["options"] == {"users": 2}
+
+    def test_table_compares_with_a_baseline(self, tmp_path):
+        recorder = runner.run([(FakeJourney(), range(2))])
+        result = report.summarise(recorder)
+        baseline = report.load(report.write(result, tmp_path))
+        baseline["steps"]["page"]["requests"] = 4
+
+        lines = report.format_table(result, baseline)
+        assert lines[0].split() == ["step", "requests", "failures", "p50", "p95", "p99", "throughput"]
+        assert lines[1].split()[:3] == ["page", "2", "(-50%)"]
+        assert lines[5].startswith("total")
+        assert lines[7].split() == ["failed", "step", "reason", "count"]
+        assert lines[8].split() == ["broken", "page", "HTTP", "500", "2"]
+        assert lines[9].split() == ["raises", "ZeroDivisionError", "2"]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_bounty_journey_completes_against_a_live_server(self, live_server):
+        world = World.seed(users=1, iterations=2)
+        contributor = world.contributors[0]
+        journey = BountyJourney(
+            world,
+            contributor,
+            manager_session=login(live_server.url, world.manager.user),
+            contributor_session=login(live_server.url, contributor.user),
+        )
+
+        recorder = runner.run([(journey, world.bounties[contributor.pk])])
+        result = report.summarise(recorder)
+
+        assert {name: row["failure_reasons"] for name, row in result["steps"].items() if row["failures"]} == {}
+        assert result["total"]["requests"] == 14
+        claims = BountyClaim.objects.filter(person=contributor)
+        assert list(claims.values_list("status", flat=True)) == [BountyClaim.Status.COMPLETED] * 2
+        assert not BountyDeliveryAttempt.objects.filter(bounty_claim__in=claims).exclude(
+            status=BountyDeliveryAttempt.BountyDeliveryStatus.APPROVED
+        ).exists()
@@ -0,0 +1,149 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from apps.product_management.models import Bounty, BountySkill, Challenge, Product
+from apps.security.models import User
+from apps.talent import matching
+from apps.talent.models import Expertise, Person, PersonSkill, Skill
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # A new chain, so the matcher reloads everything
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def terms():
+    python = Skill.objects.create(name="Python", active=True, display_boost_factor=2)
+    design = Skill.objects.create(name="Design", active=True)
+    django = Expertise.objects.create(name="Django", skill=python, fa_icon="")
+    orm = Expertise.objects.create(name="ORM", skill=python, parent=django, fa_icon="")
+    return python, design, django, orm
+
+
+@pytest.fixture
+def people():
+    people = []
+    for number in range(3):
+        user = User.objects.create_user(username=f"match-{number}", email=f"match-{number}@example.com")
+        people.append(Person.objects.create(user=user, full_name=f"Match {number}"))
+    return people
+
+
+def add_skill(owner, skill, *expertise):
+    model, field = (PersonSkill, "person") if isinstance(owner, Person) else (BountySkill, "bounty")
+    row = model.objects.create(**{field: owner, "skill": skill})
+    row.expertise.add(*expertise)
+    return row
+
+
+@pytest.fixture
+def bounties(terms):
+    python, design, django, orm = terms
+    product = Product.objects.create(name="Matching", slug="matching")
+    challenge = Challenge.objects.create(product=product, title="Match")
+    bounties = [
+        Bounty.objects.create(
+            product=product, challenge=challenge, title=title, status=Bounty.BountyStatus.OPEN, reward_type="Points"
+        )
+        for title in ("Queries", "Icons", "Closed")
+    ]
+    add_skill(bounties[0], python, orm)
+    add_skill(bounties[1], design)
+    add_skill(bounties[2], python)
+    Bounty.objects.filter(pk=bounties[2].pk).update(status=Bounty.BountyStatus.COMPLETED)
+    return bounties
+
+
+@pytest.mark.django_db
+class TestMatching:
+    def test_scores_weigh_boost_and_expertise_depth(self, terms, people, bounties, django_assert_num_queries):
+        python, design, django, orm = terms
+        add_skill(people[0], python, django, orm)
+        add_skill(people[1], python)
+        add_skill(people[2], design)
+
+        # Python weighs its boost of 2, ORM, under Django, three times that
+        assert matching.suggested_talent(bounties[0]) == [(people[0].pk, 1.0), (people[1].pk, 0.25)]
+        assert matching.recommended_bounties(people[1]) == [(bounties[0].pk, 0.25)]
+        assert matching.recommended_bounties(people[2]) == [(bounties[1].pk, 1.0)]
+        # Only open bounties are matched
+        assert matching.suggested_talent(bounties[2]) == []
+
+        # Built once, later lookups run no query
+        with django_assert_num_queries(0):
+            assert matching.suggested_talent(bounties[0], limit=1) == [(people[0].pk, 1.0)]
+
+    def test_bounty_detail_shows_suggested_talent(self, client, terms, people, bounties):
+        python, design, django, orm = terms
+        add_skill(people[0], python, django, orm)
+        add_skill(people[1], python)
+        add_skill(people[2], design)
+        bounty = bounties[0]
+
+        response = client.get(reverse("bounty-detail", args=("matching", bounty.challenge_id, bounty.pk)))
+
+        assert response.status_code == 200
+        html = response.content.decode()
+        assert "Suggested Talent" in html
+        assert html.index("Match 0") < html.index("Match 1")
+        assert "Match 2" not in html
+
+    def test_changes_reload_only_what_changed(
+        self, terms, people, bounties, django_capture_on_commit_callbacks, django_assert_num_queries
+    ):
+        python, design, django, orm = terms
+        add_skill(people[0], design)
+        assert matching.recommended_bounties(people[0]) == [(bounties[1].pk, 1.0)]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            add_skill(people[0], python, django, orm)
+        # The person's terms only
+        with django_assert_num_queries(1):
+            assert dict(matching.recommended_bounties(people[0])) == {bounties[0].pk: 1.0, bounties[1].pk: 1.0}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            bounties[0].status = Bounty.BountyStatus.CANCELLED
+            bounties[0].save()
+        with django_assert_num_queries(1):
+            assert matching.recommended_bounties(people[0]) == [(bounties[1].pk, 1.0)]
+
+    def test_concurrent_changes_all_reach_the_chain(self, terms, people, bounties):
+        matcher = matching.get_matcher()
+        add_skill(people[0], terms[1])
+        add_skill(people[1], terms[1])
+        epoch, number = matching.get_head()
+        matching.record_change([people[0].pk])
+        # Recorded by a process that read the head before the change above
+        cache.set(matching.HEAD_KEY, (epoch, number))
+        matching.record_change([people[1].pk])
+
+        assert matching.get_head() == (epoch, number + 2)
+        assert matching.get_matcher() is matcher
+        assert sorted(pk for pk, _ in matching.suggested_talent(bounties[1])) == sorted([people[0].pk, people[1].pk])
+
+    def test_lost_chain_reloads_everything(self, terms, people, bounties):
+        matching.get_matcher()
+        # A change the chain didn't see, like a bulk load
+        add_skill(people[0], terms[1])
+        assert matching.suggested_talent(bounties[1]) == []
+
+        matching.rebuild_matching()
+        assert matching.suggested_talent(bounties[1]) == [(people[0].pk, 1.0)]
+
+        add_skill(people[1], terms[1])
+        cache.clear()
+        assert len(matching.suggested_talent(bounties[1])) == 2
+
+    def test_old_matcher_reloads_everything(self, terms, people, bounties, settings):
+        matcher = matching.get_matcher()
+        add_skill(people[0], terms[1])
+        assert matching.suggested_talent(bounties[1]) == []
+
+        settings.MATCHING_MAX_AGE = 0
+        assert matching.suggested_talent(bounties[1]) == [(people[0].pk, 1.0)]
+        assert matching.get_matcher() is not matcher
@@ -0,0 +1,130 @@
+import datetime
+import threading
+
+import pytest
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.engagement import outbox
+from apps.engagement.models import Notification, OutboxEvent
+from apps.product_management.models import Competition, CompetitionEntry
+from apps.security.models import User
+from apps.talent.models import Person
+
+
+class FakeTask:
+    """Stands in for ``send_notification``, recording what was queued or failing like an unreachable broker."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.queued = []
+
+    def delay(self, notification_types, event_type, receivers, **params):
+        if self.fail:
+            raise ConnectionError("broker unreachable")
+        self.queued.append((event_type, receivers, params))
+
+
+@pytest.fixture
+def task(monkeypatch):
+    fake = FakeTask()
+    monkeypatch.setattr(outbox, "send_notification", fake)
+    return fake
+
+
+@pytest.fixture
+def competition(product, person):
+    now = timezone.now()
+    competition = Competition.objects.create(
+        product=product,
+        title="Best relay",
+        status=Competition.CompetitionStatus.ACTIVE,
+        entry_deadline=now + datetime.timedelta(days=1),
+        judging_deadline=now + datetime.timedelta(days=7),
+    )
+    CompetitionEntry.objects.create(competition=competition, submitter=person, content="SKIP LOCKED")
+    # Saving updates the status, the deadline passes without a save
+    Competition.objects.filter(pk=competition.pk).update(entry_deadline=now - datetime.timedelta(minutes=1))
+    competition.refresh_from_db()
+    return competition
+
+
+def emit_events(count):
+    for number in range(count):
+        outbox.emit(Notification.EventType.BOUNTY_CREATED, [f"person-{number}"], bounty_title=f"Bounty {number}")
+
+
+@pytest.mark.django_db
+class TestOutbox:
+    def test_transitions_write_their_event_with_the_change(self, competition, person, task):
+        user = User.objects.create_user(username="second-entrant", email="second@example.com")
+        second = Person.objects.create(user=user, full_name="Second Entrant")
+        CompetitionEntry.objects.create(competition=competition, submitter=second, content="NOWAIT")
+        CompetitionEntry.objects.create(competition=competition, submitter=person, content="Another go")
+
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                competition.update_status()
+                raise RuntimeError("the request failed later on")
+        assert not OutboxEvent.objects.exists()
+
+        competition.refresh_from_db()
+        competition.update_status()
+        # One event for every entrant, without a name so the dispatch substitutes each receiver's
+        event = OutboxEvent.objects.get()
+        assert event.event_type == Notification.EventType.COMPETITION_CLOSED
+        assert sorted(event.receivers) == sorted([person.pk, second.pk])
+        assert event.params == {"competition_title": "Best relay"}
+        # Nothing is queued until the relay runs
+        assert not task.queued
+
+        assert outbox.relay_all() == 1
+        assert task.queued == [(Notification.EventType.COMPETITION_CLOSED, event.receivers, event.params)]
+        assert not OutboxEvent.objects.exists()
+
+    def test_relay_drains_in_batches(self, task):
+        emit_events(5)
+
+        assert outbox.relay(batch_size=2) == 2
+        assert outbox.relay_all(batch_size=2) == 3
+        assert [params["bounty_title"] for _, _, params in task.queued] == [f"Bounty {number}" for number in range(5)]
+
+    def test_events_stay_while_the_broker_is_down(self, monkeypatch):
+        emit_events(2)
+        monkeypatch.setattr(outbox, "send_notification", FakeTask(fail=True))
+
+        assert outbox.relay_all() == 2
+        assert list(OutboxEvent.objects.values_list("attempts", flat=True)) == [1, 1]
+        # They wait for their retry
+        assert outbox.relay_all() == 0
+
+        task = FakeTask()
+        monkeypatch.setattr(outbox, "send_notification", task)
+        OutboxEvent.objects.update(available_at=timezone.now())
+        assert outbox.relay_all() == 2
+        assert len(task.queued) == 2
+        assert not OutboxEvent.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_relays_skip_each_others_events(task):
+    emit_events(3)
+    first = OutboxEvent.objects.order_by("id").first()
+
+    with transaction.atomic():
+        # Another relay holding the first event
+        OutboxEvent.objects.select_for_update().get(pk=first.pk)
+
+        def relay_elsewhere():
+            try:
+                outbox.relay_all()
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=relay_elsewhere)
+        thread.start()
+        thread.join(timeout=10)
+        assert not thread.is_alive(), "the relay waited for the locked event"
+
+    assert [params["bounty_title"] for _, _, params in task.queued] == ["Bounty 1", "Bounty 2"]
+    assert list(OutboxEvent.objects.values_list("pk", flat=True)) == [first.pk]
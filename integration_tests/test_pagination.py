@@ -0,0 +1,49 @@
+import pytest
+
+from apps.common.pagination import decode_cursor, encode_cursor, paginate_by_cursor
+from apps.product_management.models import Product
+
+
+@pytest.fixture
+def products():
+    products = [Product.objects.create(name=f"Product {i}", slug=f"product-{i}") for i in range(7)]
+    # Rows from before created_at was filled in
+    Product.objects.filter(pk__in=[products[1].pk, products[4].pk]).update(created_at=None)
+    return list(Product.objects.all())
+
+
+def walk(queryset, size, descending):
+    rows, cursor = [], None
+    while True:
+        page = paginate_by_cursor(queryset, cursor, size, descending)
+        rows += page.object_list
+        if not page.has_next():
+            return rows
+        cursor = decode_cursor(page.next_cursor)
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+    @pytest.mark.parametrize("descending", [True, False])
+    @pytest.mark.parametrize("size", [1, 2, 3, 10])
+    def test_every_row_is_visited_once_in_order(self, products, size, descending):
+        undated = sorted((p for p in products if p.created_at is None), key=lambda p: p.pk, reverse=descending)
+        dated = sorted(
+            (p for p in products if p.created_at is not None), key=lambda p: (p.created_at, p.pk), reverse=descending
+        )
+        # Like PostgreSQL, NULLs sort last ascending and first descending
+        expected = undated + dated if descending else dated + undated
+
+        assert walk(Product.objects.all(), size, descending) == expected
+
+    def test_later_pages_take_one_query(self, products, django_assert_num_queries):
+        newest = max((p for p in products if p.created_at is not None), key=lambda p: (p.created_at, p.pk))
+        cursor = decode_cursor(encode_cursor(newest.created_at, newest.pk))
+
+        with django_assert_num_queries(1):
+            page = paginate_by_cursor(Product.objects.all(), cursor, 2, descending=True)
+        assert page.has_previous() and page.has_next()
+
+    def test_malformed_cursors_are_ignored(self):
+        assert decode_cursor("not a cursor") is None
+        assert decode_cursor(None) is None
@@ -0,0 +1,61 @@
+import pytest
+from django.core.cache import cache
+
+from apps.product_management.models import Challenge, Product
+from apps.product_management.utils import has_product_modify_permission
+from apps.security.models import ProductRoleAssignment
+from apps.security.permissions import get_role_assignments, role_assignments_scope
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def products():
+    return [Product.objects.create(name=f"Product {i}", slug=f"product-{i}") for i in range(3)]
+
+
+@pytest.mark.django_db
+class TestRoleAssignments:
+    def test_roles_are_loaded_once_per_request(self, user, person, products, django_assert_num_queries):
+        ProductRoleAssignment.objects.create(
+            person=person, product=products[0], role=ProductRoleAssignment.ProductRoles.ADMIN
+        )
+        ProductRoleAssignment.objects.create(
+            person=person, product=products[1], role=ProductRoleAssignment.ProductRoles.CONTRIBUTOR
+        )
+        challenge = Challenge.objects.create(product=products[0], title="Challenge")
+
+        with role_assignments_scope(), django_assert_num_queries(2):
+            assert has_product_modify_permission(user, products[0])
+            assert not has_product_modify_permission(user, products[1])
+            assert not has_product_modify_permission(user, products[2])
+            assert challenge.can_delete_challenge(person)
+
+        # Later requests are served from the shared cache
+        with role_assignments_scope(), django_assert_num_queries(0):
+            assert has_product_modify_permission(user, products[0])
+
+    def test_changes_invalidate_the_cache(self, person, products, django_capture_on_commit_callbacks):
+        assert not get_role_assignments(person).can_modify_product(products[0])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            assignment = ProductRoleAssignment.objects.create(
+                person=person, product=products[0], role=ProductRoleAssignment.ProductRoles.MANAGER
+            )
+        assert get_role_assignments(person).can_modify_product(products[0])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            assignment.role = ProductRoleAssignment.ProductRoles.CONTRIBUTOR
+            assignment.save()
+        assert not get_role_assignments(person).can_modify_product(products[0])
+
+    def test_most_privileged_assignment_counts(self, person, products):
+        for role in [ProductRoleAssignment.ProductRoles.ADMIN, ProductRoleAssignment.ProductRoles.CONTRIBUTOR]:
+            ProductRoleAssignment.objects.create(person=person, product=products[0], role=role)
+
+        assert get_role_assignments(person).product_role(products[0]) == ProductRoleAssignment.ProductRoles.ADMIN
@@ -0,0 +1,105 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.product_management.models import Bounty, Challenge, Product
+from apps.security.models import User
+from apps.talent.models import BountyClaim, Person, PersonPointsRun
+from apps.talent.points import calculate_person_points
+
+
+@pytest.fixture
+def challenge():
+    product = Product.objects.create(name="Points", slug="points")
+    return Challenge.objects.create(product=product, title="Points")
+
+
+def make_people(count, start=0):
+    return [
+        Person.objects.create(
+            user=User.objects.create_user(username=f"points-{number}"), full_name=f"Points {number}", headline=""
+        )
+        for number in range(start, start + count)
+    ]
+
+
+def claim(person, challenge, status=BountyClaim.Status.COMPLETED, reward_type="Points", **reward):
+    bounty = Bounty.objects.create(
+        product=challenge.product, challenge=challenge, title="Bounty", reward_type=reward_type, **reward
+    )
+    return BountyClaim.objects.create(bounty=bounty, person=person, status=status)
+
+
+def points_of(people):
+    people = Person.objects.filter(pk__in=[person.pk for person in people]).order_by("full_name")
+    return list(people.values_list("points", flat=True))
+
+
+@pytest.mark.django_db
+class TestPersonPoints:
+    def test_points_are_the_completed_points_rewards(self, challenge):
+        people = make_people(3)
+        claim(people[0], challenge, reward_in_points=10)
+        claim(people[0], challenge, reward_in_points=10, final_reward_in_points=15)
+        claim(people[0], challenge, status=BountyClaim.Status.ACTIVE, reward_in_points=100)
+        claim(people[1], challenge, reward_type="USD", reward_in_usd_cents=5000)
+        Person.objects.filter(pk=people[2].pk).update(points=42)
+
+        call_command("calculate_person_points")
+
+        assert points_of(people) == [25, 0, 0]
+        run = PersonPointsRun.objects.get()
+        assert (run.incremental, run.updated) == (False, 2)
+
+    def test_runs_take_the_same_queries_for_any_number_of_people(self, challenge, django_assert_num_queries):
+        for person in make_people(2):
+            claim(person, challenge, reward_in_points=5)
+        # The savepoint, the update and recording the run
+        with django_assert_num_queries(4):
+            calculate_person_points()
+
+        for person in make_people(20, start=2):
+            claim(person, challenge, reward_in_points=5)
+        with django_assert_num_queries(4):
+            assert calculate_person_points().updated == 20
+
+    def test_incremental_runs_only_touch_changed_claims(self, challenge):
+        people = make_people(3)
+        claims = [claim(person, challenge, reward_in_points=10) for person in people]
+        calculate_person_points(as_of=timezone.now())
+        assert points_of(people) == [10, 10, 10]
+
+        # Changed without touching a claim, only a full run sees it
+        Person.objects.filter(pk=people[2].pk).update(points=0)
+        claims[0].status = BountyClaim.Status.FAILED
+        claims[0].save()
+        bounty = claims[1].bounty
+        bounty.final_reward_in_points = 30
+        bounty.save()
+
+        run = calculate_person_points(incremental=True)
+        assert (run.incremental, run.updated) == (True, 2)
+        assert points_of(people) == [0, 30, 0]
+
+        assert calculate_person_points().updated == 1
+        assert points_of(people) == [0, 30, 10]
+
+    def test_incremental_runs_see_claims_failed_by_accepting_another(self, client, challenge):
+        people = make_people(2)
+        claim(people[0], challenge, reward_in_points=10)
+        accepted = claim(people[1], challenge, status=BountyClaim.Status.ACTIVE, reward_in_points=10)
+        calculate_person_points(as_of=timezone.now())
+        assert points_of(people) == [10, 0]
+
+        response = client.get(reverse("portal-bounties-action", args=(accepted.pk,)), {"action": "accept"})
+
+        assert response.status_code == 302
+        assert calculate_person_points(incremental=True).updated == 1
+        assert points_of(people) == [0, 0]
+
+    def test_first_incremental_run_is_full(self, challenge):
+        people = make_people(1)
+        claim(people[0], challenge, reward_in_points=7)
+        assert not calculate_person_points(incremental=True).incremental
+        assert points_of(people) == [7]
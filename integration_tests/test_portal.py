@@ -0,0 +1,115 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.product_management.models import Bounty, BountySkill, Challenge, Product
+from apps.product_management.views import portal
+from apps.security.models import ProductRoleAssignment
+from apps.talent.models import BountyBid, BountyClaim, Expertise, Person, Skill
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def fresh_user(user):
+    """The user as a new request would load it, without a cached person."""
+    return get_user_model().objects.get(pk=user.pk)
+
+
+def load_page(view_class, user, method="get", data=None, **kwargs):
+    """Runs the view's context loading and reads what its template reads. Returns (context, queries)."""
+    request = getattr(RequestFactory(), method)("/", data or {})
+    request.user = user
+    request.htmx = False
+    view = view_class()
+    view.setup(request, **kwargs)
+    if hasattr(view, "get_object") and "pk" in kwargs:
+        view.object = view.get_object()
+    with CaptureQueriesContext(connection) as queries:
+        context = view.get_context_data()
+        for product in context.get("products", []):
+            product.name
+        for claim in context.get("active_bounty_claims", context.get("bounty_claims", [])):
+            (claim.bounty.challenge.product.name, claim.expected_finish_date, claim.bounty.get_expertise_as_str())
+        for role in context.get("product_users", []):
+            str(role.person)
+    return context, len(queries)
+
+
+def add_products(person, count):
+    for _ in range(count):
+        index = Product.objects.count()
+        product = Product.objects.create(name=f"Product {index}", slug=f"product-{index}")
+        ProductRoleAssignment.objects.create(
+            person=person, product=product, role=ProductRoleAssignment.ProductRoles.ADMIN
+        )
+        challenge = Challenge.objects.create(product=product, title=f"Challenge {index}")
+        bounty = Bounty.objects.create(product=product, challenge=challenge, title=f"Bounty {index}")
+        skill = Skill.objects.create(name=f"Skill {index}")
+        bounty_skill = BountySkill.objects.create(bounty=bounty, skill=skill)
+        bounty_skill.expertise.add(Expertise.objects.create(name=f"Expertise {index}", skill=skill, fa_icon=""))
+        bid = BountyBid.objects.create(
+            bounty=bounty, person=person, amount_in_points=100, expected_finish_date=timezone.now().date()
+        )
+        BountyClaim.objects.create(bounty=bounty, person=person, accepted_bid=bid)
+        other = get_user_model().objects.create_user(username=f"user-{index}", password="testpass123")
+        ProductRoleAssignment.objects.create(
+            person=Person.objects.create(user=other, full_name=f"User {index}"),
+            product=Product.objects.get(slug="product-0"),
+            role=ProductRoleAssignment.ProductRoles.CONTRIBUTOR,
+        )
+
+
+@pytest.mark.django_db
+class TestPortalQueryBudget:
+    @pytest.mark.parametrize(
+        "view_class, budget",
+        [
+            # person, product and organisation roles, products, claims and their three prefetches, and the
+            # matcher's two loads as the cache was cleared
+            (portal.PortalDashboardView, 10),
+            # person, owned products, claims and their three prefetches
+            (portal.ManageBountiesView, 6),
+            # person, owned products, product, users
+            (portal.ManageUsersView, 4),
+        ],
+    )
+    def test_pages_run_a_fixed_number_of_queries(self, user, person, view_class, budget):
+        add_products(person, 1)
+        kwargs = {"product_slug": "product-0"} if view_class is portal.ManageUsersView else {}
+        _, queries = load_page(view_class, fresh_user(user), **kwargs)
+        assert queries == budget
+
+        add_products(person, 4)
+        cache.clear()
+        context, queries = load_page(view_class, fresh_user(user), **kwargs)
+        assert queries == budget
+        if view_class is portal.PortalDashboardView:
+            assert len(context["products"]) == len(context["active_bounty_claims"]) == 5
+
+    def test_dashboard_product_is_looked_up_once(self, user, person):
+        add_products(person, 1)
+        context, queries = load_page(portal.PortalDashboardView, fresh_user(user), product_slug="product-0")
+        assert context["product"].slug == "product-0"
+        assert queries == 11
+
+        context, _ = load_page(portal.PortalDashboardView, fresh_user(user), product_slug="missing")
+        assert "product" not in context
+
+    def test_product_is_memoised_for_the_request(self, user, person):
+        add_products(person, 1)
+        request = RequestFactory().get("/")
+        request.user = fresh_user(user)
+        data = portal.PortalData.for_request(request)
+
+        with CaptureQueriesContext(connection) as queries:
+            assert portal.PortalData.for_request(request).get_product("product-0") is data.get_product("product-0")
+        assert len(queries) == 1
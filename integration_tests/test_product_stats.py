@@ -0,0 +1,83 @@
+import pytest
+
+from apps.product_management.models import Bounty, Challenge, ChallengeStats, Initiative, Product, ProductStats
+from apps.product_management.stats import rebuild_stats
+
+
+def create_bounty(challenge, status=Bounty.BountyStatus.OPEN, points=100):
+    return Bounty.objects.create(
+        product=challenge.product,
+        challenge=challenge,
+        title="Bounty",
+        description="",
+        status=status,
+        reward_type="Points",
+        reward_in_points=points,
+    )
+
+
+def stats_values(model, pk):
+    return model.objects.filter(pk=pk).values().get()
+
+
+@pytest.mark.django_db
+class TestProductStats:
+    def test_counters_follow_changes(self, product, challenge):
+        open_bounty = create_bounty(challenge, points=100)
+        create_bounty(challenge, status=Bounty.BountyStatus.DRAFT, points=50)
+        Initiative.objects.create(name="Initiative", product=product)
+
+        product_stats = ProductStats.objects.get(pk=product.pk)
+        assert (product_stats.open_bounties, product_stats.open_reward_in_points) == (1, 100)
+        assert (product_stats.draft_challenges, product_stats.initiatives) == (1, 1)
+        challenge_stats = ChallengeStats.objects.get(pk=challenge.pk)
+        assert (challenge_stats.bounties, challenge_stats.open_bounties) == (2, 1)
+        assert challenge_stats.reward_in_points == 150
+
+        open_bounty.status = Bounty.BountyStatus.IN_PROGRESS
+        open_bounty.reward_in_points = 30
+        open_bounty.save()
+        challenge.status = Challenge.ChallengeStatus.ACTIVE
+        challenge.save()
+
+        product_stats.refresh_from_db()
+        assert (product_stats.open_bounties, product_stats.open_reward_in_points) == (0, 0)
+        assert (product_stats.draft_challenges, product_stats.active_challenges) == (0, 1)
+        assert ChallengeStats.objects.get(pk=challenge.pk).reward_in_points == 80
+
+        open_bounty.delete()
+        assert Challenge.objects.get(pk=challenge.pk).total_bounties == 1
+
+    def test_moving_a_bounty_updates_both_challenges(self, product, challenge):
+        other = Challenge.objects.create(product=product, title="Other")
+        bounty = create_bounty(challenge)
+
+        bounty.challenge = other
+        bounty.save()
+
+        assert ChallengeStats.objects.get(pk=challenge.pk).bounties == 0
+        assert ChallengeStats.objects.get(pk=other.pk).bounties == 1
+
+    def test_rebuild_matches_incremental_counters(self, product, challenge):
+        for status in Bounty.BountyStatus.values:
+            create_bounty(challenge, status=status)
+        Initiative.objects.create(name="Initiative", product=product)
+        expected = stats_values(ProductStats, product.pk), stats_values(ChallengeStats, challenge.pk)
+
+        # Bulk updates skip the signals and leave the counters stale until rebuilt
+        Bounty.objects.update(reward_in_points=1)
+        ProductStats.objects.all().delete()
+        ChallengeStats.objects.update(bounties=0)
+        Bounty.objects.update(reward_in_points=100)
+
+        assert rebuild_stats() == (Product.objects.count(), Challenge.objects.count())
+        assert (stats_values(ProductStats, product.pk), stats_values(ChallengeStats, challenge.pk)) == expected
+
+    def test_missing_rows_are_computed_on_first_use(self, product, challenge, django_assert_num_queries):
+        create_bounty(challenge)
+        ProductStats.objects.all().delete()
+        product = Product.objects.select_related("stats").get(pk=product.pk)
+
+        assert product.get_stats().open_bounties == 1
+        with django_assert_num_queries(0):
+            assert product.get_stats().open_bounties == 1
@@ -0,0 +1,76 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.product_management.models import ProductArea, ProductTree
+from apps.product_management.tree import serialize_product_tree, serialize_tree
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def product_tree(product):
+    return ProductTree.objects.create(name="Tree", product=product)
+
+
+def names(trees):
+    return [(node["name"], names(node["children"])) for node in trees]
+
+
+def add_chain(parent, depth):
+    for level in range(depth):
+        parent = parent.add_child(name=f"Level {level}")
+    return parent
+
+
+@pytest.mark.django_db
+class TestProductTree:
+    def test_serializes_deep_trees_in_one_query(self, product_tree):
+        root = ProductArea.add_root(name="Root", product_tree=product_tree)
+        add_chain(root, 20)
+        root.refresh_from_db()
+        sibling = root.add_child(name="Sibling")
+        ProductArea.add_root(name="Elsewhere")
+
+        with CaptureQueriesContext(connection) as queries:
+            trees = serialize_product_tree(product_tree)
+        assert len(queries) == 1
+
+        assert [node["name"] for node in trees] == ["Root"]
+        assert [child["name"] for child in trees[0]["children"]] == ["Level 0", "Sibling"]
+        node, depth = trees[0], 0
+        while node["children"]:
+            node, depth = node["children"][0], depth + 1
+        assert depth == 20
+
+        with CaptureQueriesContext(connection) as queries:
+            assert serialize_tree(sibling) == trees[0]["children"][1]
+        assert len(queries) == 1
+
+    def test_cached_until_areas_change(self, product_tree):
+        root = ProductArea.add_root(name="Root", product_tree=product_tree)
+        child = root.add_child(name="Child")
+        serialize_product_tree(product_tree)
+
+        with CaptureQueriesContext(connection) as queries:
+            serialize_product_tree(product_tree)
+        assert len(queries) == 0
+
+        grandchild = child.add_child(name="Grandchild")
+        assert names(serialize_product_tree(product_tree)) == [("Root", [("Child", [("Grandchild", [])])])]
+
+        root.refresh_from_db()
+        other = root.add_child(name="Other")
+        ProductArea.objects.get(pk=grandchild.pk).move(other, "last-child")
+        assert names(serialize_product_tree(product_tree)) == [
+            ("Root", [("Child", []), ("Other", [("Grandchild", [])])])
+        ]
+
+        ProductArea.objects.get(pk=other.pk).delete()
+        assert names(serialize_product_tree(product_tree)) == [("Root", [("Child", [])])]
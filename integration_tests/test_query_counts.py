@@ -0,0 +1,442 @@
+"""
+Query-count regression suite for every named route in ``apps/product_management/urls.py``.
+
+A product is seeded with 10, then 100, then 1,000 rows of everything its pages list (challenges, bounties, claims,
+ideas, bugs, product areas, users, ...) and every route is requested at each scale, logged in as the product's
+admin. A route must run the same number of queries at every scale, so a query per listed row fails the suite,
+and no more queries than ``query_counts.json`` records for it. Its response times must stay within
+``QUERY_BASELINE_TIME_TOLERANCE`` times the recorded ones (plus ``TIME_SLACK_MS`` of noise).
+
+After a change that intentionally moves these numbers, rewrite the baseline with::
+
+    UPDATE_QUERY_BASELINE=1 python -m pytest integration_tests/test_query_counts.py
+
+Every named route has to be listed in ``ROUTES`` with how to build its URL from the seeded product, so a new route
+can't silently go unguarded. Routes that can't be measured yet are also listed in ``BROKEN`` with the reason, and
+fail the suite once they respond, to get them off that list and into the baseline. The views of the broken routes
+that matter most are measured at the context level in ``VIEWS`` meanwhile, the way ``test_portal`` loads a page: the
+view's context is loaded and what its template reads is read, under ``context:<view>`` in the baseline. Pages outside
+this app that list the product's rows are requested from ``OTHER_ROUTES``.
+"""
+import json
+import os
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+
+import pytest
+
+from apps.common.fields import generate_ids
+from apps.product_management import urls
+from apps.product_management.models import (
+    Bounty,
+    BountySkill,
+    Bug,
+    Challenge,
+    Idea,
+    IdeaVote,
+    Initiative,
+    ProductArea,
+    ProductContributorAgreementTemplate,
+    ProductTree,
+)
+from apps.product_management.search import rebuild_search_documents
+from apps.product_management.stats import rebuild_stats
+from apps.product_management.views.challenges import ChallengeDetailView
+from apps.security.models import ProductRoleAssignment, User
+from apps.talent.models import BountyBid, BountyClaim, BountyDeliveryAttempt, Expertise, Person, Skill
+
+SCALES = (10, 100, 1000)
+BASELINE_PATH = Path(__file__).with_name("query_counts.json")
+TIME_TOLERANCE = float(os.environ.get("QUERY_BASELINE_TIME_TOLERANCE", 2.0))
+TIME_SLACK_MS = 50
+TIMED_RUNS = 3
+
+
+def bulk_create(model, objects):
+    """``bulk_create`` with the Base58 primary keys assigned up front, ``pre_save`` only does it for single saves."""
+    for obj, pk in zip(objects, generate_ids(len(objects))):
+        obj.pk = pk
+    return model.objects.bulk_create(objects)
+
+
+class SeededProduct:
+    """A product owned and administered by ``person``, grown with ``grow_to``."""
+
+    def __init__(self, product, person):
+        self.product = product
+        self.person = person
+        self.size = 0
+
+        product.person = person
+        product.slug = product.slug or "seeded-product"
+        product.save()
+        ProductRoleAssignment.objects.create(
+            person=person, product=product, role=ProductRoleAssignment.ProductRoles.ADMIN
+        )
+        self.skill = Skill.objects.create(name="Skill", active=True, selectable=True)
+        self.expertise = Expertise.objects.create(name="Expertise", skill=self.skill, fa_icon="")
+        self.initiative = Initiative.objects.create(name="Initiative", product=product)
+        self.product_tree = ProductTree.objects.create(name="Tree", product=product)
+        self.root_area = ProductArea.add_root(name="Root", product_tree=self.product_tree)
+
+    def grow_to(self, size):
+        """Adds rows until the product has ``size`` of each kind."""
+        count, offset = size - self.size, self.size
+        indexes = range(offset, size)
+        product = self.product
+
+        challenges = bulk_create(Challenge, [
+            Challenge(
+                product=product,
+                initiative=self.initiative,
+                title=f"Challenge {index}",
+                description="",
+                short_description="",
+                status=Challenge.ChallengeStatus.ACTIVE,
+            )
+            for index in indexes
+        ])
+        bounties = bulk_create(Bounty, [
+            Bounty(
+                product=product,
+                challenge=challenge,
+                title=f"Bounty {index}",
+                description="",
+                status=Bounty.BountyStatus.OPEN,
+                reward_type="Points",
+                reward_in_points=10,
+            )
+            for index, challenge in zip(indexes, challenges)
+        ])
+        bounty_skills = bulk_create(BountySkill, [BountySkill(bounty=bounty, skill=self.skill) for bounty in bounties])
+        BountySkill.expertise.through.objects.bulk_create([
+            BountySkill.expertise.through(bountyskill_id=bounty_skill.pk, expertise_id=self.expertise.pk)
+            for bounty_skill in bounty_skills
+        ])
+        bids = bulk_create(BountyBid, [
+            BountyBid(
+                bounty=bounty,
+                person=self.person,
+                amount_in_points=10,
+                expected_finish_date=timezone.now().date(),
+                status=BountyBid.Status.ACCEPTED,
+            )
+            for bounty in bounties
+        ])
+        # Every other claim is completed, for the person's portfolio
+        claims = bulk_create(BountyClaim, [
+            BountyClaim(
+                bounty=bid.bounty,
+                person=self.person,
+                accepted_bid=bid,
+                status=BountyClaim.Status.COMPLETED if index % 2 else BountyClaim.Status.ACTIVE,
+            )
+            for index, bid in zip(indexes, bids)
+        ])
+        bulk_create(BountyDeliveryAttempt, [
+            BountyDeliveryAttempt(bounty_claim=claim, delivery_message="Done") for claim in claims
+        ])
+
+        ideas = bulk_create(Idea, [
+            Idea(product=product, person=self.person, title=f"Idea {index}", description="", vote_count=1)
+            for index in indexes
+        ])
+        bulk_create(IdeaVote, [IdeaVote(idea=idea, voter=self.person) for idea in ideas])
+        bulk_create(Bug, [
+            Bug(product=product, person=self.person, title=f"Bug {index}", description="") for index in indexes
+        ])
+        bulk_create(ProductContributorAgreementTemplate, [
+            ProductContributorAgreementTemplate(
+                product=product, title=f"Agreement {index}", content="", effective_date=timezone.now().date()
+            )
+            for index in indexes
+        ])
+
+        users = bulk_create(User, [
+            User(username=f"member-{index}", email=f"member-{index}@example.com") for index in indexes
+        ])
+        people = bulk_create(Person, [Person(user=user, full_name=user.username) for user in users])
+        bulk_create(ProductRoleAssignment, [
+            ProductRoleAssignment(person=person, product=product, role=ProductRoleAssignment.ProductRoles.CONTRIBUTOR)
+            for person in people
+        ])
+
+        root = self.root_area
+        bulk_create(ProductArea, [
+            ProductArea(name=f"Area {index}", path=ProductArea._get_path(root.path, 2, index + 1), depth=2)
+            for index in indexes
+        ])
+        ProductArea.objects.filter(pk=root.pk).update(numchild=size)
+
+        if offset == 0:
+            self.challenge, self.bounty, self.claim = challenges[0], bounties[0], claims[0]
+            self.idea = ideas[0]
+            self.bug = Bug.objects.filter(product=product).first()
+            self.agreement = ProductContributorAgreementTemplate.objects.filter(product=product).first()
+            self.member = ProductRoleAssignment.objects.get(person=people[0])
+            self.area = ProductArea.objects.get(path=ProductArea._get_path(root.path, 2, 1))
+
+        # What bulk loads are documented to need, then cold caches for the first request
+        rebuild_stats()
+        rebuild_search_documents()
+        cache.clear()
+        self.size = size
+        return count
+
+
+ROUTES = {
+    "bounties": lambda seeded: {},
+    "product_bounties": lambda seeded: {"product_slug": seeded.product.slug},
+    "bounty-detail": lambda seeded: {
+        "product_slug": seeded.product.slug, "challenge_id": seeded.challenge.pk, "pk": seeded.bounty.pk
+    },
+    "create-bounty": lambda seeded: {"product_slug": seeded.product.slug, "challenge_id": seeded.challenge.pk},
+    "update-bounty": lambda seeded: {
+        "product_slug": seeded.product.slug, "challenge_id": seeded.challenge.pk, "pk": seeded.bounty.pk
+    },
+    "delete-bounty": lambda seeded: {
+        "product_slug": seeded.product.slug, "challenge_id": seeded.challenge.pk, "pk": seeded.bounty.pk
+    },
+    "delete-bounty-claim": lambda seeded: {"pk": seeded.claim.pk},
+    "challenges": lambda seeded: {},
+    "create-challenge": lambda seeded: {"product_slug": seeded.product.slug},
+    "update-challenge": lambda seeded: {"product_slug": seeded.product.slug, "pk": seeded.challenge.pk},
+    "delete-challenge": lambda seeded: {"product_slug": seeded.product.slug, "pk": seeded.challenge.pk},
+    "challenge_detail": lambda seeded: {"product_slug": seeded.product.slug, "pk": seeded.challenge.pk},
+    "product_challenges": lambda seeded: {"product_slug": seeded.product.slug},
+    "products": lambda seeded: {},
+    "create-product": lambda seeded: {},
+    "update-product": lambda seeded: {"pk": seeded.product.pk},
+    "product_detail": lambda seeded: {"product_slug": seeded.product.slug},
+    "product_summary": lambda seeded: {"product_slug": seeded.product.slug},
+    "product_tree": lambda seeded: {"product_slug": seeded.product.slug},
+    "product_people": lambda seeded: {"product_slug": seeded.product.slug},
+    "create-organisation": lambda seeded: {},
+    "product_initiatives": lambda seeded: {"product_slug": seeded.product.slug},
+    "create-initiative": lambda seeded: {"product_slug": seeded.product.slug},
+    "initiative_detail": lambda seeded: {"product_slug": seeded.product.slug, "pk": seeded.initiative.pk},
+    "dashboard-home": lambda seeded: {},
+    "product-portal": lambda seeded: {"product_slug": seeded.product.slug, "default_tab": 0},
+    "portal-home": lambda seeded: {},
+    "manage-bounties": lambda seeded: {},
+    "portal-bounty-requests": lambda seeded: {},
+    "portal-product-detail": lambda seeded: {"product_slug": seeded.product.slug, "default_tab": 0},
+    "portal-product-challenges": lambda seeded: {"product_slug": seeded.product.slug},
+    "portal-product-challenge-filter": lambda seeded: {"product_slug": seeded.product.slug},
+    "portal-product-bounties": lambda seeded: {"product_slug": seeded.product.slug},
+    "portal-bounties-action": lambda seeded: {"pk": seeded.claim.pk},
+    "portal-product-bounty-filter": lambda seeded: {"product_slug": seeded.product.slug},
+    "portal-review-work": lambda seeded: {"product_slug": seeded.product.slug},
+    "portal-contributor-agreement-templates": lambda seeded: {"product_slug": seeded.product.slug},
+    "manage-users": lambda seeded: {"product_slug": seeded.product.slug},
+    "add-product-user": lambda seeded: {"product_slug": seeded.product.slug},
+    "update-product-user": lambda seeded: {"product_slug": seeded.product.slug, "pk": seeded.member.pk},
+    "product-setting": lambda seeded: {"pk": seeded.product.pk},
+    "product_ideas_bugs": lambda seeded: {"product_slug": seeded.product.slug},
+    "product_idea_list": lambda seeded: {"product_slug": seeded.product.slug},
+    "product_bug_list": lambda seeded: {"product_slug": seeded.product.slug},
+    "add_product_idea": lambda seeded: {"product_slug": seeded.product.slug},
+    "product_idea_detail": lambda seeded: {"product_slug": seeded.product.slug, "pk": seeded.idea.pk},
+    "update_product_idea": lambda seeded: {"product_slug": seeded.product.slug, "pk": seeded.idea.pk},
+    "add_product_bug": lambda seeded: {"product_slug": seeded.product.slug},
+    "product_bug_detail": lambda seeded: {"product_slug": seeded.product.slug, "pk": seeded.bug.pk},
+    "update_product_bug": lambda seeded: {"product_slug": seeded.product.slug, "pk": seeded.bug.pk},
+    "cast-vote-for-idea": lambda seeded: {"pk": seeded.idea.pk},
+    "product_area": lambda seeded: {"product_slug": seeded.product.slug},
+    "product_area_update": lambda seeded: {"product_slug": seeded.product.slug, "pk": seeded.area.pk},
+    "product_area_detail": lambda seeded: {"product_slug": seeded.product.slug, "pk": seeded.area.pk},
+    "create-capability": lambda seeded: {"product_slug": seeded.product.slug},
+    "create-contributor-agreement-template": lambda seeded: {"product_slug": seeded.product.slug},
+    "contributor-agreement-template-detail": lambda seeded: {
+        "product_slug": seeded.product.slug, "pk": seeded.agreement.pk
+    },
+}
+
+# Routes in ROUTES that fail before any query budget applies, with the reason. They are still requested: once one
+# responds, the suite fails until it is taken off this list.
+BROKEN = {
+    "create-bounty": "template reads BountyForm.points",
+    "update-bounty": "template reads BountyForm.points",
+    "delete-bounty": "missing product_management/bounty_confirm_delete.html",
+    "delete-bounty-claim": "missing talent/bountyclaim_confirm_delete.html",
+    "create-challenge": "template reads an undefined bounty_formset",
+    "update-challenge": "template reads ChallengeForm.reward_type",
+    "delete-challenge": "missing product_management/delete_challenge.html",
+    "challenge_detail": "template reads Challenge.created_by, which doesn't exist",
+    "create-product": "form reads a content_type field Product no longer has",
+    "update-product": "form reads a content_type field Product no longer has",
+    "product_summary": "template reverses the missing product-dashboard route",
+    "product_tree": "canopy routes take integer ids, product areas have Base58 ones",
+    "create-organisation": "template reads OrganisationForm.username",
+    "initiative_detail": "template reads Challenge.bounty_set, the relation is named bounties",
+    "dashboard-home": "template reverses the missing dashboard-product-detail route",
+    "product-portal": "template reverses the missing dashboard-product-detail route",
+    "portal-home": "template reverses the missing dashboard-product-detail route",
+    "portal-bounty-requests": "template calls BountyClaim.get_challenge_detail_url, which doesn't exist",
+    "portal-product-detail": "template reverses the missing dashboard-product-challenges route",
+    "portal-product-challenges": "missing product_management/dashboard/manage_challenges.html",
+    "portal-product-challenge-filter": "missing product_management/dashboard/challenge_table.html",
+    "portal-product-bounties": "filters on BountyClaim.Status.REQUESTED, which doesn't exist",
+    "portal-product-bounty-filter": "missing product_management/dashboard/bounty_table.html",
+    "portal-review-work": "missing product_management/dashboard/partials/review_work_table.html",
+    "product-setting": "ProductSettingView has neither fields nor form_class",
+    "product_idea_detail": "template reverses update_product_idea without the idea id",
+    "product_bug_detail": "template reverses update_product_bug without the bug id",
+    "product_area_update": "template reads an undefined attachment_formset",
+    "product_area_detail": "template reads an undefined attachment_formset",
+    "create-capability": "template reads ProductAreaForm.root",
+    "create-contributor-agreement-template": "missing portal/create_contributor_agreement_template.html",
+    "contributor-agreement-template-detail": "missing portal/contributor_agreement_template_detail.html",
+}
+
+OTHER_ROUTES = {
+    "portfolio": lambda seeded: {"username": seeded.person.user.username},
+}
+
+
+def read_challenge_detail(context):
+    for bounty in context["bounties"]:
+        (bounty.title, bounty.status)
+    context["agreement_template"]
+
+
+# The views of broken routes measured at the context level, with how to build their kwargs and what their
+# templates read
+VIEWS = {
+    "ChallengeDetailView": (ChallengeDetailView, ROUTES["challenge_detail"], read_challenge_detail),
+}
+
+
+def named_routes():
+    return {pattern.name for pattern in urls.urlpatterns if isinstance(pattern, URLPattern) and pattern.name}
+
+
+def request(client, url):
+    """(status code or exception name, queries, fastest of TIMED_RUNS in ms), after one warm-up request."""
+    try:
+        client.get(url)
+        timings = []
+        for _ in range(TIMED_RUNS):
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = client.get(url)
+                timings.append((time.perf_counter() - start) * 1000)
+    except Exception as error:
+        return type(error).__name__, None, None
+    return response.status_code, len(queries), min(timings)
+
+
+def load_context(view_class, user, read, **kwargs):
+    """
+    (200 or exception name, queries, fastest of TIMED_RUNS in ms) of loading the view's context and reading what its
+    template reads, after one warm-up load. The user is loaded afresh each time, as a new request would.
+    """
+
+    def load():
+        request = RequestFactory().get("/")
+        request.user = get_user_model().objects.get(pk=user.pk)
+        request.htmx = False
+        view = view_class()
+        view.setup(request, **kwargs)
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            view.object = view.get_object()
+            read(view.get_context_data())
+            ms = (time.perf_counter() - start) * 1000
+        return len(queries), ms
+
+    try:
+        load()
+        runs = [load() for _ in range(TIMED_RUNS)]
+    except Exception as error:
+        return type(error).__name__, None, None
+    return 200, runs[-1][0], min(ms for _, ms in runs)
+
+
+def succeeded(measured):
+    return isinstance(measured["status"], int) and measured["status"] < 500
+
+
+def load_baseline():
+    if BASELINE_PATH.exists():
+        return json.loads(BASELINE_PATH.read_text())
+    return {}
+
+
+def write_baseline(results):
+    baseline = {
+        name: {
+            "queries": max(measured["queries"] for measured in scales.values()),
+            "ms": {str(scale): round(measured["ms"], 2) for scale, measured in scales.items()},
+        }
+        for name, scales in sorted(results.items())
+        if all(succeeded(measured) for measured in scales.values())
+    }
+    BASELINE_PATH.write_text(json.dumps(baseline, indent=2) + "\n")
+
+
+def regressions(name, scales, baseline):
+    """Why the measurements of route ``name`` fail, if they do."""
+    problems = []
+    failed = {scale: measured["status"] for scale, measured in scales.items() if not succeeded(measured)}
+    if failed:
+        return [f"{name}: failed with {failed}"]
+
+    counts = {scale: measured["queries"] for scale, measured in scales.items()}
+    if len(set(counts.values())) > 1:
+        problems.append(f"{name}: query count grows with related rows {counts}")
+
+    recorded = baseline.get(name)
+    if recorded is None:
+        problems.append(f"{name}: missing from {BASELINE_PATH.name}")
+        return problems
+    if max(counts.values()) > recorded["queries"]:
+        problems.append(f"{name}: {max(counts.values())} queries, the baseline allows {recorded['queries']}")
+    for scale, measured in scales.items():
+        allowed = recorded["ms"].get(str(scale), 0) * TIME_TOLERANCE + TIME_SLACK_MS
+        if measured["ms"] > allowed:
+            problems.append(f"{name}: {measured['ms']:.1f} ms at {scale} rows, the baseline allows {allowed:.1f} ms")
+    return problems
+
+
+def test_every_named_route_is_registered():
+    assert named_routes() - set(ROUTES) == set(), "add new routes to ROUTES"
+    assert set(ROUTES) - named_routes() == set(), "remove routes that no longer exist"
+    assert set(BROKEN) <= set(ROUTES)
+
+
+@pytest.mark.django_db
+def test_query_counts_stay_constant(client, user, person, product):
+    seeded = SeededProduct(product, person)
+    client.login(username=user.username, password="testpass123")
+
+    results = {name: {} for name in [*ROUTES, *OTHER_ROUTES, *(f"context:{name}" for name in VIEWS)]}
+    for scale in SCALES:
+        seeded.grow_to(scale)
+        for name, build_kwargs in {**ROUTES, **OTHER_ROUTES}.items():
+            status, queries, ms = request(client, reverse(name, kwargs=build_kwargs(seeded)))
+            results[name][scale] = {"status": status, "queries": queries, "ms": ms}
+        for name, (view_class, build_kwargs, read) in VIEWS.items():
+            status, queries, ms = load_context(view_class, seeded.person.user, read, **build_kwargs(seeded))
+            results[f"context:{name}"][scale] = {"status": status, "queries": queries, "ms": ms}
+
+    broken = {name: results.pop(name) for name in BROKEN}
+    if os.environ.get("UPDATE_QUERY_BASELINE"):
+        write_baseline(results)
+
+    baseline = load_baseline()
+    problems = [problem for name, scales in results.items() for problem in regressions(name, scales, baseline)]
+    problems += [
+        f"{name}: responds now, take it off BROKEN"
+        for name, scales in broken.items()
+        if all(succeeded(measured) for measured in scales.values())
+    ]
+    assert not problems, "\n".join(problems)
@@ -0,0 +1,150 @@
+import pytest
+
+from apps.engagement.dispatch import USER_NAME_TAG, Dispatcher
+from apps.engagement.fake_sendgrid import FakeSendGrid
+from apps.engagement.models import Notification, OutboxEvent
+from apps.product_management.models import Bounty, BountySkill
+from apps.security.models import User
+from apps.talent.audience import announce_bounty, audience_of, rebuild_audiences
+from apps.talent.models import Expertise, Person, PersonSkill, Skill, SkillAudience
+from sendgrid import SendGridAPIClient
+
+
+@pytest.fixture
+def skills():
+    return [Skill.objects.create(name=name, active=True) for name in ("Python", "Design")]
+
+
+@pytest.fixture
+def expertise(skills):
+    return Expertise.objects.create(name="Django", skill=skills[0], fa_icon="")
+
+
+@pytest.fixture
+def people():
+    people = []
+    for number in range(3):
+        user = User.objects.create_user(username=f"talent-{number}", email=f"talent-{number}@example.com")
+        people.append(Person.objects.create(user=user, full_name=f"Talent {number}"))
+    return people
+
+
+@pytest.fixture
+def bounty(product, challenge):
+    return Bounty.objects.create(
+        product=product, challenge=challenge, title="Redo the icons", reward_type="Points", reward_in_points=100
+    )
+
+
+def audiences():
+    return {row.term_id: row.person_ids for row in SkillAudience.objects.all()}
+
+
+@pytest.mark.django_db
+class TestSkillAudience:
+    def test_audiences_follow_skill_changes(self, skills, expertise, people, django_capture_on_commit_callbacks):
+        python, design = skills
+        with django_capture_on_commit_callbacks(execute=True):
+            first = PersonSkill.objects.create(person=people[0], skill=python)
+            first.expertise.add(expertise)
+            PersonSkill.objects.create(person=people[1], skill=python)
+            PersonSkill.objects.create(person=people[2], skill=design)
+        assert audiences() == {
+            python.pk: sorted([people[0].pk, people[1].pk]),
+            expertise.pk: [people[0].pk],
+            design.pk: [people[2].pk],
+        }
+
+        with django_capture_on_commit_callbacks(execute=True):
+            expertise.personskill_set.clear()
+            PersonSkill.objects.filter(person=people[1]).get().delete()
+        assert audiences() == {python.pk: [people[0].pk], expertise.pk: [], design.pk: [people[2].pk]}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            people[2].send_me_bounties = False
+            people[2].save()
+        assert audiences()[design.pk] == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            people[2].send_me_bounties = True
+            people[2].save()
+            first.expertise.add(expertise)
+        incremental = audiences()
+        assert incremental[design.pk] == [people[2].pk]
+        assert incremental[expertise.pk] == [people[0].pk]
+
+        # Rebuilding from scratch gives the same rows, bar the emptied ones
+        rebuild_audiences()
+        assert audiences() == {term: ids for term, ids in incremental.items() if ids}
+
+    def test_bounties_are_announced_to_their_audience(
+        self, bounty, skills, expertise, people, django_capture_on_commit_callbacks, django_assert_num_queries
+    ):
+        python, design = skills
+        with django_capture_on_commit_callbacks(execute=True):
+            PersonSkill.objects.create(person=people[0], skill=python).expertise.add(expertise)
+            PersonSkill.objects.create(person=people[1], skill=python)
+            PersonSkill.objects.create(person=people[2], skill=design)
+
+        # Only Django expertise wanted for Python, any design skill
+        BountySkill.objects.create(bounty=bounty, skill=python).expertise.add(expertise)
+        BountySkill.objects.create(bounty=bounty, skill=design)
+        assert sorted(audience_of(bounty)) == sorted([people[0].pk, people[2].pk])
+
+        # One probe of the audiences, one outbox event
+        with django_assert_num_queries(2):
+            assert announce_bounty(bounty) == 2
+        event = OutboxEvent.objects.get()
+        assert event.event_type == Notification.EventType.BOUNTY_CREATED
+        assert sorted(event.receivers) == sorted([people[0].pk, people[2].pk])
+        assert event.params == {"bounty_title": bounty.title}
+
+    def test_bounties_are_announced_when_they_open(
+        self, bounty, product, challenge, skills, people, django_capture_on_commit_callbacks
+    ):
+        python, design = skills
+        with django_capture_on_commit_callbacks(execute=True):
+            PersonSkill.objects.create(person=people[0], skill=python)
+            PersonSkill.objects.create(person=people[1], skill=design)
+        announced = OutboxEvent.objects.filter(event_type=Notification.EventType.BOUNTY_CREATED)
+
+        # Drafts aren't announced
+        with django_capture_on_commit_callbacks(execute=True):
+            BountySkill.objects.create(bounty=bounty, skill=python)
+        assert not announced.exists()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            bounty.status = Bounty.BountyStatus.OPEN
+            bounty.save()
+        assert announced.get().receivers == [people[0].pk]
+
+        # Created open, to the audience of the skills saved in the same transaction
+        with django_capture_on_commit_callbacks(execute=True):
+            opened = Bounty.objects.create(
+                product=product, challenge=challenge, title="New logo", status=Bounty.BountyStatus.OPEN
+            )
+            BountySkill.objects.create(bounty=opened, skill=design)
+        assert announced.get(params={"bounty_title": "New logo"}).receivers == [people[1].pk]
+
+        # Reopened after a failed claim
+        with django_capture_on_commit_callbacks(execute=True):
+            bounty.status = Bounty.BountyStatus.IN_PROGRESS
+            bounty.save()
+            bounty.status = Bounty.BountyStatus.OPEN
+            bounty.save()
+        assert announced.count() == 2
+
+
+def test_each_receiver_gets_their_own_name():
+    with FakeSendGrid() as fake:
+        dispatcher = Dispatcher(SendGridAPIClient("test", host=fake.url), batch_size=10)
+        sent = dispatcher.send(
+            ["ada@example.com", "alan@example.com"],
+            "Hello",
+            f"Check it out, {USER_NAME_TAG}!",
+            [{USER_NAME_TAG: "Ada"}, {USER_NAME_TAG: "Alan"}],
+        )
+    assert sent == 2
+    [message] = fake.messages
+    names = {p["to"][0]["email"]: p["substitutions"][USER_NAME_TAG] for p in message["personalizations"]}
+    assert names == {"ada@example.com": "Ada", "alan@example.com": "Alan"}
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.talent.models import Expertise, Skill
+from apps.talent.taxonomy import VERSION_KEY, get_taxonomy
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def skills():
+    development = Skill.objects.create(name="Development", active=True)
+    backend = Skill.objects.create(name="Backend", parent=development, active=True)
+    python = Skill.objects.create(name="Python", parent=backend, active=True)
+    Skill.objects.create(name="Retired", parent=development, active=False)
+    return development, backend, python
+
+
+@pytest.fixture
+def expertise(skills):
+    development = skills[0]
+    web = Expertise.objects.create(name="Web", skill=development, fa_icon="")
+    django = Expertise.objects.create(name="Django", parent=web, skill=development, fa_icon="")
+    other = Expertise.objects.create(name="Other", fa_icon="")
+    return web, django, other
+
+
+@pytest.mark.django_db
+class TestTaxonomy:
+    def test_loads_in_two_queries_then_from_cache(self, skills, expertise):
+        with CaptureQueriesContext(connection) as queries:
+            get_taxonomy()
+        assert len(queries) == 2
+
+        with CaptureQueriesContext(connection) as queries:
+            get_taxonomy().skill_tree()
+        assert len(queries) == 0
+
+    def test_trees_are_nested_dicts(self, skills, expertise):
+        development, backend, python = skills
+        web, django, other = expertise
+        taxonomy = get_taxonomy()
+
+        assert taxonomy.skill_tree() == [
+            {
+                "id": development.pk,
+                "name": "Development",
+                "children": [
+                    {
+                        "id": backend.pk,
+                        "name": "Backend",
+                        "children": [{"id": python.pk, "name": "Python", "children": []}],
+                    }
+                ],
+            }
+        ]
+        assert taxonomy.expertise_tree(skill=development.pk) == [
+            {
+                "id": web.pk,
+                "name": "Web",
+                "skill": development.pk,
+                "children": [{"id": django.pk, "name": "Django", "skill": development.pk, "children": []}],
+            }
+        ]
+        assert [node["id"] for node in taxonomy.expertise_tree()] == [other.pk, web.pk]
+
+    def test_ancestors_and_descendants(self, skills, expertise):
+        development, backend, python = skills
+        skill_forest = get_taxonomy().skills
+
+        assert skill_forest.get_ancestors(python.pk) == (development.pk, backend.pk)
+        assert skill_forest.get_descendants(development.pk) == {backend.pk, python.pk}
+        assert skill_forest.is_descendant(python.pk, development.pk)
+        assert json.loads(python.ancestry()) == ["Development", "Backend", "Python"]
+        assert json.loads(expertise[1].ancestry()) == ["Web", "Django"]
+
+    def test_saves_and_deletes_invalidate(self, skills, expertise):
+        development = skills[0]
+        get_taxonomy()
+
+        design = Skill.objects.create(name="Design", active=True)
+        assert design.pk in get_taxonomy().skills
+
+        development.delete()
+        assert get_taxonomy().skill_tree() == [{"id": design.pk, "name": "Design", "children": []}]
+
+    def test_unsignalled_changes_show_once_the_version_expires(self, skills, expertise):
+        development = skills[0]
+        get_taxonomy()
+
+        Skill.objects.filter(pk=development.pk).update(name="Engineering")
+        assert get_taxonomy().skills.nodes[development.pk]["name"] == "Development"
+
+        # What TAXONOMY_CACHE_TIMEOUT does to the version
+        cache.delete(VERSION_KEY)
+        assert get_taxonomy().skills.nodes[development.pk]["name"] == "Engineering"
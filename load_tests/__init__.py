@@ -0,0 +1,12 @@
+"""
+Load tests for the bounty workflow.
+
+``manage.py load_test`` creates a throwaway PostgreSQL database next to the configured one, seeds it with a product,
+a manager and one contributor per virtual user, and serves it with a local gunicorn. Every virtual user then replays
+the contributor journey in ``journeys.py`` (browse bounties, filter by skill, open a bounty, bid, get the bid
+accepted, submit a delivery attempt, get it approved) against its own open bounty, as many times as asked. Nothing
+outside this machine is called.
+
+Latencies are recorded per step and summarised as p50/p95/p99 and throughput in a JSON report named after the
+commit under test, so runs on two commits can be compared with ``--compare``.
+"""
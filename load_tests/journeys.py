@@ -0,0 +1,177 @@
+from dataclasses import dataclass
+
+import requests
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.middleware.csrf import CSRF_ALLOWED_CHARS, CSRF_SECRET_LENGTH
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from apps.product_management.models import Bounty, BountySkill, Challenge, Product
+from apps.security.models import ProductRoleAssignment
+from apps.talent.models import BountyBid, BountyClaim, BountyDeliveryAttempt, Expertise, Person, Skill
+
+PASSWORD = "load-test"
+
+
+def login(base_url, user):
+    """An HTTP session logged in as ``user``, with a CSRF token for its POSTs. The sign-in page isn't exercised."""
+    store = SessionStore()
+    store[SESSION_KEY] = str(user.pk)
+    store[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    store[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    store.create()
+
+    csrf_token = get_random_string(CSRF_SECRET_LENGTH, CSRF_ALLOWED_CHARS)
+    session = requests.Session()
+    session.base_url = base_url
+    session.cookies.set(settings.SESSION_COOKIE_NAME, store.session_key)
+    session.cookies.set(settings.CSRF_COOKIE_NAME, csrf_token)
+    session.headers["X-CSRFToken"] = csrf_token
+    return session
+
+
+def create_person(username):
+    user = get_user_model().objects.create_user(username=username, email=f"{username}@example.com", password=PASSWORD)
+    return Person.objects.create(user=user, full_name=username)
+
+
+@dataclass
+class World:
+    """What the journeys run against: one product, its manager, and open bounties for each contributor."""
+
+    product: Product
+    manager: Person
+    skill: Skill
+    contributors: list
+    bounties: dict
+
+    @classmethod
+    def seed(cls, users, iterations):
+        manager = create_person("load-manager")
+        product = Product.objects.create(name="Load test product", slug="load-test-product", person=manager)
+        ProductRoleAssignment.objects.create(
+            person=manager, product=product, role=ProductRoleAssignment.ProductRoles.ADMIN
+        )
+        skill = Skill.objects.create(name="Load test skill", active=True, selectable=True)
+        expertise = Expertise.objects.create(name="Load test expertise", skill=skill, fa_icon="")
+        challenge = Challenge.objects.create(
+            product=product, title="Load test challenge", status=Challenge.ChallengeStatus.ACTIVE
+        )
+
+        contributors, bounties = [], {}
+        for number in range(users):
+            contributor = create_person(f"load-contributor-{number}")
+            contributors.append(contributor)
+            bounties[contributor.pk] = []
+            for iteration in range(iterations):
+                bounty = Bounty.objects.create(
+                    product=product,
+                    challenge=challenge,
+                    title=f"Load test bounty {number}-{iteration}",
+                    status=Bounty.BountyStatus.OPEN,
+                    reward_type="Points",
+                    reward_in_points=100,
+                )
+                BountySkill.objects.create(bounty=bounty, skill=skill).expertise.add(expertise)
+                bounties[contributor.pk].append(bounty)
+        return cls(product, manager, skill, contributors, bounties)
+
+
+class BountyJourney:
+    """
+    A contributor taking one bounty from the list to an approved delivery, with the manager's steps in between.
+
+    ``steps`` are (name, callable) pairs run in order. HTTP steps return their response, ORM steps nothing.
+    The platform has no views for bidding or accepting a bid yet, so those two steps make the model calls such views
+    would make, in this process, and are named "(orm)" in the report.
+    """
+
+    def __init__(self, world, contributor, manager_session, contributor_session):
+        self.world = world
+        self.contributor = contributor
+        self.manager = manager_session
+        self.session = contributor_session
+
+    def steps(self, bounty):
+        self.bounty = bounty
+        self.bounty_bid = self.bounty_claim = None
+        return [
+            ("browse bounties", self.browse),
+            ("filter by skill", self.filter_by_skill),
+            ("bounty detail", self.bounty_detail),
+            ("bid (orm)", self.bid),
+            ("accept bid (orm)", self.accept_bid),
+            ("submit delivery attempt", self.submit_delivery_attempt),
+            ("approve delivery attempt", self.approve_delivery_attempt),
+        ]
+
+    def get(self, session, path, **kwargs):
+        return session.get(session.base_url + path, allow_redirects=False, **kwargs)
+
+    def post(self, session, path, data, **kwargs):
+        return session.post(session.base_url + path, data=data, allow_redirects=False, **kwargs)
+
+    def browse(self):
+        return self.get(self.session, reverse("bounties"))
+
+    def filter_by_skill(self):
+        # What the skill dropdown sends
+        return self.get(
+            self.session,
+            reverse("bounties"),
+            params={"skill": self.world.skill.pk, "target": "skill"},
+            headers={"HX-Request": "true"},
+        )
+
+    def bounty_detail(self):
+        bounty = self.bounty
+        return self.get(
+            self.session,
+            reverse(
+                "bounty-detail",
+                kwargs={"product_slug": self.world.product.slug, "challenge_id": bounty.challenge_id, "pk": bounty.pk},
+            ),
+        )
+
+    def bid(self):
+        self.bounty_bid = BountyBid.objects.create(
+            bounty=self.bounty,
+            person=self.contributor,
+            amount_in_points=self.bounty.reward_in_points,
+            expected_finish_date=timezone.now().date() + timezone.timedelta(days=7),
+        )
+
+    def accept_bid(self):
+        self.bounty_bid.accept_bid()
+        self.bounty_claim = BountyClaim.objects.get(bounty=self.bounty, person=self.contributor)
+
+    def delivery_path(self, name, **kwargs):
+        bounty = self.bounty
+        return reverse(
+            name,
+            kwargs={
+                "product_slug": self.world.product.slug,
+                "challenge_id": bounty.challenge_id,
+                "bounty_id": bounty.pk,
+                **kwargs,
+            },
+        )
+
+    def submit_delivery_attempt(self):
+        return self.post(
+            self.session,
+            self.delivery_path("create-bounty-delivery-attempt"),
+            {"bounty_claim": self.bounty_claim.pk, "delivery_message": "Done, see the linked pull request."},
+            params={"id": self.bounty_claim.pk},
+        )
+
+    def approve_delivery_attempt(self):
+        attempt = BountyDeliveryAttempt.objects.get(bounty_claim=self.bounty_claim)
+        return self.post(
+            self.manager,
+            self.delivery_path("bounty-delivery-attempt-detail", pk=attempt.pk),
+            {"bounty-delivery-action": "approve-bounty-claim-delivery"},
+        )
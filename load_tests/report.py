@@ -0,0 +1,98 @@
+import json
+import math
+import subprocess
+from collections import Counter
+from pathlib import Path
+
+from django.utils import timezone
+
+REPORT_DIR = Path(__file__).resolve().parent / "reports"
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def summarise(recorder, **options):
+    """
+    The report of a run: latency percentiles in ms, throughput and failures per step, and in total. Each step also
+    counts its failures by reason, so a step timing an error path shows as such.
+    """
+    elapsed = recorder.finished - recorder.started
+
+    def summary(samples):
+        latencies = [seconds * 1000 for seconds, _ in samples]
+        failures = Counter(failure for _, failure in samples if failure)
+        return {
+            "requests": len(samples),
+            "failures": sum(failures.values()),
+            **{f"p{percent}": round(percentile(latencies, percent), 2) for percent in PERCENTILES},
+            "throughput": round(len(samples) / elapsed, 2),
+            "failure_reasons": dict(failures.most_common()),
+        }
+
+    return {
+        "commit": current_commit(),
+        "created_at": timezone.now().isoformat(),
+        "options": options,
+        "elapsed_s": round(elapsed, 2),
+        "steps": {name: summary(samples) for name, samples in recorder.samples.items()},
+        "total": summary([sample for samples in recorder.samples.values() for sample in samples]),
+    }
+
+
+def write(report, directory=REPORT_DIR):
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{report['commit']}.json"
+    path.write_text(json.dumps(report, indent=2) + "\n")
+    return path
+
+
+def load(path):
+    return json.loads(Path(path).read_text())
+
+
+def rows(report):
+    return {**report["steps"], "total": report["total"]}
+
+
+def format_table(report, baseline=None):
+    """
+    Lines of a table with a row per step, then a line per step and reason it failed for. With a baseline, each value
+    is followed by its change in percent.
+    """
+    before = rows(baseline) if baseline else {}
+
+    def cell(name, key, value):
+        text = f"{value:g}"
+        if previous := before.get(name, {}).get(key):
+            text += f" ({(value - previous) / previous * 100:+.0f}%)"
+        return text
+
+    columns = ("requests", "failures", "p50", "p95", "p99", "throughput")
+    lines = [f"{'step':<28}" + "".join(f"{column:>20}" for column in columns)]
+    for name, row in rows(report).items():
+        lines.append(f"{name:<28}" + "".join(f"{cell(name, column, row[column]):>20}" for column in columns))
+    failed = [
+        (name, reason, count)
+        for name, row in report["steps"].items()
+        for reason, count in row.get("failure_reasons", {}).items()
+    ]
+    if failed:
+        lines.append("")
+        lines.append(f"{'failed step':<28}{'reason':<40}{'count':>8}")
+        lines.extend(f"{name:<28}{reason:<40}{count:>8}" for name, reason, count in failed)
+    return lines
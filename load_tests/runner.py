@@ -0,0 +1,60 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+
+
+class Recorder:
+    """Latencies and outcomes per step name, shared by the virtual users."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.started = self.finished = None
+
+    def record(self, name, seconds, failure=None):
+        with self.lock:
+            self.samples.setdefault(name, []).append((seconds, failure))
+
+    def time(self, name, step):
+        """
+        Runs ``step`` and records how long it took, and why it failed if it did: the class of what it raised, or
+        for HTTP steps the status of a client or server error. Redirects are fine.
+        """
+        start = time.perf_counter()
+        try:
+            response = step()
+        except Exception as error:
+            failure = type(error).__name__
+        else:
+            failure = f"HTTP {response.status_code}" if response is not None and response.status_code >= 400 else None
+        self.record(name, time.perf_counter() - start, failure)
+        return failure is None
+
+
+def run_user(recorder, journey, bounties, think_time):
+    try:
+        for bounty in bounties:
+            # A failed step doesn't stop the journey, steps that need its result fail on their own
+            for name, step in journey.steps(bounty):
+                recorder.time(name, step)
+                if think_time:
+                    time.sleep(think_time)
+    finally:
+        # ORM steps opened a connection for this thread
+        connection.close()
+
+
+def run(journeys, think_time=0):
+    """Runs each (journey, bounties) pair in its own thread, all at once. Returns the filled Recorder."""
+    recorder = Recorder()
+    recorder.started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(journeys)) as executor:
+        futures = [
+            executor.submit(run_user, recorder, journey, bounties, think_time) for journey, bounties in journeys
+        ]
+        for future in futures:
+            future.result()
+    recorder.finished = time.perf_counter()
+    return recorder
@@ -0,0 +1,81 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from django.db import connection
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LocalStack:
+    """
+    A throwaway copy of the database, migrated from scratch, served by gunicorn on a free local port.
+
+    Used as a context manager. While it's open this process's default connection points at the throwaway database
+    too, so the journeys can seed it and make their ORM steps against it. Both are gone when it closes.
+    """
+
+    def __init__(self, workers=4, startup_timeout=30):
+        self.workers = workers
+        self.startup_timeout = startup_timeout
+        self.port = free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.old_name = connection.settings_dict["NAME"]
+        connection.settings_dict["TEST"]["NAME"] = f"{self.old_name}_loadtest"
+        self.database = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.start_server()
+        except Exception:
+            self.__exit__()
+            raise
+        return self
+
+    def __exit__(self, *exc_info):
+        if getattr(self, "server", None):
+            self.server.terminate()
+            try:
+                self.server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.server.kill()
+        connection.creation.destroy_test_db(self.old_name, verbosity=0)
+
+    def start_server(self):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE),
+            "POSTGRES_DB": self.database,
+        }
+        self.server = subprocess.Popen(
+            [
+                sys.executable, "-m", "gunicorn", "apps.common.wsgi:application",
+                "--bind", f"127.0.0.1:{self.port}",
+                "--workers", str(self.workers),
+                "--log-level", "warning",
+            ],
+            cwd=BASE_DIR,
+            env=env,
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.server.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with status {self.server.returncode}")
+            try:
+                # The first request loads the whole project, give it time
+                requests.get(self.base_url, timeout=self.startup_timeout)
+                return
+            except requests.ConnectionError:
+                time.sleep(0.2)
+        raise RuntimeError(f"gunicorn didn't answer on {self.base_url} within {self.startup_timeout}s")
@@ -1,138 +1,205 @@
+"""
+Replace the ids in the CSV fixtures with freshly generated Base58 UUIDv5 ids, updating every foreign key.
+
+The old -> new id map is kept in an SQLite file, so the job can be stopped and re-run: ids that already have a
+mapping keep it, and files that have been rewritten with the current map are not touched again. Delete the map file
+to generate a new set of ids.
+
+Which columns hold ids comes from the Django models: the primary key, every foreign key attname and
+``<m2m field>_ids`` columns. Files are processed in batches of rows and each column of a batch is translated with a
+single lookup, so memory use is bounded by the batch size.
+
+Usage:
+    python update_csv_ids.py [--map .csv_id_map.sqlite3] [--batch-size 10000] [app_label.Model ...]
+"""
+import argparse
 import csv
+import os
+import sqlite3
 import uuid
+from itertools import islice
+
 import base58
-import os
-from collections import defaultdict
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "apps.common.settings.local")
+django.setup()
+
+from django.apps import apps  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+from apps.common.csv_fixtures import find_fixtures  # noqa: E402
+
+# SQLite's default limit on bound parameters per statement
+MAX_SQL_PARAMS = 900
 
-# Use the provided namespace
-NAMESPACE = uuid.UUID("bc7980a8-5d44-4ba6-872c-b3c5a0fe763b")
 
 def generate_base58_uuidv5(name):
-    # Generate a UUIDv4 for this record
-    record_uuid = uuid.uuid4()
-    
-    # Generate a UUIDv5 using the custom namespace and the record-specific UUIDv4 as the name
-    uuid_obj = uuid.uuid5(NAMESPACE, f"{name}:{record_uuid}")
-    
-    # Encode the UUIDv5 as Base58
-    return base58.b58encode(uuid_obj.bytes).decode('ascii')
-
-def update_csvs(file_model_pairs):
-    # Dictionary to store old_id to new_id mappings for each model
-    id_mappings = defaultdict(dict)
-
-    # First pass: Generate new IDs
-    for file_path, model_name in file_model_pairs:
-        with open(file_path, 'r') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                old_id = row['id']
-                new_id = generate_base58_uuidv5(f"{model_name}:{old_id}")
-                id_mappings[model_name][old_id] = new_id
-
-    # Second pass: Update CSVs with new IDs and update foreign keys
-    for file_path, model_name in file_model_pairs:
-        temp_file_path = file_path + '.temp'
-        with open(file_path, 'r') as input_file, open(temp_file_path, 'w', newline='') as output_file:
-            reader = csv.DictReader(input_file)
-            fieldnames = reader.fieldnames
-
-            writer = csv.DictWriter(output_file, fieldnames=fieldnames)
-            writer.writeheader()
-
-            for row in reader:
-                # Update the primary key
-                row['id'] = id_mappings[model_name][row['id']]
-
-                # Update foreign keys and parent_id
-                for field in fieldnames:
-                    if field.endswith('_id') and field != 'id':
-                        related_model = get_related_model(model_name, field)
-                        if related_model and row[field] and row[field] in id_mappings.get(related_model, {}):
-                            row[field] = id_mappings[related_model][row[field]]
-                    elif field == 'parent_id':
-                        if row[field] and row[field] in id_mappings[model_name]:
-                            row[field] = id_mappings[model_name][row[field]]
-
-                writer.writerow(row)
-
-        # Replace the original file with the updated one
-        os.replace(temp_file_path, file_path)
-        print(f"Updated {file_path}")
-
-def get_related_model(model_name, field_name):
-    # This function should return the related model name based on the current model and field
-    # You may need to customize this based on your specific model relationships
-    app, model = model_name.split('.')
-    
-    # Remove '_id' from the field name
-    base_field = field_name[:-3] if field_name.endswith('_id') else field_name
-    
-    # Handle special cases or common patterns
-    if base_field == 'user':
-        return 'security.User'
-    elif base_field == 'person':
-        return 'talent.Person'
-    elif base_field == 'organisation':
-        return 'commerce.Organisation'
-    elif base_field == 'product':
-        return 'product_management.Product'
-    elif base_field == 'skill':
-        return 'talent.Skill'
-    elif base_field == 'bounty':
-        return 'product_management.Bounty'
-    elif base_field == 'parent':
-        return model_name  # For self-referential relationships
-    
-    # For other cases, assume the related model is in the same app
-    return f"{app}.{base_field.capitalize()}"
-
-# List of (file_path, model_name) pairs
-file_model_pairs = [
-    ('apps/security/fixtures/user-fixture.csv', 'security.User'),
-    ('apps/talent/fixtures/person-fixture.csv', 'talent.Person'),
-    ('apps/talent/fixtures/skill-fixture.csv', 'talent.Skill'),
-    ('apps/talent/fixtures/expertise-fixture.csv', 'talent.Expertise'),
-    ('apps/talent/fixtures/person-skill-fixture.csv', 'talent.PersonSkill'),
-    ('apps/commerce/fixtures/organisation-fixture.csv', 'commerce.Organisation'),
-    ('apps/product_management/fixtures/product-fixture.csv', 'product_management.Product'),
-    ('apps/product_management/fixtures/product-tree-fixture.csv', 'product_management.ProductTree'),
-    ('apps/product_management/fixtures/product-area-fixture.csv', 'product_management.ProductArea'),
-    ('apps/commerce/fixtures/organisation-point-account-fixture.csv', 'commerce.OrganisationPointAccount'),
-    ('apps/commerce/fixtures/product-point-account-fixture.csv', 'commerce.ProductPointAccount'),
-    ('apps/commerce/fixtures/platform-fee-configuration-fixture.csv', 'commerce.PlatformFeeConfiguration'),
-    ('apps/product_management/fixtures/initiative-fixture.csv', 'product_management.Initiative'),
-    ('apps/product_management/fixtures/challenge-fixture.csv', 'product_management.Challenge'),
-    ('apps/product_management/fixtures/competition-fixture.csv', 'product_management.Competition'),
-    ('apps/product_management/fixtures/bounty-fixture.csv', 'product_management.Bounty'),
-    ('apps/talent/fixtures/bounty-bid-fixture.csv', 'talent.BountyBid'),
-    ('apps/talent/fixtures/bounty-claim-fixture.csv', 'talent.BountyClaim'),
-    ('apps/talent/fixtures/bounty-delivery-attempt-fixture.csv', 'talent.BountyDeliveryAttempt'),
-    ('apps/commerce/fixtures/cart-fixture.csv', 'commerce.Cart'),
-    ('apps/commerce/fixtures/cart-line-item-fixture.csv', 'commerce.CartLineItem'),
-    ('apps/commerce/fixtures/platform-fee-cart-item-fixture.csv', 'commerce.PlatformFeeCartItem'),
-    ('apps/commerce/fixtures/sales-tax-cart-item-fixture.csv', 'commerce.SalesTaxCartItem'),
-    ('apps/commerce/fixtures/sales-order-fixture.csv', 'commerce.SalesOrder'),
-    ('apps/commerce/fixtures/sales-order-line-item-fixture.csv', 'commerce.SalesOrderLineItem'),
-    ('apps/commerce/fixtures/point-transaction-fixture.csv', 'commerce.PointTransaction'),
-    ('apps/commerce/fixtures/point-order-fixture.csv', 'commerce.PointOrder'),
-    ('apps/product_management/fixtures/competition-entry-fixture.csv', 'product_management.CompetitionEntry'),
-    ('apps/product_management/fixtures/competition-entry-rating-fixture.csv', 'product_management.CompetitionEntryRating'),
-    ('apps/product_management/fixtures/contributor-guide-fixture.csv', 'product_management.ContributorGuide'),
-    ('apps/product_management/fixtures/file-attachment-fixture.csv', 'product_management.FileAttachment'),
-    ('apps/product_management/fixtures/idea-fixture.csv', 'product_management.Idea'),
-    ('apps/product_management/fixtures/idea-vote-fixture.csv', 'product_management.IdeaVote'),
-    ('apps/product_management/fixtures/product-contributor-agreement-template-fixture.csv', 'product_management.ProductContributorAgreementTemplate'),
-    ('apps/product_management/fixtures/product-contributor-agreement-fixture.csv', 'product_management.ProductContributorAgreement'),
-    ('apps/product_management/fixtures/bug-fixture.csv', 'product_management.Bug'),
-    ('apps/commerce/fixtures/organisation-point-grant-fixture.csv', 'commerce.OrganisationPointGrant'),
-    ('apps/security/fixtures/organisation-person-role-assignment-fixture.csv', 'security.OrganisationPersonRoleAssignment'),
-    ('apps/security/fixtures/product-role-assignment-fixture.csv', 'security.ProductRoleAssignment'),
-    ('apps/security/fixtures/sign-in-attempt-fixture.csv', 'security.SignInAttempt'),
-    ('apps/security/fixtures/sign-up-request-fixture.csv', 'security.SignUpRequest'),
-    ('apps/engagement/fixtures/email-notification-fixture.csv', 'engagement.EmailNotification'),
-]
-
-if __name__ == '__main__':
-    update_csvs(file_model_pairs)
-    print("All CSV files have been updated with Base58-encoded UUIDv5 keys, including foreign keys and parent_ids.")
\ No newline at end of file
+    # Generate a UUIDv5 using the platform namespace and a per-record UUIDv4, as Base58UUIDv5Field does
+    uuid_obj = uuid.uuid5(settings.PLATFORM_NAMESPACE, f"{name}:{uuid.uuid4()}")
+    return base58.b58encode(uuid_obj.bytes).decode("ascii")
+
+
+def open_id_map(path):
+    db = sqlite3.connect(path)
+    db.executescript(
+        """
+        PRAGMA journal_mode = WAL;
+        PRAGMA synchronous = NORMAL;
+        CREATE TABLE IF NOT EXISTS id_map (
+            model TEXT NOT NULL, old_id TEXT NOT NULL, new_id TEXT NOT NULL, PRIMARY KEY (model, old_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS progress (file TEXT NOT NULL, phase TEXT NOT NULL, PRIMARY KEY (file, phase));
+        """
+    )
+    return db
+
+
+def is_done(db, file_path, phase):
+    return db.execute("SELECT 1 FROM progress WHERE file = ? AND phase = ?", (file_path, phase)).fetchone()
+
+
+def mark_done(db, file_path, phase):
+    db.execute("INSERT OR IGNORE INTO progress (file, phase) VALUES (?, ?)", (file_path, phase))
+    db.commit()
+
+
+def lookup(db, label, old_ids):
+    mapping = {}
+    old_ids = list(old_ids)
+    for start in range(0, len(old_ids), MAX_SQL_PARAMS):
+        chunk = old_ids[start:start + MAX_SQL_PARAMS]
+        placeholders = ",".join("?" * len(chunk))
+        mapping.update(
+            db.execute(
+                f"SELECT old_id, new_id FROM id_map WHERE model = ? AND old_id IN ({placeholders})", [label, *chunk]
+            )
+        )
+    return mapping
+
+
+def read_batches(file_path, batch_size):
+    with open(file_path, "r", newline="") as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, [])
+        yield header
+        while batch := list(islice(reader, batch_size)):
+            yield batch
+
+
+def get_id_columns(model, header):
+    """Maps column index -> (related model label, is a comma separated list) for every column holding ids."""
+    opts = model._meta
+    fields = {f.attname: f for f in opts.concrete_fields}
+    many_to_many = {f"{f.name}_ids": f for f in opts.many_to_many}
+    columns = {}
+    for index, column in enumerate(header):
+        if column in fields and fields[column].primary_key:
+            columns[index] = (opts.label, False)
+        elif column in fields and fields[column].is_relation:
+            columns[index] = (fields[column].related_model._meta.label, False)
+        elif column in many_to_many:
+            columns[index] = (many_to_many[column].related_model._meta.label, True)
+    return columns
+
+
+def build_id_map(db, model, file_path, batch_size):
+    """Assigns a new id to every primary key in the file that doesn't have one yet."""
+    label = model._meta.label
+    batches = read_batches(file_path, batch_size)
+    header = next(batches)
+    if "id" not in header:
+        return 0
+    pk_index = header.index("id")
+
+    added = 0
+    for batch in batches:
+        old_ids = {row[pk_index] for row in batch if len(row) > pk_index and row[pk_index]}
+        new_ids = old_ids - lookup(db, label, old_ids).keys()
+        db.executemany(
+            "INSERT OR IGNORE INTO id_map (model, old_id, new_id) VALUES (?, ?, ?)",
+            [(label, old_id, generate_base58_uuidv5(f"{label}:{old_id}")) for old_id in new_ids],
+        )
+        db.commit()
+        added += len(new_ids)
+    return added
+
+
+def rewrite_batch(db, batch, id_columns):
+    for index, (label, is_list) in id_columns.items():
+        values = [row[index] if len(row) > index else "" for row in batch]
+        if is_list:
+            old_ids = {value.strip() for cell in values for value in cell.split(",") if value.strip()}
+        else:
+            old_ids = set(values) - {""}
+        mapping = lookup(db, label, old_ids)
+        if not mapping:
+            continue
+        for row, cell in zip(batch, values):
+            if not cell:
+                continue
+            if is_list:
+                row[index] = ",".join(mapping.get(value.strip(), value.strip()) for value in cell.split(","))
+            else:
+                row[index] = mapping.get(cell, cell)
+    return batch
+
+
+def rewrite_file(db, model, file_path, batch_size):
+    temp_file_path = file_path + ".temp"
+    batches = read_batches(file_path, batch_size)
+    header = next(batches)
+    id_columns = get_id_columns(model, header)
+
+    rows = 0
+    with open(temp_file_path, "w", newline="") as output_file:
+        writer = csv.writer(output_file)
+        writer.writerow(header)
+        for batch in batches:
+            writer.writerows(rewrite_batch(db, batch, id_columns))
+            rows += len(batch)
+
+    # Replace the original file with the updated one only once it has been written completely
+    os.replace(temp_file_path, file_path)
+    return rows
+
+
+def update_csvs(fixtures, map_path, batch_size):
+    db = open_id_map(map_path)
+
+    # First pass: give every primary key in every file a new id, so foreign keys can be translated across files
+    for model, file_path in fixtures.items():
+        if is_done(db, file_path, "map"):
+            continue
+        added = build_id_map(db, model, file_path, batch_size)
+        mark_done(db, file_path, "map")
+        print(f"Mapped {added} new ids for {model._meta.label}")
+
+    # Second pass: rewrite primary and foreign keys
+    for model, file_path in fixtures.items():
+        if is_done(db, file_path, "rewrite"):
+            print(f"Skipped {file_path}: already rewritten with {map_path}")
+            continue
+        rows = rewrite_file(db, model, file_path, batch_size)
+        mark_done(db, file_path, "rewrite")
+        print(f"Updated {rows} rows in {file_path}")
+
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replace the ids in the CSV fixtures with new Base58 UUIDv5 ids")
+    parser.add_argument("models", nargs="*", help="Only rewrite these models, e.g. talent.Skill (default: all)")
+    parser.add_argument("--map", default=".csv_id_map.sqlite3", help="SQLite file holding the old -> new id map")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Rows per batch")
+    args = parser.parse_args()
+
+    fixtures = find_fixtures(apps.get_app_configs())
+    if args.models:
+        fixtures = {model: path for model, path in fixtures.items() if model._meta.label in args.models}
+    update_csvs(fixtures, args.map, args.batch_size)
+    print("All CSV files have been updated with Base58-encoded UUIDv5 keys, including foreign keys and parent_ids.")
+
+
+if __name__ == "__main__":
+    main()